@@ -4,14 +4,13 @@ Dexter Financial Agent - Streamlit Web Interface
 """
 
 import streamlit as st
-import os
 from typing import Optional
 import sys
 sys.path.insert(0, 'src')
 
 from dexter.agent import Agent
 from dexter.streamlit_ui import StreamlitUI
-from dexter.model import reset_llm, AVAILABLE_MODELS
+from dexter.model import AVAILABLE_MODELS
 import time
 
 # 設定頁面配置
@@ -80,21 +79,16 @@ with st.sidebar:
             st.session_state.openai_api_key = openai_key
             st.session_state.financial_api_key = financial_key
 
-            # 設定環境變數
-            os.environ["OPENAI_API_KEY"] = openai_key
-            os.environ["FINANCIAL_DATASETS_API_KEY"] = financial_key
-            os.environ["OPENAI_MODEL"] = st.session_state.selected_model
-
-            # 重置 LLM 實例以使用新的 API 金鑰和模型
-            reset_llm()
-
-            # 初始化 Agent 和 UI
+            # 初始化 Agent 和 UI（API 金鑰只屬於此工作階段，不寫入環境變數；
+            # 相同金鑰與模型的 LLM 客戶端由所有使用者共用）
             try:
                 st.session_state.agent = Agent(
                     max_steps=20,
                     max_steps_per_task=5,
                     use_chinese=True,  # 使用繁體中文
-                    model_name=st.session_state.selected_model  # 傳遞選擇的模型
+                    model_name=st.session_state.selected_model,  # 傳遞選擇的模型
+                    openai_api_key=openai_key,
+                    financial_api_key=financial_key
                 )
                 st.session_state.ui = StreamlitUI()
                 st.success(f"✅ 設定成功！使用模型: {st.session_state.selected_model}")
@@ -184,34 +178,31 @@ else:
             response_container = st.container()
 
             with response_container:
-                # 顯示思考中的狀態
-                with st.status("🤔 正在分析您的問題...", expanded=True) as status:
-                    try:
-                        # 執行 Dexter agent
-                        ui = st.session_state.ui
-                        ui.reset()  # 重置 UI 狀態
-
-                        # 設定 UI 的狀態顯示區域
-                        ui.set_status_container(status)
-
-                        # 執行分析
-                        st.session_state.agent.ui = ui
-                        answer = st.session_state.agent.run(prompt)
-
-                        # 更新狀態
-                        status.update(label="✅ 分析完成！", state="complete", expanded=False)
-
-                        # 顯示最終答案
-                        st.markdown(answer)
-
-                        # 添加助理回應到對話歷史
-                        st.session_state.messages.append({"role": "assistant", "content": answer})
-
-                    except Exception as e:
-                        status.update(label="❌ 發生錯誤", state="error", expanded=True)
-                        error_msg = f"抱歉，處理您的請求時發生錯誤：{str(e)}"
-                        st.error(error_msg)
-                        st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                # 顯示思考中的狀態（答案串流顯示在狀態框下方）
+                status = st.status("🤔 正在分析您的問題...", expanded=True)
+                try:
+                    # 執行 Dexter agent
+                    ui = st.session_state.ui
+                    ui.reset()  # 重置 UI 狀態
+
+                    # 設定 UI 的狀態顯示區域
+                    ui.set_status_container(status)
+
+                    # 執行分析，並逐字串流顯示最終答案
+                    st.session_state.agent.ui = ui
+                    answer = st.write_stream(st.session_state.agent.run_stream(prompt))
+
+                    # 更新狀態
+                    status.update(label="✅ 分析完成！", state="complete", expanded=False)
+
+                    # 添加助理回應到對話歷史
+                    st.session_state.messages.append({"role": "assistant", "content": answer})
+
+                except Exception as e:
+                    status.update(label="❌ 發生錯誤", state="error", expanded=True)
+                    error_msg = f"抱歉，處理您的請求時發生錯誤：{str(e)}"
+                    st.error(error_msg)
+                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
 
 # 頁尾
 st.divider()
@@ -0,0 +1 @@
+# Offline benchmarks for Dexter (no network access required)
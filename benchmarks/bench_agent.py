@@ -0,0 +1,184 @@
+"""
+End-to-end benchmark: Agent.run over a fixed query corpus with a scripted LLM and a local data API.
+
+Reports wall time, LLM calls per phase, prompt bytes, tool latency and peak memory per query.
+Needs no network access; LLM call counts and prompt bytes are fully deterministic, so they can
+be gated exactly, and wall time within a tolerance.
+
+Usage: python -m benchmarks.bench_agent [--repeat N] [--latency-ms MS] [--json OUT] [--baseline FILE]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Configure Dexter before importing it: no caches or rate limits, fake keys, local API.
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("FINANCIAL_DATASETS_API_KEY", "benchmark")
+os.environ["DEXTER_API_CACHE"] = "0"
+os.environ["DEXTER_HISTORY"] = "0"
+os.environ["DEXTER_LLM_CACHE"] = "0"
+os.environ["DEXTER_RATE_LIMIT_OPENAI"] = "0"
+os.environ["DEXTER_RATE_LIMIT_FINANCIAL_DATASETS"] = "0"
+
+from benchmarks.corpus import CORPUS
+from benchmarks.fake_api import FakeFinancialDatasetsServer
+from benchmarks.fake_llm import ScriptedChatModel
+
+GATED_EXACT = ("llm_calls", "prompt_bytes")
+GATED_TIME = ("wall_ms",)
+
+
+class _SpanCollector:
+    """In-memory tracing exporter."""
+
+    def __init__(self):
+        self.spans = []
+
+    def on_start(self, span):
+        pass
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def close(self):
+        pass
+
+
+class _SilentUI:
+    """UI adapter that ignores every event, so terminal rendering (spinners) isn't timed."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _install(fake_llm, server_url: str, collector) -> None:
+    import dexter.tools
+    from dexter.llm_pool import LLMClientPool, set_llm_pool
+    from dexter.tracing import Tracer, set_tracer
+
+    dexter.tools.FINANCIAL_DATASETS_BASE_URL = server_url
+    set_llm_pool(LLMClientPool(factory=lambda **kwargs: fake_llm))
+    set_tracer(Tracer([collector]))
+
+
+def _run_query(agent, query: str) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent.run(query)
+
+
+def bench_query(entry: dict, repeat: int, fake_llm, server, collector) -> dict:
+    from dexter.agent import Agent
+
+    agent = Agent(ui=_SilentUI())
+
+    # Measured pass: calls, payloads and tool latency (deterministic apart from timings).
+    fake_llm.reset()
+    collector.spans.clear()
+    requests_before = server.requests
+    _run_query(agent, entry["query"])
+    calls = fake_llm.calls
+    per_phase = fake_llm.calls_per_phase()
+    tool_ms = [s.duration_ms for s in collector.spans if s.name == "tool"]
+    api_requests = server.requests - requests_before
+
+    # Wall time: median over `repeat` runs.
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run_query(agent, entry["query"])
+        walls.append((time.perf_counter() - start) * 1000)
+
+    # Peak memory in a separate pass, since tracemalloc slows everything down.
+    tracemalloc.start()
+    _run_query(agent, entry["query"])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    prompt_bytes = sum(c["prompt_bytes"] for c in calls)
+    return {
+        "name": entry["name"],
+        "wall_ms": statistics.median(walls),
+        "llm_calls": len(calls),
+        "llm_calls_per_phase": per_phase,
+        "prompt_bytes": prompt_bytes,
+        "mean_prompt_bytes": prompt_bytes / len(calls) if calls else 0,
+        "tool_calls": len(tool_ms),
+        "mean_tool_ms": statistics.fmean(tool_ms) if tool_ms else 0.0,
+        "max_tool_ms": max(tool_ms, default=0.0),
+        "api_requests": api_requests,
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+def print_report(results: list) -> None:
+    header = (f"{'query':<20}{'wall ms':>9}{'llm':>5}{'plan/act/val/ans':>18}{'prompt B':>10}{'B/call':>8}"
+              f"{'tools':>6}{'tool ms':>9}{'api':>5}{'peak KB':>9}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        phases = r["llm_calls_per_phase"]
+        per_phase = "/".join(str(phases.get(p, 0)) for p in ("plan", "action", "validate", "answer"))
+        print(f"{r['name']:<20}{r['wall_ms']:>9.1f}{r['llm_calls']:>5}{per_phase:>18}{r['prompt_bytes']:>10}"
+              f"{r['mean_prompt_bytes']:>8.0f}{r['tool_calls']:>6}{r['mean_tool_ms']:>9.2f}{r['api_requests']:>5}"
+              f"{r['peak_mem_kb']:>9.0f}")
+    total_wall = sum(r["wall_ms"] for r in results)
+    total_calls = sum(r["llm_calls"] for r in results)
+    total_bytes = sum(r["prompt_bytes"] for r in results)
+    print("-" * len(header))
+    print(f"{'total':<20}{total_wall:>9.1f}{total_calls:>5}{'':>18}{total_bytes:>10}")
+
+
+def check_baseline(results: list, baseline: list, tolerance: float) -> list:
+    """Regressions versus a previous --json run: exact for counts and bytes, relative for time."""
+    previous = {r["name"]: r for r in baseline}
+    problems = []
+    for r in results:
+        old = previous.get(r["name"])
+        if old is None:
+            continue
+        for key in GATED_EXACT:
+            if r[key] > old[key]:
+                problems.append(f"{r['name']}: {key} {old[key]} -> {r[key]}")
+        for key in GATED_TIME:
+            if r[key] > old[key] * (1 + tolerance):
+                problems.append(f"{r['name']}: {key} {old[key]:.1f} -> {r[key]:.1f} (> {tolerance:.0%} slower)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (median is reported)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated data API latency per request")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="fail if results regress versus this --json file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed wall-time regression (fraction)")
+    args = parser.parse_args()
+
+    fake_llm = ScriptedChatModel(corpus=CORPUS)
+    collector = _SpanCollector()
+    with FakeFinancialDatasetsServer(latency_ms=args.latency_ms) as server:
+        _install(fake_llm, server.url, collector)
+        results = [bench_query(entry, args.repeat, fake_llm, server, collector) for entry in CORPUS]
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = check_baseline(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
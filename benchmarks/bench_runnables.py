@@ -0,0 +1,115 @@
+"""
+Runnable reuse benchmark: what building LangChain chains costs, and whether queries still pay it.
+
+- per phase: building a chain vs fetching it from a RunnableRegistry
+- across queries: chain and LLM client builds, and time spent in acall_llm, for consecutive
+  Agent.run calls with a scripted LLM and a local data API. Everything built by the first query
+  should be reused by the next ones (--check fails otherwise).
+
+Usage: python -m benchmarks.bench_runnables [--iterations N] [--runs N] [--check]
+"""
+
+import argparse
+import sys
+import time
+
+# Sets up the benchmark environment (fake keys, no caches or rate limits) before Dexter is imported
+from benchmarks.bench_agent import _install, _run_query, _SilentUI, _SpanCollector
+from benchmarks.corpus import CORPUS
+from benchmarks.fake_api import FakeFinancialDatasetsServer
+from benchmarks.fake_llm import ScriptedChatModel
+from dexter.llm_pool import LLMClientPool, set_llm_pool
+from dexter.model import RunnableRegistry, _build_chain, get_llm
+from dexter.prompts import ACTION_SYSTEM_PROMPT, PLANNING_SYSTEM_PROMPT, VALIDATION_SYSTEM_PROMPT
+from dexter.schemas import IsDone, TaskList
+from dexter.tools import TOOLS
+
+PHASES = [
+    ("plan", PLANNING_SYSTEM_PROMPT.replace("{tools}", "(tools)"), TaskList, None),
+    ("action", ACTION_SYSTEM_PROMPT, None, TOOLS),
+    ("validate", VALIDATION_SYSTEM_PROMPT, IsDone, None),
+]
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_phases(iterations: int) -> None:
+    llm = get_llm("gpt-4.1-mini")
+    registry = RunnableRegistry()
+
+    print(f"{'phase':<10}{'rebuild (ms)':>14}{'registry (ms)':>15}{'speedup':>10}")
+    for phase, system_prompt, schema, tools in PHASES:
+        rebuild = _time_per_call(lambda: _build_chain(llm, system_prompt, schema, tools), iterations)
+        registry.get(llm, phase, system_prompt, schema, tools)  # warm
+        reuse = _time_per_call(lambda: registry.get(llm, phase, system_prompt, schema, tools), iterations)
+        print(f"{phase:<10}{rebuild * 1e3:>14.3f}{reuse * 1e3:>15.4f}{rebuild / reuse:>9.0f}x")
+
+
+class _CountingBuilds:
+    """Counts chain builds wherever they happen (registries die with their event loop, so their counters can't)."""
+
+    def __init__(self):
+        self.builds = 0
+
+    def __call__(self, *args):
+        self.builds += 1
+        return _build_chain(*args)
+
+
+def bench_queries(runs: int) -> list:
+    """Per Agent.run: wall ms, chains built, LLM clients built and ms spent in LLM calls."""
+    import dexter.model
+    from dexter.agent import Agent
+
+    entry = next(e for e in CORPUS if e["name"] == "two_ticker_compare")
+    fake_llm = ScriptedChatModel(corpus=CORPUS)
+    collector = _SpanCollector()
+    results = []
+    with FakeFinancialDatasetsServer() as server:
+        _install(fake_llm, server.url, collector)
+        pool = LLMClientPool(factory=lambda **kwargs: fake_llm)
+        set_llm_pool(pool)
+        counter = dexter.model._build_chain = _CountingBuilds()
+        agent = Agent(ui=_SilentUI())
+        for run in range(1, runs + 1):
+            collector.spans.clear()
+            chains, clients = counter.builds, pool.stats()["builds"]
+            start = time.perf_counter()
+            _run_query(agent, entry["query"])
+            results.append({
+                "run": run,
+                "wall_ms": (time.perf_counter() - start) * 1000,
+                "chain_builds": counter.builds - chains,
+                "client_builds": pool.stats()["builds"] - clients,
+                "llm_ms": sum(s.duration_ms for s in collector.spans if s.name == "llm"),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="builds/lookups timed per phase")
+    parser.add_argument("--runs", type=int, default=3, help="consecutive Agent.run calls")
+    parser.add_argument("--check", action="store_true", help="fail if a query after the first builds anything")
+    args = parser.parse_args()
+
+    bench_phases(args.iterations)
+
+    results = bench_queries(args.runs)
+    print(f"\n{'Agent.run':<10}{'wall ms':>10}{'chains':>8}{'clients':>9}{'llm ms':>9}")
+    for r in results:
+        print(f"{r['run']:<10}{r['wall_ms']:>10.1f}{r['chain_builds']:>8}{r['client_builds']:>9}{r['llm_ms']:>9.1f}")
+    if args.check:
+        rebuilt = [r["run"] for r in results[1:] if r["chain_builds"] or r["client_builds"]]
+        if rebuilt:
+            print(f"REBUILT chains or LLM clients in run(s) {', '.join(map(str, rebuilt))}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Startup benchmark: import time of the CLI and how long `dexter-agent` takes to show its prompt.
+
+Every measurement runs in a fresh interpreter, so module caches from earlier runs don't count:
+
+- import_cli_ms:     `import dexter.cli`
+- import_agent_ms:   `import dexter.agent`, which the CLI loads in the background
+- time_to_prompt_ms: process start until the prompt is shown (interpreter startup included)
+- agent_ready_ms:    process start until an agent exists when a query is typed immediately
+
+Usage: python -m benchmarks.bench_startup [--repeat N] [--json OUT] [--budget [FILE]] [--top N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "startup_budget.json")
+
+IMPORT_CHILD = """
+import time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+"""
+
+# Runs the real CLI main() with a stand-in prompt session that answers one query and then exits;
+# the query's agent is created for real but never run.
+CLI_CHILD = """
+import sys
+import dexter.cli as cli
+
+def mark(name):
+    sys.stdout.write("\\n@@" + name + "\\n")
+    sys.stdout.flush()
+
+class Session:
+    def __init__(self, *args, **kwargs):
+        self.queries = ["What was Apple's revenue last year?"]
+
+    def prompt(self, message):
+        mark("prompt")
+        if not self.queries:
+            raise EOFError
+        return self.queries.pop()
+
+class Agent:
+    def __init__(self, agent):
+        mark("agent")
+
+    def run(self, query):
+        pass
+
+create_agent = cli.create_agent
+cli.PromptSession = Session
+cli.create_agent = lambda: Agent(create_agent())
+cli.main()
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    env.setdefault("FINANCIAL_DATASETS_API_KEY", "benchmark")
+    return env
+
+
+def measure_import(module: str) -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_CHILD.format(module=module)], env=_env(),
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def measure_cli() -> dict:
+    """Milliseconds from process start to the prompt and to the first query's agent."""
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", CLI_CHILD], env=_env(), stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL, text=True)
+    marks = {}
+    for line in child.stdout:
+        if line.startswith("@@") and line[2:].strip() not in marks:
+            marks[line[2:].strip()] = (time.perf_counter() - start) * 1000
+    if child.wait() != 0 or {"prompt", "agent"} - set(marks):
+        raise RuntimeError(f"CLI child exited with {child.returncode} before reaching the prompt and creating an agent")
+    return {"time_to_prompt_ms": marks["prompt"], "agent_ready_ms": marks["agent"]}
+
+
+def slowest_imports(module: str, top: int) -> list:
+    """(cumulative ms, module) of the slowest imports under `module`, from -X importtime."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=_env(),
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]) / 1000, parts[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def bench(repeat: int) -> dict:
+    samples = {"import_cli_ms": [], "import_agent_ms": [], "time_to_prompt_ms": [], "agent_ready_ms": []}
+    for _ in range(repeat):
+        samples["import_cli_ms"].append(measure_import("dexter.cli"))
+        samples["import_agent_ms"].append(measure_import("dexter.agent"))
+        for key, value in measure_cli().items():
+            samples[key].append(value)
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def check_budget(results: dict, budget: dict) -> list:
+    return [f"{key}: {results[key]:.0f} ms > budget {limit:.0f} ms"
+            for key, limit in budget.items() if key in results and results[key] > limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--budget", nargs="?", const=BUDGET_FILE,
+                        help=f"fail if results exceed this budget file (default {os.path.relpath(BUDGET_FILE)})")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports under dexter.cli")
+    args = parser.parse_args()
+
+    results = bench(args.repeat)
+    for key, value in results.items():
+        print(f"{key:<20}{value:>9.1f}")
+    if args.top:
+        print(f"\nslowest imports under dexter.cli (cumulative ms):")
+        for ms, module in slowest_imports("dexter.cli", args.top):
+            print(f"{ms:>9.1f}  {module}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.budget:
+        with open(args.budget, encoding="utf-8") as f:
+            problems = check_budget(results, json.load(f))
+        for problem in problems:
+            print(f"OVER BUDGET {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
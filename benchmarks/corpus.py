@@ -0,0 +1,57 @@
+"""
+Fixed benchmark corpus: each query with the plan and tool calls the scripted model answers with.
+"""
+
+CORPUS = [
+    {
+        "name": "single_quarterly",
+        "query": "What was Apple's revenue growth over the last 4 quarters?",
+        "tasks": [
+            {"id": 1, "description": "Get AAPL quarterly income statements for the last 4 quarters",
+             "calls": [("get_income_statements", {"ticker": "AAPL", "period": "quarterly", "limit": 4})]},
+        ],
+    },
+    {
+        "name": "two_ticker_compare",
+        "query": "Compare Microsoft and Google's operating margins for 2023",
+        "tasks": [
+            {"id": 1, "description": "Get MSFT annual income statements covering 2023",
+             "calls": [("get_income_statements", {"ticker": "MSFT", "period": "annual", "limit": 2})]},
+            {"id": 2, "description": "Get GOOGL annual income statements covering 2023",
+             "calls": [("get_income_statements", {"ticker": "GOOGL", "period": "annual", "limit": 2})]},
+        ],
+    },
+    {
+        "name": "metrics",
+        "query": "How profitable has NVIDIA been over the last 5 years, and what is its revenue CAGR?",
+        "tasks": [
+            {"id": 1, "description": "Compute NVDA profitability ratios over the last 5 years",
+             "calls": [("compute_financial_metrics", {"ticker": "NVDA", "period": "annual", "limit": 5})]},
+        ],
+    },
+    {
+        "name": "batch_five_tickers",
+        "query": "Rank Apple, Microsoft, Google, Amazon and Meta by free cash flow",
+        "tasks": [
+            {"id": 1, "description": "Get annual cash flow statements for AAPL, MSFT, GOOGL, AMZN and META",
+             "calls": [("get_financial_statements_batch", {"tickers": ["AAPL", "MSFT", "GOOGL", "AMZN", "META"],
+                                                           "period": "annual",
+                                                           "statement_types": ["cash_flow_statement"], "limit": 4})]},
+        ],
+    },
+    {
+        "name": "dependent_tasks",
+        "query": "Look at Tesla's balance sheet, then work out its return on equity",
+        "tasks": [
+            {"id": 1, "description": "Get TSLA annual balance sheets", "depends_on": [],
+             "calls": [("get_balance_sheets", {"ticker": "TSLA", "period": "annual", "limit": 4})]},
+            {"id": 2, "description": "Compute TSLA return on equity and related ratios", "depends_on": [1],
+             "calls": [("compute_financial_metrics", {"ticker": "TSLA", "period": "annual", "limit": 4})]},
+        ],
+    },
+    {
+        "name": "out_of_scope",
+        "query": "What is the capital of France?",
+        "tasks": [],
+    },
+]
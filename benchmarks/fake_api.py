@@ -0,0 +1,159 @@
+"""
+Local stand-in for the Financial Datasets /financials/* endpoints, serving synthetic statements.
+
+Figures are derived from the ticker alone, so every run sees the same data.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+ANCHOR_YEAR = 2024
+MAX_PERIODS = 40
+
+
+def _report_periods(period: str) -> List[str]:
+    """Newest-first period end dates, back from the end of ANCHOR_YEAR."""
+    if period == "annual":
+        return [f"{ANCHOR_YEAR - i}-12-31" for i in range(MAX_PERIODS)]
+    quarter_ends = ["12-31", "09-30", "06-30", "03-31"]
+    return [f"{ANCHOR_YEAR - i // 4}-{quarter_ends[i % 4]}" for i in range(MAX_PERIODS)]
+
+
+def _scale(ticker: str) -> float:
+    seed = int(hashlib.sha256(ticker.encode("utf-8")).hexdigest()[:8], 16)
+    return 1e9 * (1 + seed % 500)
+
+
+def _income_statement(ticker: str, period: str, report_period: str, age: int) -> dict:
+    per_year = 1 if period == "annual" else 4
+    revenue = _scale(ticker) / (1 if period != "quarterly" else 4) * (0.95 ** (age / per_year))
+    gross_profit = revenue * 0.42
+    operating_income = revenue * 0.21
+    net_income = revenue * 0.16
+    return {
+        "revenue": revenue,
+        "cost_of_revenue": revenue - gross_profit,
+        "gross_profit": gross_profit,
+        "operating_expense": gross_profit - operating_income,
+        "operating_income": operating_income,
+        "net_income": net_income,
+        "earnings_per_share": net_income / 2.5e9,
+    }
+
+
+def _balance_sheet(ticker: str, period: str, report_period: str, age: int) -> dict:
+    total_assets = _scale(ticker) * 2.1 * (0.97 ** age)
+    total_liabilities = total_assets * 0.58
+    return {
+        "total_assets": total_assets,
+        "total_liabilities": total_liabilities,
+        "shareholders_equity": total_assets - total_liabilities,
+        "current_assets": total_assets * 0.35,
+        "current_liabilities": total_assets * 0.24,
+        "total_debt": total_assets * 0.22,
+        "cash_and_equivalents": total_assets * 0.08,
+    }
+
+
+def _cash_flow_statement(ticker: str, period: str, report_period: str, age: int) -> dict:
+    operating = _income_statement(ticker, period, report_period, age)["net_income"] * 1.2
+    capex = -operating * 0.3
+    return {
+        "net_cash_flow_from_operations": operating,
+        "capital_expenditure": capex,
+        "free_cash_flow": operating + capex,
+    }
+
+
+ENDPOINTS = {
+    "/financials/income-statements/": ("income_statements", _income_statement),
+    "/financials/balance-sheets/": ("balance_sheets", _balance_sheet),
+    "/financials/cash-flow-statements/": ("cash_flow_statements", _cash_flow_statement),
+}
+
+
+def build_statements(endpoint: str, params: Dict[str, str]) -> Optional[dict]:
+    """The JSON body for a request, or None for an unknown endpoint."""
+    if endpoint not in ENDPOINTS:
+        return None
+    key, build = ENDPOINTS[endpoint]
+    ticker = params.get("ticker", "").upper()
+    period = params.get("period", "annual")
+    limit = int(params.get("limit", 10))
+
+    periods = list(enumerate(_report_periods(period)))
+    for name, keep in (("report_period_gt", lambda p, v: p > v), ("report_period_gte", lambda p, v: p >= v),
+                       ("report_period_lt", lambda p, v: p < v), ("report_period_lte", lambda p, v: p <= v)):
+        if name in params:
+            value = date.fromisoformat(params[name]).isoformat()
+            periods = [(age, p) for age, p in periods if keep(p, value)]
+
+    statements = []
+    for age, report_period in periods[:limit]:
+        row = {"ticker": ticker, "report_period": report_period, "period": period, "currency": "USD"}
+        row.update({k: round(v, 2) for k, v in build(ticker, period, report_period, age).items()})
+        statements.append(row)
+    return {key: statements}
+
+
+class FakeFinancialDatasetsServer:
+    """Threaded HTTP server on localhost; use as a context manager and point requests at `.url`."""
+
+    def __init__(self, latency_ms: float = 0.0, port: int = 0):
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive like the real API, and no Nagle delay between header and body writes.
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                with server._lock:
+                    server.requests += 1
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                body = build_statements(url.path, params)
+                status = 200 if body is not None else 404
+                payload = json.dumps(body if body is not None else {"error": "not found"}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeFinancialDatasetsServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeFinancialDatasetsServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
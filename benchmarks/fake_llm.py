@@ -0,0 +1,120 @@
+"""
+Scripted chat model: answers every agent phase deterministically from the benchmark corpus.
+
+Plans come from the corpus entry whose query appears in the planning prompt. Each task's scripted
+tool calls are issued until all of them show up in the tool-output history, after which the model
+returns no calls. Validation always says done, and answers are a fixed sentence. Token usage is
+estimated as bytes / 4 so budgets and tracing see plausible numbers.
+"""
+
+import json
+import re
+import threading
+from collections import defaultdict
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+PLAN_QUERY = re.compile(r'(?:user query|用戶查詢)[:：]\s*"(.*?)"', re.S)
+ACTION_TASK = re.compile(r'(?:working on|正在處理)[:：]\s*"(.*?)"', re.S)
+STRUCTURED_PHASES = {"TaskList": "plan", "IsDone": "validate", "Answer": "answer"}
+
+
+class ScriptedChatModel(BaseChatModel):
+    corpus: List[dict]
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _calls: List[dict] = PrivateAttr(default_factory=list)
+    _call_ids: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    # ---------- bookkeeping ----------
+    @property
+    def calls(self) -> List[dict]:
+        """One entry per completion: phase, prompt_bytes and completion_bytes."""
+        with self._lock:
+            return list(self._calls)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+
+    def calls_per_phase(self) -> dict:
+        counts = defaultdict(int)
+        for call in self.calls:
+            counts[call["phase"]] += 1
+        return dict(counts)
+
+    def _next_id(self) -> str:
+        with self._lock:
+            self._call_ids += 1
+            return f"call_{self._call_ids}"
+
+    # ---------- scripting ----------
+    def _find_entry(self, prompt: str) -> Optional[dict]:
+        match = PLAN_QUERY.search(prompt)
+        return next((e for e in self.corpus if match and e["query"] == match.group(1)), None)
+
+    def _find_task(self, prompt: str) -> Optional[dict]:
+        match = ACTION_TASK.search(prompt)
+        if not match:
+            return None
+        return next((t for e in self.corpus for t in e["tasks"] if t["description"] == match.group(1)), None)
+
+    def _tool_call(self, name: str, args: dict) -> dict:
+        return {"name": name, "args": args, "id": self._next_id(), "type": "tool_call"}
+
+    def _respond(self, phase: str, prompt: str) -> AIMessage:
+        if phase == "plan":
+            entry = self._find_entry(prompt)
+            tasks = [{k: v for k, v in t.items() if k != "calls"} for t in (entry["tasks"] if entry else [])]
+            return AIMessage(content="", tool_calls=[self._tool_call("TaskList", {"tasks": tasks})])
+        if phase == "validate":
+            return AIMessage(content="", tool_calls=[self._tool_call("IsDone", {"done": True})])
+        if phase == "answer":
+            return AIMessage(content="", tool_calls=[self._tool_call("Answer", {"answer": self._answer(prompt)})])
+        if phase == "action":
+            task = self._find_task(prompt)
+            pending = [(name, args) for name, args in (task["calls"] if task else [])
+                       if f"{name} with args {args}" not in prompt]
+            return AIMessage(content="", tool_calls=[self._tool_call(name, args) for name, args in pending])
+        return AIMessage(content=self._answer(prompt))
+
+    @staticmethod
+    def _answer(prompt: str) -> str:
+        outputs = prompt.count("Output of ")
+        return f"Scripted answer based on {outputs} tool outputs.\nNo figures are real."
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, tools=None, **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if tools:
+            names = [t["function"]["name"] for t in tools]
+            phase = STRUCTURED_PHASES.get(names[0], "action") if len(names) == 1 else "action"
+        else:
+            phase = "text"
+        message = self._respond(phase, prompt)
+
+        prompt_bytes = len(prompt.encode("utf-8"))
+        completion_bytes = len(message.content.encode("utf-8")) + len(json.dumps(message.tool_calls).encode("utf-8"))
+        message.usage_metadata = {
+            "input_tokens": prompt_bytes // 4,
+            "output_tokens": completion_bytes // 4,
+            "total_tokens": (prompt_bytes + completion_bytes) // 4,
+        }
+        with self._lock:
+            self._calls.append({"phase": phase, "prompt_bytes": prompt_bytes, "completion_bytes": completion_bytes})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        # Scripted responses are instant; skip the default thread-pool hop.
+        return self._generate(messages, stop=stop, **kwargs)
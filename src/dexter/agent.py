@@ -1,8 +1,13 @@
-from typing import List, Optional
+import asyncio
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Iterator, List, Optional
 
 from langchain_core.messages import AIMessage
 
-from dexter.model import call_llm
+from dexter.budget import QueryBudget, use_budget
+from dexter.llm_pool import LLMClientPool
+from dexter.model import acall_llm, astream_llm
+from dexter.prefetch import start_prefetch, use_prefetch
 from dexter.prompts import (
     ACTION_SYSTEM_PROMPT,
     ANSWER_SYSTEM_PROMPT,
@@ -10,19 +15,64 @@ from dexter.prompts import (
     VALIDATION_SYSTEM_PROMPT,
 )
 from dexter.schemas import Answer, IsDone, Task, TaskList
-from dexter.tools import TOOLS
+from dexter.session_store import SessionStore
+from dexter.tools import TOOLS, use_financial_api_key
+from dexter.tracing import current_span, get_tracer, traced
 from dexter.utils.logger import Logger
-from dexter.utils.ui import show_progress
+from dexter.utils.aio import iterate_sync, run_sync
+from dexter.validation import RuleBasedValidator
 
 
-class Agent:
-    def __init__(self, max_steps: int = 20, max_steps_per_task: int = 5, use_chinese: bool = False, ui=None, model_name: str = None):
-        self.logger = Logger()
+@lru_cache(maxsize=None)
+def _planning_system_prompt(template: str) -> str:
+    """Planning prompt with the tool list filled in, formatted once per language."""
+    tool_descriptions = "\n".join([f"- {t.name}: {t.description}" for t in TOOLS])
+    return template.format(tools=tool_descriptions)
+
+
+# Relevant tool results sent in full once the query's budget calls for trimmed context
+TRIMMED_CONTEXT_RECORDS = 2
+
+
+class _RunState:
+    """Mutable state shared by every task of one run."""
+
+    def __init__(self, budget: QueryBudget):
+        self.step_count = 0
+        self.last_actions = {}  # task id -> recent action signatures, for stuck detection
+        self.store = SessionStore()  # indexed tool results for the whole session
+        self.aborted = False
+        self.budget = budget
+        self.out_of_budget = False  # stop working tasks and answer with what we have
+
+
+class AsyncAgent:
+    """Asyncio implementation of the plan → act → validate → answer loop."""
+
+    def __init__(self, max_steps: int = 20, max_steps_per_task: int = 5, use_chinese: bool = False, ui=None, model_name: str = None,
+                 parallel_tools: bool = True, max_tool_workers: int = 4, validators: Optional[list] = None,
+                 stream_answer: bool = False, token_budget: Optional[int] = None, cost_budget: Optional[float] = None,
+                 openai_api_key: Optional[str] = None, financial_api_key: Optional[str] = None,
+                 llm_pool: Optional[LLMClientPool] = None, quiet: bool = False):
+        self.logger = Logger(quiet=quiet)  # quiet: no terminal output (batch runs)
         self.max_steps = max_steps            # global safety cap
         self.max_steps_per_task = max_steps_per_task
+        self.parallel_tools = parallel_tools  # run independent tool calls of one turn concurrently
+        self.max_tool_workers = max_tool_workers
         self.use_chinese = use_chinese
         self.ui = ui  # Optional UI adapter (e.g., StreamlitUI)
         self.model_name = model_name  # OpenAI model to use
+        # Deterministic validation stages tried before the LLM validator; [] always asks the LLM.
+        self.validators = [RuleBasedValidator()] if validators is None else validators
+        self.stream_answer = stream_answer  # print the final answer token by token (CLI)
+        # Per-query limits (None falls back to DEXTER_TOKEN_BUDGET / DEXTER_COST_BUDGET, then unlimited)
+        self.token_budget = token_budget
+        self.cost_budget = cost_budget
+        # Per-agent credentials (None falls back to OPENAI_API_KEY / FINANCIAL_DATASETS_API_KEY), so
+        # sessions with different keys can share a process; clients come from the shared pool.
+        self.openai_api_key = openai_api_key
+        self.financial_api_key = financial_api_key
+        self.llm_pool = llm_pool
 
         # Load Chinese prompts if needed
         if self.use_chinese:
@@ -42,13 +92,15 @@ class Agent:
             self.validation_prompt = VALIDATION_SYSTEM_PROMPT
             self.answer_prompt = ANSWER_SYSTEM_PROMPT
 
+    def _llm_options(self) -> dict:
+        return {"model_name": self.model_name, "api_key": self.openai_api_key, "pool": self.llm_pool}
+
     # ---------- task planning ----------
-    def plan_tasks(self, query: str) -> List[Task]:
+    @traced("plan")
+    async def aplan_tasks(self, query: str) -> List[Task]:
         if self.ui:
             self.ui.show_planning_started()
 
-        tool_descriptions = "\n".join([f"- {t.name}: {t.description}" for t in TOOLS])
-
         if self.use_chinese:
             prompt = f"""
             給定用戶查詢："{query}"，
@@ -62,9 +114,9 @@ class Agent:
             Example: {{"tasks": [{{"id": 1, "description": "some task", "done": false}}]}}
             """
 
-        system_prompt = self.planning_prompt.format(tools=tool_descriptions)
+        system_prompt = _planning_system_prompt(self.planning_prompt)
         try:
-            response = call_llm(prompt, system_prompt=system_prompt, output_schema=TaskList, model_name=self.model_name)
+            response = await acall_llm(prompt, system_prompt=system_prompt, output_schema=TaskList, **self._llm_options(), phase="plan")
             tasks = response.tasks
         except Exception as e:
             if not self.ui:
@@ -72,6 +124,7 @@ class Agent:
             else:
                 self.ui.show_error(f"規劃失敗: {e}" if self.use_chinese else f"Planning failed: {e}")
             tasks = [Task(id=1, description=query, done=False)]
+        current_span().set(tasks=len(tasks))
 
         if self.ui:
             if tasks:
@@ -86,7 +139,8 @@ class Agent:
         return tasks
 
     # ---------- ask LLM what to do ----------
-    def ask_for_actions(self, task_desc: str, last_outputs: str = "") -> AIMessage:
+    @traced("action")
+    async def aask_for_actions(self, task_desc: str, last_outputs: str = "") -> AIMessage:
         # last_outputs = textual feedback of what we just tried
         if self.use_chinese:
             prompt = f"""
@@ -103,7 +157,9 @@ class Agent:
             Based on the task and the outputs, what should be the next step?
             """
         try:
-            return call_llm(prompt, system_prompt=self.action_prompt, tools=TOOLS, model_name=self.model_name)
+            ai_message = await acall_llm(prompt, system_prompt=self.action_prompt, tools=TOOLS, **self._llm_options(), phase="action")
+            current_span().set(tool_calls=len(ai_message.tool_calls), context_chars=len(last_outputs))
+            return ai_message
         except Exception as e:
             if self.ui:
                 self.ui.show_error(f"獲取操作失敗: {e}" if self.use_chinese else f"ask_for_actions failed: {e}")
@@ -112,10 +168,7 @@ class Agent:
             return AIMessage(content="Failed to get actions.")
 
     # ---------- ask LLM if task is done ----------
-    def ask_if_done(self, task_desc: str, recent_results: str) -> bool:
-        if self.ui:
-            self.ui.show_validation_check(task_desc)
-
+    async def aask_if_done(self, task_desc: str, recent_results: str) -> bool:
         if self.use_chinese:
             prompt = f"""
             我們試圖完成任務："{task_desc}"。
@@ -131,25 +184,98 @@ class Agent:
             Is the task done?
             """
         try:
-            resp = call_llm(prompt, system_prompt=self.validation_prompt, output_schema=IsDone, model_name=self.model_name)
+            resp = await acall_llm(prompt, system_prompt=self.validation_prompt, output_schema=IsDone, **self._llm_options(), phase="validate")
             return resp.done
-        except:
+        except Exception:
             return False
 
+    @staticmethod
+    def _max_full_records(state: "_RunState") -> Optional[int]:
+        return TRIMMED_CONTEXT_RECORDS if state.budget.should_trim else None
+
+    def _answer_data(self, query: str, state: "_RunState") -> List[str]:
+        """Tool results for the answer prompt, trimmed like the action prompts once the budget says so."""
+        max_full_records = self._max_full_records(state)
+        if max_full_records is None or not state.store.records:
+            return state.store.outputs()
+        return [state.store.answer_context(query, max_full_records)]
+
+    @traced("validate")
+    async def _avalidate(self, task: Task, state: "_RunState") -> bool:
+        """Run the deterministic validators, falling back to the LLM when none can decide."""
+        if self.ui:
+            self.ui.show_validation_check(task.description)
+
+        for validator in self.validators:
+            verdict = validator.validate(task, state.store)
+            if verdict is not None:
+                current_span().set(task_id=task.id, decided_by=type(validator).__name__, done=verdict)
+                return verdict
+        if state.budget.should_skip_validation:
+            # Budget is running low: accept the task rather than spend a validation call on it.
+            current_span().set(task_id=task.id, decided_by="budget", done=True)
+            return True
+        context = state.store.context_for(task.id, task.description, task.depends_on, self._max_full_records(state))
+        done = await self.aask_if_done(task.description, context)
+        current_span().set(task_id=task.id, decided_by="llm", done=done)
+        return done
+
     # ---------- tool execution ----------
-    def _execute_tool(self, tool, tool_name: str, inp_args):
+    async def _ainvoke_tool(self, tool, tool_name: str, inp_args):
+        with get_tracer().span("tool", tool=tool_name, args=str(inp_args)) as span:
+            result = await tool.ainvoke(inp_args)
+            if span.recording:
+                span.set(result_chars=len(str(result)))
+            return result
+
+    async def _aexecute_tool(self, tool, tool_name: str, inp_args):
         """Execute a tool with progress indication."""
         if self.ui:
             self.ui.show_tool_execution(tool_name, inp_args)
-            result = tool.run(inp_args)
+            result = await self._ainvoke_tool(tool, tool_name, inp_args)
             self.ui.show_tool_result(tool_name, result)
             return result
         else:
-            # Create a dynamic decorator with the tool name
-            @show_progress(f"Executing {tool_name}...", "")
-            def run_tool():
-                return tool.run(inp_args)
-            return run_tool()
+            with self.logger.progress(f"Executing {tool_name}...", ""):
+                return await self._ainvoke_tool(tool, tool_name, inp_args)
+
+    async def _aexecute_tool_batch(self, batch: list) -> list:
+        """Execute (tool, tool_name, inp_args) calls, returning (result, error) pairs in call order."""
+        if not self.parallel_tools or len(batch) < 2:
+            outcomes = []
+            for tool, tool_name, inp_args in batch:
+                try:
+                    outcomes.append((await self._aexecute_tool(tool, tool_name, inp_args), None))
+                except Exception as e:
+                    outcomes.append((None, e))
+            return outcomes
+
+        if self.ui:
+            for _, tool_name, inp_args in batch:
+                self.ui.show_tool_execution(tool_name, inp_args)
+
+        limit = asyncio.Semaphore(self.max_tool_workers)
+
+        async def run_one(tool, tool_name, inp_args):
+            async with limit:
+                try:
+                    return await self._ainvoke_tool(tool, tool_name, inp_args), None
+                except Exception as e:
+                    return None, e
+
+        async def run_all():
+            return await asyncio.gather(*(run_one(tool, tool_name, inp_args) for tool, tool_name, inp_args in batch))
+
+        if self.ui:
+            outcomes = await run_all()
+            for (_, tool_name, _), (result, error) in zip(batch, outcomes):
+                if error is None:
+                    self.ui.show_tool_result(tool_name, result)
+            return outcomes
+
+        names = ", ".join(tool_name for _, tool_name, _ in batch)
+        with self.logger.progress(f"Executing {names}...", ""):
+            return await run_all()
     
     # ---------- confirm action ----------
     def confirm_action(self, tool: str, input_str: str) -> bool:
@@ -158,96 +284,223 @@ class Agent:
         return True
 
     # ---------- main loop ----------
-    def run(self, query: str):
-        # Reset state
-        step_count = 0
-        last_actions = []
-        session_outputs = []  # accumulate outputs for the whole session
+    @traced("query")
+    async def arun(self, query: str, on_token: Optional[Callable[[str], None]] = None, budget: Optional[QueryBudget] = None):
+        """Answer `query`; if `on_token` is given, the final answer is also passed to it as it streams.
+
+        LLM usage is charged to `budget` (by default one built from the agent's limits), which the
+        caller can inspect afterwards.
+        """
+        current_span().set(query=query)
+        state = _RunState(budget or QueryBudget.from_env(self.token_budget, self.cost_budget))
+        try:
+            with use_budget(state.budget), use_financial_api_key(self.financial_api_key):
+                return await self._arun(query, state, on_token)
+        finally:
+            current_span().set(**state.budget.stats())
 
+    async def _arun(self, query: str, state: "_RunState", on_token: Optional[Callable[[str], None]]):
         # Plan tasks
-        tasks = self.plan_tasks(query)
+        tasks = await self.aplan_tasks(query)
 
         # If no tasks were created, query is out of scope - answer directly
         if not tasks:
-            answer = self._generate_answer(query, session_outputs)
-            self.logger.log_summary(answer)
-            return answer
+            return await self._agenerate_answer(query, self._answer_data(query, state), on_token)
 
-        # Main agent loop
-        while any(not t.done for t in tasks):
-            if step_count >= self.max_steps:
-                self.logger._log("Global max steps reached — aborting to avoid runaway loop.")
-                break
+        # Warm the data cache for statements the plan names while the first action is being decided
+        prefetcher = start_prefetch(query, [t.description for t in tasks])
+        try:
+            with use_prefetch(prefetcher):
+                if self._has_dependencies(tasks):
+                    await self._arun_task_graph(tasks, state)
+                else:
+                    await self._arun_tasks_sequentially(tasks, state)
+        finally:
+            if prefetcher is not None:
+                current_span().set(**prefetcher.close())
+        if state.aborted:
+            return
 
-            task = next(t for t in tasks if not t.done)
-            if self.ui:
-                self.ui.show_working_on_task(task.description)
-            else:
-                self.logger.log_task_start(task.description)
+        # Generate answer based on all collected data
+        return await self._agenerate_answer(query, self._answer_data(query, state), on_token)
 
-            per_task_steps = 0
-            while per_task_steps < self.max_steps_per_task:
-                if step_count >= self.max_steps:
-                    self.logger._log("Global max steps reached — stopping.")
-                    return
+    async def astream(self, query: str, budget: Optional[QueryBudget] = None) -> AsyncIterator[str]:
+        """Run the agent and yield the final answer's tokens as the model produces them."""
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
 
-                ai_message = self.ask_for_actions(task.description, last_outputs="\n".join(session_outputs))
-                
-                if not ai_message.tool_calls:
-                    # No tool calls means either the task is done or cannot be done with tools
-                    # Always mark as done to avoid infinite loops
-                    # The final answer generation will provide an appropriate response
-                    task.done = True
-                    if self.ui:
-                        self.ui.show_task_completed(task.id)
-                    else:
-                        self.logger.log_task_done(task.description)
-                    break
+        async def produce():
+            try:
+                return await self.arun(query, on_token=queue.put_nowait, budget=budget)
+            finally:
+                queue.put_nowait(done)
 
-                for tool_call in ai_message.tool_calls:
-                    if step_count >= self.max_steps:
-                        break
+        run = asyncio.ensure_future(produce())
+        try:
+            while (token := await queue.get()) is not done:
+                yield token
+            await run  # surface errors from the run
+        finally:
+            # Consumer stopped early: stop the run and let it unwind before the loop goes away
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+
+    def _over_budget(self, state: "_RunState") -> bool:
+        """True once the query's budget says to stop working tasks and answer."""
+        if not state.out_of_budget and state.budget.should_answer:
+            state.out_of_budget = True
+            self.logger._log("Query budget nearly spent — answering with the data gathered so far.")
+        return state.out_of_budget
+
+    @staticmethod
+    def _has_dependencies(tasks: List[Task]) -> bool:
+        """True when the plan says how its tasks depend on each other.
+
+        A plan whose depends_on lists are all empty (or missing) carries no ordering information,
+        since that is also what the model emits when it ignores the field; it runs in plan order.
+        """
+        return any(t.depends_on for t in tasks)
+
+    async def _arun_tasks_sequentially(self, tasks: List[Task], state: "_RunState"):
+        """Work the first unfinished task until every task is done or the step cap is hit."""
+        while any(not t.done for t in tasks):
+            if self._over_budget(state):
+                return
+            if state.step_count >= self.max_steps:
+                self.logger._log("Global max steps reached — aborting to avoid runaway loop.")
+                return
 
-                    tool_name = tool_call["name"]
-                    inp_args = tool_call["args"]
-                    action_sig = f"{tool_name}:{inp_args}"
+            task = next(t for t in tasks if not t.done)
+            await self._arun_task(task, state)
+            if state.aborted:
+                return
+
+    async def _arun_task_graph(self, tasks: List[Task], state: "_RunState"):
+        """Run tasks concurrently as soon as the tasks they depend on are done."""
+        known_ids = {t.id for t in tasks}
+        deps = {t.id: {d for d in (t.depends_on or []) if d in known_ids and d != t.id} for t in tasks}
+        done_ids = {t.id for t in tasks if t.done}
+        pending = [t for t in tasks if not t.done]
+        running = {}
 
-                    # stuck detection
-                    last_actions.append(action_sig)
-                    if len(last_actions) > 4:
-                        last_actions = last_actions[-4:]
-                    if len(set(last_actions)) == 1 and len(last_actions) == 4:
-                        self.logger._log("Detected repeating action — aborting to avoid loop.")
+        try:
+            while pending or running:
+                if self._over_budget(state):
+                    if not running:
                         return
-                    
-                    tool_to_run = next((t for t in TOOLS if t.name == tool_name), None)
-                    if tool_to_run and self.confirm_action(tool_name, str(inp_args)):
-                        try:
-                            result = self._execute_tool(tool_to_run, tool_name, inp_args)
-                            self.logger.log_tool_run(tool_name, f"{result}")
-                            session_outputs.append(f"Output of {tool_name} with args {inp_args}: {result}")
-                        except Exception as e:
-                            self.logger._log(f"Tool execution failed: {e}")
-                            session_outputs.append(f"Error from {tool_name} with args {inp_args}: {e}")
-                    else:
-                        self.logger._log(f"Invalid tool: {tool_name}")
-
-                    step_count += 1
-                    per_task_steps += 1
+                elif state.step_count < self.max_steps:
+                    ready = [t for t in pending if deps[t.id] <= done_ids]
+                    if not ready and not running:
+                        # Cyclic or unsatisfiable dependencies: fall back to plan order.
+                        ready = pending[:1]
+                    for task in ready:
+                        pending.remove(task)
+                        running[asyncio.ensure_future(self._arun_task(task, state))] = task
+                elif not running:
+                    self.logger._log("Global max steps reached — aborting to avoid runaway loop.")
+                    return
 
-                # check after this batch if task seems done
-                if self.ask_if_done(task.description, "\n".join(session_outputs)):
-                    task.done = True
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    future.result()
+                    if task.done:
+                        done_ids.add(task.id)
+                    else:
+                        # Out of per-task steps without finishing: retry it, as the sequential loop does.
+                        pending.append(task)
+                if state.aborted:
+                    return
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    @traced("task")
+    async def _arun_task(self, task: Task, state: "_RunState"):
+        """Run the action/validation loop for one task, up to max_steps_per_task tool calls."""
+        current_span().set(task_id=task.id, description=task.description)
+        if self.ui:
+            self.ui.show_working_on_task(task.description)
+        else:
+            self.logger.log_task_start(task.description)
+
+        last_actions = state.last_actions.setdefault(task.id, [])
+        per_task_steps = 0
+        while per_task_steps < self.max_steps_per_task:
+            if state.aborted or self._over_budget(state):
+                return
+            if state.step_count >= self.max_steps:
+                self.logger._log("Global max steps reached — stopping.")
+                state.aborted = True
+                return
+
+            # Only this task's relevant results go in full; the rest is summarized in a manifest.
+            context = state.store.context_for(task.id, task.description, task.depends_on, self._max_full_records(state))
+            ai_message = await self.aask_for_actions(task.description, last_outputs=context)
+            
+            if not ai_message.tool_calls:
+                # No tool calls means either the task is done or cannot be done with tools
+                # Always mark as done to avoid infinite loops
+                # The final answer generation will provide an appropriate response
+                task.done = True
+                if self.ui:
+                    self.ui.show_task_completed(task.id)
+                else:
                     self.logger.log_task_done(task.description)
+                return
+
+            # Admit this turn's tool calls against the step caps and stuck detection first,
+            # then run the admitted batch (concurrently when enabled).
+            batch = []
+            stuck = False
+            for tool_call in ai_message.tool_calls:
+                if state.step_count >= self.max_steps:
                     break
 
-        # Generate answer based on all collected data
-        answer = self._generate_answer(query, session_outputs)
-        self.logger.log_summary(answer)
-        return answer
+                tool_name = tool_call["name"]
+                inp_args = tool_call["args"]
+                action_sig = f"{tool_name}:{inp_args}"
+
+                # stuck detection
+                last_actions.append(action_sig)
+                if len(last_actions) > 4:
+                    del last_actions[:-4]
+                if len(set(last_actions)) == 1 and len(last_actions) == 4:
+                    self.logger._log("Detected repeating action — aborting to avoid loop.")
+                    state.aborted = True
+                    stuck = True
+                    break
+                
+                tool_to_run = next((t for t in TOOLS if t.name == tool_name), None)
+                if tool_to_run and self.confirm_action(tool_name, str(inp_args)):
+                    batch.append((tool_to_run, tool_name, inp_args))
+                else:
+                    self.logger._log(f"Invalid tool: {tool_name}")
+
+                state.step_count += 1
+                per_task_steps += 1
+
+            for (_, tool_name, inp_args), (result, error) in zip(batch, await self._aexecute_tool_batch(batch)):
+                if error is None:
+                    self.logger.log_tool_run(tool_name, f"{result}")
+                else:
+                    self.logger._log(f"Tool execution failed: {error}")
+                state.store.add(task.id, tool_name, inp_args, result, error)
+            if stuck:
+                # The calls admitted before the repeating one still ran, as they would have one by one
+                return
+
+            # check after this batch if task seems done
+            if await self._avalidate(task, state):
+                task.done = True
+                self.logger.log_task_done(task.description)
+                return
     
     # ---------- answer generation ----------
-    def _generate_answer(self, query: str, session_outputs: list) -> str:
+    @traced("answer")
+    async def _agenerate_answer(self, query: str, session_outputs: list, on_token: Optional[Callable[[str], None]] = None) -> str:
         """Generate the final answer based on collected data."""
         if self.ui:
             self.ui.show_generating_answer()
@@ -278,5 +531,45 @@ class Agent:
             Include specific numbers, calculations, and insights.
             """
 
-        answer_obj = call_llm(answer_prompt, system_prompt=self.answer_prompt, output_schema=Answer, model_name=self.model_name)
-        return answer_obj.answer
+        if on_token is None and not self.stream_answer:
+            answer_obj = await acall_llm(answer_prompt, system_prompt=self.answer_prompt, output_schema=Answer, **self._llm_options(), phase="answer")
+            self.logger.log_summary(answer_obj.answer)
+            return answer_obj.answer
+
+        # Streaming: plain-text completion, rendered as it arrives
+        writer = self.logger.start_summary() if on_token is None else None
+        chunks = []
+        try:
+            async for chunk in astream_llm(answer_prompt, system_prompt=self.answer_prompt, **self._llm_options(), phase="answer"):
+                chunks.append(chunk)
+                if writer is not None:
+                    writer.write(chunk)
+                else:
+                    on_token(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        answer = "".join(chunks)
+        if writer is None:
+            self.logger.log_summary(answer)
+        return answer
+
+
+class Agent(AsyncAgent):
+    """Blocking facade over AsyncAgent for the CLI and Streamlit app."""
+
+    def run(self, query: str):
+        return run_sync(self.arun(query))
+
+    def run_stream(self, query: str) -> Iterator[str]:
+        """Run the agent, yielding the final answer's tokens (e.g. for st.write_stream)."""
+        return iterate_sync(self.astream(query))
+
+    def plan_tasks(self, query: str) -> List[Task]:
+        return run_sync(self.aplan_tasks(query))
+
+    def ask_for_actions(self, task_desc: str, last_outputs: str = "") -> AIMessage:
+        return run_sync(self.aask_for_actions(task_desc, last_outputs))
+
+    def ask_if_done(self, task_desc: str, recent_results: str) -> bool:
+        return run_sync(self.aask_if_done(task_desc, recent_results))
@@ -0,0 +1,150 @@
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from dexter.agent import AsyncAgent
+from dexter.budget import QueryBudget
+from dexter.utils.aio import run_sync
+
+####################################
+# Headless batch runs
+####################################
+
+
+def load_queries(path: str) -> List[dict]:
+    """Read [{"id", "query"}] from a CSV file with a `query` column, or from JSON lines.
+
+    JSON lines may be objects with a "query" (and optionally an "id") or bare strings. Rows
+    without an id are numbered from 1 in file order, so keep the file append-only if you rely
+    on resuming.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    queries, seen = [], set()
+    for n, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            row = {"query": row}
+        query = str(row.get("query") or "").strip()
+        if not query:
+            raise ValueError(f"{path}: row {n} has no query")
+        query_id = str(row.get("id") or n)
+        if query_id in seen:
+            raise ValueError(f"{path}: duplicate id {query_id!r}")
+        seen.add(query_id)
+        queries.append({"id": query_id, "query": query})
+    return queries
+
+
+def completed_ids(output_path: str) -> set:
+    """Ids that already have an answer in `output_path`; failed rows are retried on resume."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interruption
+            if row.get("error") is None:
+                done.add(str(row["id"]))
+            else:
+                done.discard(str(row["id"]))
+    return done
+
+
+def _open_output(output_path: str, resume: bool):
+    if os.path.dirname(os.path.abspath(output_path)):
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    if not resume:
+        return open(output_path, "w", encoding="utf-8")
+    cut_short = False
+    if os.path.exists(output_path) and os.path.getsize(output_path):
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            cut_short = f.read(1) != b"\n"
+    out = open(output_path, "a", encoding="utf-8")
+    if cut_short:
+        out.write("\n")  # end the line an interruption cut short, so the next row starts cleanly
+    return out
+
+
+async def _answer(agent: AsyncAgent, item: dict) -> dict:
+    budget = QueryBudget.from_env(agent.token_budget, agent.cost_budget)
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    start = time.perf_counter()
+    answer, error = None, None
+    try:
+        answer = await agent.arun(item["query"], budget=budget)
+        if answer is None:
+            error = "Aborted before answering (step limit reached)"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "id": item["id"],
+        "query": item["query"],
+        "answer": answer,
+        "error": error,
+        "started_at": started_at,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        **budget.stats(),
+    }
+
+
+def _progress(done: int, total: int, row: dict) -> None:
+    status = "ok" if row["error"] is None else f"failed: {row['error']}"
+    print(f"[{done}/{total}] {row['id']} {status} ({row['elapsed_ms'] / 1000:.1f}s, {row['total_tokens']} tokens)",
+          file=sys.stderr, flush=True)
+
+
+async def arun_batch(queries: List[dict], output_path: str, workers: int = 4, resume: bool = True,
+                     agent_factory: Optional[Callable[[], AsyncAgent]] = None,
+                     on_result: Optional[Callable[[int, int, dict], None]] = _progress) -> dict:
+    """Answer `queries` with a pool of `workers` agents, appending one JSON line per query to `output_path`.
+
+    All agents share this event loop, so they share the response caches, in-flight request
+    coalescing and connection pools. Each row is flushed as soon as its query finishes; with
+    `resume`, queries already answered in `output_path` are skipped. Returns a summary.
+    """
+    agent_factory = agent_factory or (lambda: AsyncAgent(quiet=True))
+    skip = completed_ids(output_path) if resume else set()
+    pending = [item for item in queries if item["id"] not in skip]
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    summary = {"total": len(queries), "skipped": len(queries) - len(pending), "succeeded": 0, "failed": 0,
+               "total_tokens": 0, "cost": 0.0}
+    start = time.perf_counter()
+
+    with _open_output(output_path, resume) as out:
+        async def work(agent: AsyncAgent):
+            while not queue.empty():
+                row = await _answer(agent, queue.get_nowait())
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                out.flush()
+                summary["succeeded" if row["error"] is None else "failed"] += 1
+                summary["total_tokens"] += row["total_tokens"]
+                summary["cost"] += row["cost"]
+                if on_result is not None:
+                    on_result(summary["succeeded"] + summary["failed"], len(pending), row)
+
+        await asyncio.gather(*(work(agent_factory()) for _ in range(max(1, min(workers, len(pending))))))
+
+    summary["cost"] = round(summary["cost"], 6)
+    summary["elapsed_s"] = round(time.perf_counter() - start, 1)
+    return summary
+
+
+def run_batch(input_path: str, output_path: str, workers: int = 4, resume: bool = True) -> dict:
+    """Blocking entry point for `dexter-agent --batch`."""
+    return run_sync(arun_batch(load_queries(input_path), output_path, workers=workers, resume=resume))
@@ -0,0 +1,101 @@
+import contextvars
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+####################################
+# Per-query token and cost budgets
+####################################
+
+
+class QueryBudget:
+    """Tracks the tokens and dollars one query has spent and how the agent should degrade.
+
+    As the larger of the token and cost fractions grows, the agent first trims the context it
+    sends (`should_trim`), then stops asking the LLM to validate tasks (`should_skip_validation`),
+    and finally stops working tasks and answers with what it has (`should_answer`). Without
+    limits it only keeps count.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, max_cost: Optional[float] = None,
+                 trim_at: float = 0.5, skip_validation_at: float = 0.75, answer_at: float = 0.9):
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.trim_at = trim_at
+        self.skip_validation_at = skip_validation_at
+        self.answer_at = answer_at
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.llm_calls = 0
+
+    @classmethod
+    def from_env(cls, max_tokens: Optional[int] = None, max_cost: Optional[float] = None) -> "QueryBudget":
+        """Budget with explicit limits, falling back to DEXTER_TOKEN_BUDGET / DEXTER_COST_BUDGET."""
+        if max_tokens is None and os.getenv("DEXTER_TOKEN_BUDGET"):
+            max_tokens = int(os.getenv("DEXTER_TOKEN_BUDGET"))
+        if max_cost is None and os.getenv("DEXTER_COST_BUDGET"):
+            max_cost = float(os.getenv("DEXTER_COST_BUDGET"))
+        return cls(max_tokens, max_cost)
+
+    def charge(self, prompt_tokens: int, completion_tokens: int, cost: float) -> None:
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost += cost
+            self.llm_calls += 1
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def used_fraction(self) -> float:
+        fractions = [0.0]
+        if self.max_tokens:
+            fractions.append(self.total_tokens / self.max_tokens)
+        if self.max_cost:
+            fractions.append(self.cost / self.max_cost)
+        return max(fractions)
+
+    @property
+    def should_trim(self) -> bool:
+        return self.used_fraction >= self.trim_at
+
+    @property
+    def should_skip_validation(self) -> bool:
+        return self.used_fraction >= self.skip_validation_at
+
+    @property
+    def should_answer(self) -> bool:
+        return self.used_fraction >= self.answer_at
+
+    def stats(self) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cost": round(self.cost, 6),
+            "llm_calls": self.llm_calls,
+            "used_fraction": self.used_fraction,
+        }
+
+
+_current_budget: contextvars.ContextVar[Optional[QueryBudget]] = contextvars.ContextVar("dexter_budget", default=None)
+
+
+def current_budget() -> Optional[QueryBudget]:
+    """The budget of the query being run in this context, if any."""
+    return _current_budget.get()
+
+
+@contextmanager
+def use_budget(budget: QueryBudget):
+    """Charge LLM usage within the block (including tasks it spawns) to `budget`."""
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from dexter.utils.env import cache_dir, env_flag
+
+####################################
+# Persistent API response cache
+####################################
+
+# Seconds a response stays fresh, keyed on the `period` request parameter.
+# Annual statements only change a few times a year; quarterly and TTM data
+# moves with every earnings release.
+DEFAULT_TTLS: Dict[str, float] = {
+    "annual": 7 * 24 * 3600,
+    "quarterly": 12 * 3600,
+    "ttm": 12 * 3600,
+}
+DEFAULT_TTL = 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _default_cache_path() -> str:
+    return os.path.join(cache_dir(), "api_cache.sqlite3")
+
+
+def make_cache_key(endpoint: str, params: dict, tenant: str = "") -> str:
+    """Build a stable key from an endpoint, its query parameters and the tenant (API key digest) asking."""
+    normalized = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if name == "ticker" and isinstance(value, str):
+            value = value.strip().upper()
+        normalized[name] = value
+    parts = [tenant, endpoint, normalized] if tenant else [endpoint, normalized]
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed cache of API responses with per-period TTLs and LRU eviction.
+
+    Entries are stored per tenant (a digest of the API key that fetched them), so a key the API
+    would reject is never answered from data another key fetched.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+    ):
+        self.path = path or _default_cache_path()
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        try:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+            return conn
+        except (sqlite3.Error, OSError):
+            # An unwritable cache location must never break the tools.
+            return None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def ttl_for(self, params: dict) -> float:
+        """Return the freshness window for a request based on its period."""
+        return self.ttls.get(params.get("period"), self.default_ttl)
+
+    def get(self, endpoint: str, params: dict, tenant: str = "") -> Optional[dict]:
+        """Return a fresh cached response stored for `tenant`, or None on a miss."""
+        if self._conn is None:
+            return None
+        key = make_cache_key(endpoint, params, tenant)
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] <= now:
+                    if row is not None:
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.misses += 1
+                    return None
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            except sqlite3.Error:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, endpoint: str, params: dict, data: dict, tenant: str = "") -> None:
+        """Store a response for `tenant` and evict least recently used entries past the size limit."""
+        if self._conn is None:
+            return
+        key = make_cache_key(endpoint, params, tenant)
+        value = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, endpoint, value, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, endpoint, value, len(value), now + self.ttl_for(params), now),
+                )
+                self._evict()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM responses")
+            except sqlite3.Error:
+                pass
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current cache size."""
+        entries, size = 0, 0
+        if self._conn is not None:
+            with self._lock:
+                try:
+                    entries, size = self._conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                    ).fetchone()
+                except sqlite3.Error:
+                    pass
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+class _NullCache:
+    """Cache stand-in used when caching is disabled."""
+
+    enabled = False
+
+    def get(self, endpoint: str, params: dict, tenant: str = "") -> Optional[dict]:
+        return None
+
+    def set(self, endpoint: str, params: dict, data: dict, tenant: str = "") -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"enabled": False, "hits": 0, "misses": 0, "hit_rate": 0.0, "evictions": 0, "entries": 0, "bytes": 0}
+
+
+# Global cache instance (lazy initialization)
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Get or create the process-wide API response cache."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                if not env_flag("DEXTER_API_CACHE", True):
+                    _response_cache = _NullCache()
+                else:
+                    max_mb = float(os.getenv("DEXTER_API_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+                    _response_cache = ResponseCache(max_bytes=int(max_mb * 1024 * 1024))
+    return _response_cache
+
+
+def set_response_cache(cache) -> None:
+    """Replace the process-wide API response cache (pass None to re-initialize lazily)."""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = cache
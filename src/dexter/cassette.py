@@ -0,0 +1,209 @@
+import asyncio
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from dexter.cache import make_cache_key
+from dexter.llm_cache import deserialize_response, llm_cache_key, serialize_response
+
+####################################
+# Record/replay cassettes
+####################################
+
+MODES = ("record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded exchange for a request."""
+
+
+class CassetteReplayError(RuntimeError):
+    """A recorded exchange that originally failed, raised again on replay."""
+
+
+class Cassette:
+    """Records every LLM and data API exchange of a run to a file, or serves them back.
+
+    The file is JSON lines, gzip-compressed when the path ends in ".gz". Exchanges are keyed
+    like the response caches (model, prompts, schema and tools; endpoint and params), so replay
+    does not depend on call order; repeated requests are served in recorded order, and the last
+    recording is reused once they run out. With `latency` > 0 replay sleeps for that fraction
+    of each exchange's recorded latency.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: float = 0.0):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {MODES}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries = defaultdict(list)
+        self._served = defaultdict(int)
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        if mode == "replay":
+            self._load()
+        elif os.path.dirname(os.path.abspath(path)):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        with self._open("r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[(entry["kind"], entry["key"])].append(entry)
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            # Appending keeps the cassette usable even if the run dies part-way
+            # (gzip readers accept the resulting multi-member files).
+            with self._open("a") as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+    def _next(self, kind: str, key: str, description: str) -> dict:
+        with self._lock:
+            entries = self._entries.get((kind, key))
+            if not entries:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded {kind} exchange for {description} in {self.path}")
+            index = min(self._served[(kind, key)], len(entries) - 1)
+            self._served[(kind, key)] += 1
+            self.replayed += 1
+            return entries[index]
+
+    @staticmethod
+    def _error(error: Optional[BaseException]) -> Optional[str]:
+        return f"{type(error).__name__}: {error}" if error is not None else None
+
+    def _delay(self, entry: dict) -> float:
+        return self.latency * entry.get("latency_ms", 0.0) / 1000
+
+    # ---------- LLM exchanges ----------
+    def record_llm(self, model_name: str, system_prompt: str, prompt: str, output_schema: Optional[Type[BaseModel]],
+                   tools, phase: Optional[str], latency_ms: float, response=None, usage: Optional[Tuple[int, int]] = None,
+                   error: Optional[BaseException] = None) -> None:
+        self._write({
+            "kind": "llm",
+            "key": llm_cache_key(model_name, system_prompt, prompt, output_schema, None if output_schema else tools),
+            "phase": phase,
+            "model": model_name,
+            "latency_ms": round(latency_ms, 3),
+            "usage": list(usage) if usage else None,
+            "response": serialize_response(response) if response is not None else None,
+            "error": self._error(error),
+        })
+
+    def _replay_llm_entry(self, model_name, system_prompt, prompt, output_schema, tools, phase) -> dict:
+        key = llm_cache_key(model_name, system_prompt, prompt, output_schema, None if output_schema else tools)
+        return self._next("llm", key, f"the {phase or 'unnamed'} phase on {model_name}")
+
+    @staticmethod
+    def _llm_result(entry: dict, output_schema):
+        if entry["error"]:
+            raise CassetteReplayError(entry["error"])
+        usage = tuple(entry["usage"]) if entry.get("usage") else None
+        return deserialize_response(entry["response"], output_schema), usage
+
+    def replay_llm(self, model_name: str, system_prompt: str, prompt: str, output_schema, tools, phase: Optional[str]):
+        """Return (response, usage or None) for a recorded LLM call, after any simulated latency."""
+        entry = self._replay_llm_entry(model_name, system_prompt, prompt, output_schema, tools, phase)
+        time.sleep(self._delay(entry))
+        return self._llm_result(entry, output_schema)
+
+    async def areplay_llm(self, model_name: str, system_prompt: str, prompt: str, output_schema, tools, phase: Optional[str]):
+        entry = self._replay_llm_entry(model_name, system_prompt, prompt, output_schema, tools, phase)
+        await asyncio.sleep(self._delay(entry))
+        return self._llm_result(entry, output_schema)
+
+    # ---------- data API exchanges ----------
+    def record_api(self, endpoint: str, params: dict, latency_ms: float, data: Optional[dict] = None,
+                   error: Optional[BaseException] = None) -> None:
+        self._write({
+            "kind": "api",
+            "key": make_cache_key(endpoint, params),
+            "endpoint": endpoint,
+            "params": params,
+            "latency_ms": round(latency_ms, 3),
+            "response": data,
+            "error": self._error(error),
+        })
+
+    @staticmethod
+    def _api_result(entry: dict) -> dict:
+        if entry["error"]:
+            raise CassetteReplayError(entry["error"])
+        return entry["response"]
+
+    def replay_api(self, endpoint: str, params: dict) -> dict:
+        entry = self._next("api", make_cache_key(endpoint, params), f"{endpoint} {params}")
+        time.sleep(self._delay(entry))
+        return self._api_result(entry)
+
+    async def areplay_api(self, endpoint: str, params: dict) -> dict:
+        entry = self._next("api", make_cache_key(endpoint, params), f"{endpoint} {params}")
+        await asyncio.sleep(self._delay(entry))
+        return self._api_result(entry)
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "recorded": self.recorded, "replayed": self.replayed, "misses": self.misses}
+
+
+class _NullCassette:
+    """Cassette stand-in used when neither recording nor replaying."""
+
+    mode = None
+    recording = False
+    replaying = False
+
+    def stats(self) -> dict:
+        return {"mode": None, "recorded": 0, "replayed": 0, "misses": 0}
+
+
+# Global cassette instance (lazy initialization)
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    """Get or create the process-wide cassette from DEXTER_CASSETTE / DEXTER_CASSETTE_MODE."""
+    global _cassette
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                path = os.getenv("DEXTER_CASSETTE")
+                if path:
+                    _cassette = Cassette(path, os.getenv("DEXTER_CASSETTE_MODE", "replay").lower(),
+                                         float(os.getenv("DEXTER_CASSETTE_LATENCY", "0")))
+                else:
+                    _cassette = _NullCassette()
+    return _cassette
+
+
+def set_cassette(cassette) -> None:
+    """Replace the process-wide cassette (pass None to re-initialize lazily from the environment)."""
+    global _cassette
+    with _cassette_lock:
+        _cassette = cassette
@@ -3,14 +3,72 @@ from dotenv import load_dotenv
 # Load environment variables BEFORE importing any dexter modules
 load_dotenv()
 
-from dexter.agent import Agent
+import argparse
+import os
+import sys
+import threading
+
 from dexter.utils.intro import print_intro
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import InMemoryHistory
 
+# dexter.agent pulls in LangChain, OpenAI and pydantic, which takes most of a second. The prompt
+# doesn't need any of it, so it is imported on a background thread while the user reads the intro
+# and types, and the first query only waits for whatever is left.
+def _import_agent():
+    try:
+        import dexter.agent  # noqa: F401
+    except Exception:
+        pass  # the first query imports it again and reports the error
+
+
+def preload_agent() -> threading.Thread:
+    thread = threading.Thread(target=_import_agent, name="dexter-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def create_agent():
+    from dexter.agent import Agent
+
+    return Agent(stream_answer=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="dexter-agent", description="AI agent for financial analysis.")
+    parser.add_argument("--batch", metavar="QUERIES",
+                        help="answer every query in a JSONL or CSV file headlessly instead of prompting")
+    parser.add_argument("--output", metavar="RESULTS",
+                        help="JSONL file for batch results (default: QUERIES with a .results.jsonl suffix)")
+    parser.add_argument("--workers", type=int, default=4, help="agents answering batch queries concurrently")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="start the output over instead of skipping queries it already answers")
+    return parser.parse_args(argv)
+
+
+def batch_main(args) -> int:
+    from dexter.batch import run_batch
+
+    output = args.output or os.path.splitext(args.batch)[0] + ".results.jsonl"
+    try:
+        summary = run_batch(args.batch, output, workers=args.workers, resume=args.resume)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted. Run the same command again to resume from {output}.", file=sys.stderr)
+        return 130
+    print(f"{summary['succeeded']} answered, {summary['failed']} failed, {summary['skipped']} already done "
+          f"in {summary['elapsed_s']}s ({summary['total_tokens']} tokens, ${summary['cost']:.4f}) -> {output}",
+          file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
 def main():
+    args = parse_args()
+    if args.batch:
+        sys.exit(batch_main(args))
+
+    preload_agent()
     print_intro()
-    agent = Agent()
+    agent = None
 
     # Create a prompt session with history support
     session = PromptSession(history=InMemoryHistory())
@@ -22,6 +80,8 @@ def main():
                 print("Goodbye!")
                 break
             if query:
+                if agent is None:
+                    agent = create_agent()
                 agent.run(query)
         except (KeyboardInterrupt, EOFError):
             print("\nGoodbye!")
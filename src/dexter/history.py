@@ -0,0 +1,303 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dexter.cache import DEFAULT_TTL, DEFAULT_TTLS
+from dexter.tracing import current_span
+from dexter.utils.env import cache_dir, env_flag
+
+####################################
+# Incremental statement history
+####################################
+
+STATEMENT_FIELDS = {
+    "/financials/income-statements/": "income_statements",
+    "/financials/balance-sheets/": "balance_sheets",
+    "/financials/cash-flow-statements/": "cash_flow_statements",
+}
+# A request needs at most a refresh of the newest end and a backfill of the oldest; the rest is slack for
+# concurrent updates of the same series
+MAX_DELTAS = 4
+
+
+def _default_history_path() -> str:
+    return os.path.join(cache_dir(), "history.sqlite3")
+
+
+def series_key(endpoint: str, params: dict, tenant: str = "") -> Optional[Tuple[str, str, str, str]]:
+    """(endpoint, TICKER, period, tenant) for a plain "latest N periods" statement request, else None."""
+    if endpoint not in STATEMENT_FIELDS or set(params) - {"ticker", "period", "limit"} or not params.get("ticker"):
+        return None
+    return endpoint, str(params["ticker"]).strip().upper(), params.get("period", "annual"), tenant
+
+
+class Series:
+    """Stored statements of one (endpoint, ticker, period, tenant), newest first and without gaps."""
+
+    def __init__(self, rows: Optional[List[dict]] = None, complete: bool = False, refreshed_at: float = 0.0):
+        self.rows = rows or []
+        self.complete = complete  # the oldest stored row is the oldest the API has
+        self.refreshed_at = refreshed_at  # when the newest end was last checked for new periods
+
+    def merge(self, rows: List[dict]) -> None:
+        by_period = {row["report_period"]: row for row in self.rows}
+        by_period.update((row["report_period"], row) for row in rows)
+        self.rows = sorted(by_period.values(), key=lambda row: row["report_period"], reverse=True)
+
+
+class StatementHistory:
+    """SQLite-backed per-(ticker, statement, period) history that fetches only missing periods.
+
+    A request for the latest N periods is answered from the stored rows when they cover it.
+    Otherwise only the difference is fetched: periods newer than the newest stored one once the
+    series is older than its period's TTL (report_period_gt), and periods older than the oldest
+    stored one while fewer than N are stored (report_period_lt). Going from 4 quarters to 12 thus
+    downloads 8, and refreshing a long history downloads only the periods reported since.
+    Each tenant (a digest of the API key) has its own histories, like the response cache.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = DEFAULT_TTL):
+        self.path = path or _default_history_path()
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.requests = 0
+        self.rows_fetched = 0
+        self.rows_served = 0
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        try:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(series)")}
+            if columns and "tenant" not in columns:
+                # Histories stored before they were kept per tenant can't be attributed to one
+                conn.execute("DROP TABLE series")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS series (
+                    endpoint TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    tenant TEXT NOT NULL,
+                    rows BLOB NOT NULL,
+                    complete INTEGER NOT NULL,
+                    refreshed_at REAL NOT NULL,
+                    PRIMARY KEY (endpoint, ticker, period, tenant)
+                )
+                """
+            )
+            return conn
+        except (sqlite3.Error, OSError):
+            # An unwritable history location must never break the tools.
+            return None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def _load(self, key: Tuple[str, str, str, str]) -> Series:
+        try:
+            row = self._conn.execute(
+                "SELECT rows, complete, refreshed_at FROM series "
+                "WHERE endpoint = ? AND ticker = ? AND period = ? AND tenant = ?", key
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+        return Series(json.loads(row[0]), bool(row[1]), row[2]) if row else Series()
+
+    def _store(self, key: Tuple[str, str, str, str], series: Series) -> None:
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO series (endpoint, ticker, period, tenant, rows, complete, refreshed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, json.dumps(series.rows, separators=(",", ":")), int(series.complete), series.refreshed_at),
+            )
+        except sqlite3.Error:
+            pass
+
+    def _next_delta(self, key: Tuple[str, str, str, str], params: dict, refresh: bool = True) -> Optional[dict]:
+        """The next request needed before `params` can be answered from the stored series, if any."""
+        limit = int(params.get("limit", 10))
+        with self._lock:
+            series = self._load(key)
+        base = {"ticker": params["ticker"], "period": key[2]}
+        if not series.rows:
+            return {**base, "limit": limit}
+        if refresh and time.time() - series.refreshed_at >= self.ttls.get(key[2], self.default_ttl):
+            return {**base, "limit": limit, "report_period_gt": series.rows[0]["report_period"]}
+        missing = limit - len(series.rows)
+        if missing > 0 and not series.complete:
+            return {**base, "limit": missing, "report_period_lt": series.rows[-1]["report_period"]}
+        return None
+
+    def _merge(self, key: Tuple[str, str, str, str], delta: dict, rows: List[dict]) -> None:
+        with self._lock:
+            series = self._load(key)
+            if "report_period_lt" in delta:
+                series.merge(rows)
+                series.complete = len(rows) < delta["limit"]
+            elif "report_period_gt" in delta and len(rows) < delta["limit"]:
+                series.merge(rows)
+                series.refreshed_at = time.time()
+            elif "report_period_gt" not in delta and series.rows and rows and \
+                    rows[0]["report_period"] == series.rows[0]["report_period"]:
+                # A concurrent first fetch of the same series: both are the latest periods, so they line up
+                series.merge(rows)
+                series.complete = series.complete or len(rows) < delta["limit"]
+            else:
+                # A first fetch, or more new periods than asked for: older rows may not join up, so start over
+                series = Series(rows, complete="report_period_gt" not in delta and len(rows) < delta["limit"],
+                                refreshed_at=time.time())
+            self._store(key, series)
+
+    def _serve(self, key: Tuple[str, str, str, str], params: dict, first: Optional[dict]) -> dict:
+        limit = int(params.get("limit", 10))
+        with self._lock:
+            rows = self._load(key).rows[:limit]
+            if first is None:
+                self.hits += 1
+            elif first.keys() == {"ticker", "period", "limit"}:
+                self.misses += 1
+            else:
+                self.partial_hits += 1
+            self.rows_served += len(rows)
+        return {STATEMENT_FIELDS[key[0]]: rows}
+
+    def _usable(self, data: dict, key: Tuple[str, str, str, str]) -> Optional[List[dict]]:
+        rows = data.get(STATEMENT_FIELDS[key[0]]) if isinstance(data, dict) else None
+        if not isinstance(rows, list) or not all(isinstance(row, dict) and row.get("report_period") for row in rows):
+            return None
+        with self._lock:
+            self.requests += 1
+            self.rows_fetched += len(rows)
+        span = current_span()
+        if span.recording:
+            span.set(history_requests=span.attributes.get("history_requests", 0) + 1,
+                     history_rows_fetched=span.attributes.get("history_rows_fetched", 0) + len(rows))
+        return rows
+
+    def fetch(self, endpoint: str, params: dict, fetch: Callable[[str, dict], dict], tenant: str = "") -> dict:
+        """Answer `params` from `tenant`'s history, calling `fetch(endpoint, params)` only for missing periods.
+
+        Requests the history can't answer (report-period filters, other endpoints) go straight to `fetch`.
+        """
+        key = series_key(endpoint, params, tenant)
+        if key is None or self._conn is None:
+            return fetch(endpoint, params)
+        first = delta = self._next_delta(key, params)
+        for _ in range(MAX_DELTAS):
+            if delta is None:
+                break
+            data = fetch(endpoint, delta)
+            rows = self._usable(data, key)
+            if rows is None:
+                return data if delta.keys() == params.keys() else fetch(endpoint, params)
+            self._merge(key, delta, rows)
+            # The newest end is only checked once per request; after that, just backfill
+            delta = self._next_delta(key, params, refresh=False)
+        return self._serve(key, params, first)
+
+    async def afetch(self, endpoint: str, params: dict, afetch: Callable[[str, dict], Awaitable[dict]],
+                     tenant: str = "") -> dict:
+        """Async variant of fetch()."""
+        key = series_key(endpoint, params, tenant)
+        if key is None or self._conn is None:
+            return await afetch(endpoint, params)
+        first = delta = self._next_delta(key, params)
+        for _ in range(MAX_DELTAS):
+            if delta is None:
+                break
+            data = await afetch(endpoint, delta)
+            rows = self._usable(data, key)
+            if rows is None:
+                return data if delta.keys() == params.keys() else await afetch(endpoint, params)
+            self._merge(key, delta, rows)
+            # The newest end is only checked once per request; after that, just backfill
+            delta = self._next_delta(key, params, refresh=False)
+        return self._serve(key, params, first)
+
+    def clear(self) -> None:
+        """Drop every stored series."""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM series")
+            except sqlite3.Error:
+                pass
+
+    def stats(self) -> dict:
+        """Return hit counters, bandwidth counters and the number of stored series."""
+        series = 0
+        if self._conn is not None:
+            with self._lock:
+                try:
+                    series = self._conn.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "requests": self.requests,
+            "rows_fetched": self.rows_fetched,
+            "rows_served": self.rows_served,
+            "series": series,
+        }
+
+
+class _NullHistory:
+    """History stand-in used when the history is disabled: every request is fetched in full."""
+
+    enabled = False
+
+    def fetch(self, endpoint: str, params: dict, fetch: Callable[[str, dict], dict], tenant: str = "") -> dict:
+        return fetch(endpoint, params)
+
+    async def afetch(self, endpoint: str, params: dict, afetch: Callable[[str, dict], Awaitable[dict]],
+                     tenant: str = "") -> dict:
+        return await afetch(endpoint, params)
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"enabled": False, "hits": 0, "partial_hits": 0, "misses": 0, "requests": 0, "rows_fetched": 0,
+                "rows_served": 0, "series": 0}
+
+
+# Global history instance (lazy initialization)
+_statement_history = None
+_statement_history_lock = threading.Lock()
+
+
+def get_statement_history():
+    """Get or create the process-wide statement history."""
+    global _statement_history
+    if _statement_history is None:
+        with _statement_history_lock:
+            if _statement_history is None:
+                if not env_flag("DEXTER_HISTORY", True):
+                    _statement_history = _NullHistory()
+                else:
+                    _statement_history = StatementHistory()
+    return _statement_history
+
+
+def set_statement_history(history) -> None:
+    """Replace the process-wide statement history (pass None to re-initialize lazily)."""
+    global _statement_history
+    with _statement_history_lock:
+        _statement_history = history
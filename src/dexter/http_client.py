@@ -0,0 +1,264 @@
+import asyncio
+import os
+import random
+import ssl
+import threading
+import time
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from dexter.utils.aio import loop_local, loop_local_instances
+
+####################################
+# Pooled HTTP client for data APIs
+####################################
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@lru_cache(maxsize=None)
+def shared_ssl_context() -> ssl.SSLContext:
+    """One verifying SSL context for every httpx client: loading the CA bundle is most of a client's setup cost."""
+    import certifi
+
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given (zero-based) retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class _RetryingClient(ABC):
+    """Retry policy and counters shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        max_retry_after: float = 60.0,
+    ):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.retry_count = 0
+        self.failure_count = 0
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _retry_delay(self, attempt: int, headers=None) -> float:
+        if headers is not None:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        return backoff_delay(attempt, self.backoff_base, self.backoff_max)
+
+    @abstractmethod
+    def connections_opened(self) -> int:
+        """Number of TCP connections the client has opened so far."""
+
+    def stats(self) -> dict:
+        """Return request, retry and connection reuse counters."""
+        opened = self.connections_opened()
+        return {
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "failures": self.failure_count,
+            "connections_opened": opened,
+            "connection_reuses": max(0, self.request_count - opened),
+        }
+
+
+class HttpClient(_RetryingClient):
+    """Thread-safe keep-alive HTTP client with timeouts and jittered retries."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = (self.connect_timeout, self.read_timeout)
+        self._adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, pool_block=False)
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+            limiter=None) -> requests.Response:
+        """GET a URL, retrying connection errors, 429s and 5xx responses with backoff.
+
+        With a rate `limiter` (a TokenBucket), every attempt waits for a token and reports its
+        response back to it.
+        """
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            self._count(request_count=1)
+            try:
+                response = self._session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    self._count(failure_count=1)
+                    raise
+                response = None
+            else:
+                if limiter is not None:
+                    limiter.observe(response.status_code, response.headers)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    if response.status_code >= 400:
+                        self._count(failure_count=1)
+                    return response
+
+            delay = self._retry_delay(attempt, response.headers if response is not None else None)
+            if response is not None:
+                response.close()
+            self._count(retry_count=1)
+            attempt += 1
+            time.sleep(delay)
+
+    def connections_opened(self) -> int:
+        """Number of TCP connections opened across all host pools."""
+        pools = self._adapter.poolmanager.pools
+        opened = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+        return opened
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class AsyncHttpClient(_RetryingClient):
+    """Keep-alive asyncio HTTP client with the same retry policy as HttpClient.
+
+    Bound to the event loop it is created on; use get_async_http_client() to get the loop's instance.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._connections = 0
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            verify=shared_ssl_context(),
+        )
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._count(_connections=1)
+
+    async def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                  limiter=None) -> httpx.Response:
+        """GET a URL, retrying connection errors, 429s and 5xx responses with backoff."""
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await limiter.aacquire()
+            self._count(request_count=1)
+            try:
+                response = await self._client.get(url, params=params, headers=headers, extensions={"trace": self._trace})
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    self._count(failure_count=1)
+                    raise
+                response = None
+            else:
+                if limiter is not None:
+                    limiter.observe(response.status_code, response.headers)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    if response.status_code >= 400:
+                        self._count(failure_count=1)
+                    return response
+
+            delay = self._retry_delay(attempt, response.headers if response is not None else None)
+            self._count(retry_count=1)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def connections_opened(self) -> int:
+        return self._connections
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# Global client instance (lazy initialization)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _config_from_env() -> dict:
+    return {
+        "pool_size": int(os.getenv("DEXTER_HTTP_POOL_SIZE", "10")),
+        "connect_timeout": float(os.getenv("DEXTER_HTTP_CONNECT_TIMEOUT", "5")),
+        "read_timeout": float(os.getenv("DEXTER_HTTP_READ_TIMEOUT", "30")),
+        "max_retries": int(os.getenv("DEXTER_HTTP_MAX_RETRIES", "3")),
+    }
+
+
+def get_http_client() -> HttpClient:
+    """Get or create the shared HTTP client, configured from the environment."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient(**_config_from_env())
+    return _http_client
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """Get or create the async HTTP client for the running event loop."""
+    return loop_local(AsyncHttpClient, lambda: AsyncHttpClient(**_config_from_env()))
+
+
+def async_http_client_stats() -> dict:
+    """Counters of every event loop's async client, summed; agent runs go through these clients."""
+    totals = {"requests": 0, "retries": 0, "failures": 0, "connections_opened": 0, "connection_reuses": 0}
+    for client in loop_local_instances(AsyncHttpClient):
+        for name, value in client.stats().items():
+            totals[name] += value
+    return totals
+
+
+def reset_http_client() -> None:
+    """Close the shared HTTP client so the next call re-creates it."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
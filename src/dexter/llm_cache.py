@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Type
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from dexter.utils.env import cache_dir, env_flag
+
+####################################
+# Deterministic LLM response cache
+####################################
+
+PHASES = ("plan", "action", "validate", "answer")
+
+
+def llm_cache_key(model_name: str, system_prompt: str, prompt: str,
+                  output_schema: Optional[Type[BaseModel]] = None, tools: Optional[Iterable] = None) -> str:
+    """Stable hash of everything that determines a temperature-0 completion."""
+    payload = {
+        "model": model_name,
+        "system": system_prompt,
+        "prompt": prompt,
+        "schema": output_schema.model_json_schema() if output_schema else None,
+        "tools": [{"name": t.name, "description": t.description, "args": t.args} for t in tools or []],
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def serialize_response(response) -> Optional[dict]:
+    """Turn a structured output or AIMessage into plain JSON data, or None if it can't be cached."""
+    # AIMessage is itself a pydantic model, so check it first.
+    if isinstance(response, AIMessage):
+        return {"kind": "message", "content": response.content, "tool_calls": response.tool_calls}
+    if isinstance(response, BaseModel):
+        return {"kind": "structured", "data": response.model_dump()}
+    return None
+
+
+def deserialize_response(entry: dict, output_schema: Optional[Type[BaseModel]] = None):
+    """Rebuild a fresh response object from cached data."""
+    if entry["kind"] == "structured":
+        return output_schema.model_validate(entry["data"]) if output_schema else None
+    return AIMessage(content=entry["content"], tool_calls=entry["tool_calls"])
+
+
+class MemoryTier:
+    """In-process LRU tier."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskTier:
+    """SQLite tier that survives restarts."""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600):
+        self.path = path or os.path.join(cache_dir(), "llm_cache.sqlite3")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        except (sqlite3.Error, OSError):
+            self._conn = None
+
+    def get(self, key: str) -> Optional[dict]:
+        if self._conn is None:
+            return None
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM completions WHERE key = ? AND expires_at > ?", (key, time.time())
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, entry: dict) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(entry, default=str), time.time() + self.ttl),
+                )
+            except sqlite3.Error:
+                pass
+
+    def clear(self) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM completions")
+            except sqlite3.Error:
+                pass
+
+
+class LLMCache:
+    """Tiered cache of LLM responses, enabled per agent phase.
+
+    Tiers are consulted in order; a hit in a later tier is copied into the earlier ones.
+    Any object with get(key) and set(key, entry) can be used as a tier.
+    """
+
+    def __init__(self, tiers: Optional[List] = None, phases: Iterable[str] = PHASES):
+        self.tiers = tiers if tiers is not None else [MemoryTier(), DiskTier()]
+        self.phases = set(phases)
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def enabled_for(self, phase: Optional[str]) -> bool:
+        return bool(self.tiers) and (phase or "other") in self.phases
+
+    def _count(self, phase: Optional[str], outcome: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(phase or "other", {"hits": 0, "misses": 0})
+            counters[outcome] += 1
+
+    def get(self, key: str, phase: Optional[str] = None, output_schema: Optional[Type[BaseModel]] = None):
+        """Return a fresh copy of the cached response, or None on a miss."""
+        for i, tier in enumerate(self.tiers):
+            entry = tier.get(key)
+            if entry is not None:
+                for earlier in self.tiers[:i]:
+                    earlier.set(key, entry)
+                response = deserialize_response(entry, output_schema)
+                if response is not None:
+                    self._count(phase, "hits")
+                    return response
+        self._count(phase, "misses")
+        return None
+
+    def set(self, key: str, response, phase: Optional[str] = None) -> None:
+        entry = serialize_response(response)
+        if entry is None:
+            return
+        for tier in self.tiers:
+            tier.set(key, entry)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> dict:
+        """Return hits, misses and hit rate per phase and overall."""
+        with self._lock:
+            per_phase = {phase: dict(c) for phase, c in self._counters.items()}
+        for counters in per_phase.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        hits = sum(c["hits"] for c in per_phase.values())
+        lookups = hits + sum(c["misses"] for c in per_phase.values())
+        return {"hits": hits, "misses": lookups - hits, "hit_rate": hits / lookups if lookups else 0.0, "phases": per_phase}
+
+
+# Global cache instance (lazy initialization)
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Get or create the LLM cache; disabled unless DEXTER_LLM_CACHE is set."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                if env_flag("DEXTER_LLM_CACHE", False):
+                    phases = os.getenv("DEXTER_LLM_CACHE_PHASES", ",".join(PHASES))
+                    tiers = [MemoryTier(int(os.getenv("DEXTER_LLM_CACHE_MAX_ENTRIES", "1024")))]
+                    if env_flag("DEXTER_LLM_CACHE_DISK", True):
+                        tiers.append(DiskTier())
+                    _llm_cache = LLMCache(tiers, phases=[p.strip() for p in phases.split(",") if p.strip()])
+                else:
+                    _llm_cache = LLMCache(tiers=[], phases=())
+    return _llm_cache
+
+
+def set_llm_cache(cache: Optional[LLMCache]) -> None:
+    """Replace the LLM cache (pass None to re-initialize lazily from the environment)."""
+    global _llm_cache
+    with _llm_cache_lock:
+        _llm_cache = cache
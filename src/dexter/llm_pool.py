@@ -0,0 +1,149 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from dexter.http_client import shared_ssl_context
+from dexter.rate_limit import async_response_observer, response_observer
+from dexter.utils.aio import loop_local, loop_local_instances
+
+####################################
+# Multi-tenant LLM client pool
+####################################
+
+
+def _chat_openai(api_key: str, model_name: str, http_client=None, http_async_client=None):
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model=model_name, temperature=0, api_key=api_key, stream_usage=True,
+                      http_client=http_client, http_async_client=http_async_client)
+
+
+def _key_hash(api_key: str) -> str:
+    # Keys never appear in pool keys or stats, only a short digest
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class _LoopClients:
+    """Async clients of one event loop, all sharing that loop's connection pool."""
+
+    def __init__(self):
+        self.clients: "OrderedDict[tuple, object]" = OrderedDict()
+        self._http_client = None
+
+    @property
+    def http_client(self):
+        if self._http_client is None:
+            from openai import DefaultAsyncHttpxClient
+
+            self._http_client = DefaultAsyncHttpxClient(
+                verify=shared_ssl_context(), event_hooks={"response": [async_response_observer("openai")]})
+        return self._http_client
+
+    async def aclose(self) -> None:
+        self.clients.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+
+
+class LLMClientPool:
+    """Chat model clients keyed by (API key hash, model), shared by every session and thread.
+
+    Each tenant's credentials travel with its requests instead of through the environment, so
+    concurrent sessions with different keys or models never replace each other's client. All sync
+    clients share one HTTP connection pool; async clients share their event loop's pool, since
+    async connections cannot cross loops. Every response on those pools, including the SDK's own
+    retries, feeds the "openai" rate limiter of the key that made it. Least recently used clients
+    are evicted beyond `max_entries` per pool.
+
+    `factory(api_key=..., model_name=..., http_client=..., http_async_client=...)` builds a client
+    (ChatOpenAI by default).
+    """
+
+    def __init__(self, max_entries: int = 32, factory: Optional[Callable] = None):
+        self.max_entries = max_entries
+        self.factory = factory or _chat_openai
+        self._clients: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._http_client = None
+        self.builds = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def _shared_http_client(self):
+        with self._lock:
+            if self._http_client is None:
+                from openai import DefaultHttpxClient
+
+                self._http_client = DefaultHttpxClient(
+                    verify=shared_ssl_context(), event_hooks={"response": [response_observer("openai")]})
+            return self._http_client
+
+    def _lookup(self, clients: OrderedDict, key: tuple, build: Callable):
+        # Building under the lock is cheap once the HTTP clients exist, and
+        # stops concurrent first requests from each building their own client.
+        with self._lock:
+            client = clients.get(key)
+            if client is not None:
+                clients.move_to_end(key)
+                self.hits += 1
+                return client
+            client = clients[key] = build()
+            self.builds += 1
+            while len(clients) > self.max_entries:
+                clients.popitem(last=False)
+                self.evictions += 1
+            return client
+
+    def get(self, api_key: str, model_name: str):
+        """The sync client for this key and model."""
+        return self._lookup(
+            self._clients, (_key_hash(api_key), model_name),
+            lambda: self.factory(api_key=api_key, model_name=model_name, http_client=self._shared_http_client()),
+        )
+
+    def get_async(self, api_key: str, model_name: str):
+        """The async client for this key and model on the running event loop."""
+        loop_clients = loop_local(("llm_pool", id(self)), _LoopClients)
+        return self._lookup(
+            loop_clients.clients, (_key_hash(api_key), model_name),
+            lambda: self.factory(api_key=api_key, model_name=model_name, http_async_client=loop_clients.http_client),
+        )
+
+    def clear(self) -> None:
+        """Drop every client, sync and async on every live event loop (their connection pools stay open)."""
+        with self._lock:
+            self._clients.clear()
+            for loop_clients in loop_local_instances(("llm_pool", id(self))):
+                loop_clients.clients.clear()
+
+    def stats(self) -> dict:
+        """Counters for sync and async clients alike; entries counts the async clients of every live loop."""
+        with self._lock:
+            async_entries = sum(len(loop_clients.clients)
+                                for loop_clients in loop_local_instances(("llm_pool", id(self))))
+            return {"builds": self.builds, "hits": self.hits, "evictions": self.evictions,
+                    "entries": len(self._clients) + async_entries, "async_entries": async_entries}
+
+
+# Global pool instance (lazy initialization)
+_llm_pool = None
+_llm_pool_lock = threading.Lock()
+
+
+def get_llm_pool() -> LLMClientPool:
+    """Get or create the process-wide client pool, sized by DEXTER_LLM_POOL_SIZE."""
+    global _llm_pool
+    if _llm_pool is None:
+        with _llm_pool_lock:
+            if _llm_pool is None:
+                _llm_pool = LLMClientPool(max_entries=int(os.getenv("DEXTER_LLM_POOL_SIZE", "32")))
+    return _llm_pool
+
+
+def set_llm_pool(pool: Optional[LLMClientPool]) -> None:
+    """Replace the process-wide pool (pass None to re-create it lazily from the environment)."""
+    global _llm_pool
+    with _llm_pool_lock:
+        _llm_pool = pool
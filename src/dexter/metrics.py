@@ -0,0 +1,131 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from dexter.statements import StatementFrame
+
+####################################
+# Vectorized financial ratios
+####################################
+
+PERIODS_PER_YEAR = {"annual": 1, "quarterly": 4, "ttm": 4}
+
+# Line items echoed next to the ratios so answers can quote absolute figures.
+BASE_ITEMS = ("revenue", "operating_income", "net_income", "free_cash_flow")
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division that yields NaN instead of inf where the denominator is zero or missing."""
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=(denominator != 0) & ~np.isnan(denominator))
+    return out
+
+
+def growth(values: np.ndarray, lag: int = 1) -> np.ndarray:
+    """Growth versus `lag` rows earlier, relative to the absolute base value."""
+    out = np.full(len(values), np.nan)
+    if len(values) > lag:
+        out[lag:] = safe_divide(values[lag:] - values[:-lag], np.abs(values[:-lag]))
+    return out
+
+
+def cagr(values: np.ndarray, periods_per_year: int = 1) -> float:
+    """Compound annual growth rate between the first and last non-missing values."""
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < 2:
+        return np.nan
+    first, last = values[valid[0]], values[valid[-1]]
+    years = (valid[-1] - valid[0]) / periods_per_year
+    if first <= 0 or last <= 0 or years <= 0:
+        return np.nan
+    return float((last / first) ** (1 / years) - 1)
+
+
+class MetricsResult:
+    """Ratios per report period plus whole-window summary figures such as CAGR."""
+
+    def __init__(self, frame: StatementFrame, summary: Dict[str, float]):
+        self.frame = frame
+        self.summary = summary
+
+    def __bool__(self) -> bool:
+        return bool(self.frame)
+
+    def to_dict(self) -> dict:
+        return {
+            "ticker": self.frame.ticker,
+            "period": self.frame.period,
+            "report_periods": [str(p) for p in self.frame.report_periods],
+            "metrics": {k: [None if np.isnan(v) else round(float(v), 4) for v in vs] for k, vs in self.frame.columns.items()},
+            "summary": {k: None if np.isnan(v) else round(v, 4) for k, v in self.summary.items()},
+        }
+
+    def __str__(self) -> str:
+        frame = self.frame
+        if not frame:
+            return f"No statement data available to compute metrics for {frame.ticker or 'ticker'}."
+        lines = [
+            f"financial_metrics {frame.ticker} ({frame.period})",
+            "report_period," + ",".join(frame.report_periods),
+        ]
+        for name, values in frame.columns.items():
+            fmt = "{:.15g}" if name in BASE_ITEMS else "{:.4f}"
+            lines.append(name + "," + ",".join("" if np.isnan(v) else fmt.format(v) for v in values))
+        summary = ", ".join(f"{k}={v:.4f}" for k, v in self.summary.items() if not np.isnan(v))
+        if summary:
+            lines.append("summary: " + summary)
+        return "\n".join(lines)
+
+
+def compute_metrics(income: StatementFrame, balance: Optional[StatementFrame] = None,
+                    cash_flow: Optional[StatementFrame] = None) -> MetricsResult:
+    """Compute margins, growth, leverage, liquidity, return and cash-conversion ratios.
+
+    Statements are aligned on the income statement's report periods; ratios whose inputs are
+    missing come out as NaN rather than failing.
+    """
+    frame = income
+    for other in (balance, cash_flow):
+        if other is not None and other:
+            frame = frame.join(other, how="left") if frame else other
+    period = frame.period or "annual"
+    per_year = PERIODS_PER_YEAR.get(period, 1)
+    col = frame.get
+
+    revenue = col("revenue")
+    net_income = col("net_income")
+    operating_income = col("operating_income")
+    equity = col("shareholders_equity")
+
+    metrics = {name: col(name) for name in BASE_ITEMS}
+    metrics.update({
+        "gross_margin": safe_divide(col("gross_profit"), revenue),
+        "operating_margin": safe_divide(operating_income, revenue),
+        "net_margin": safe_divide(net_income, revenue),
+        "fcf_margin": safe_divide(col("free_cash_flow"), revenue),
+        "revenue_growth": growth(revenue),
+        "operating_income_growth": growth(operating_income),
+        "net_income_growth": growth(net_income),
+        "eps_growth": growth(col("earnings_per_share")),
+        "debt_to_equity": safe_divide(col("total_debt"), equity),
+        "liabilities_to_assets": safe_divide(col("total_liabilities"), col("total_assets")),
+        "current_ratio": safe_divide(col("current_assets"), col("current_liabilities")),
+        "return_on_equity": safe_divide(net_income, equity),
+        "return_on_assets": safe_divide(net_income, col("total_assets")),
+        "cash_conversion": safe_divide(col("net_cash_flow_from_operations"), net_income),
+        "capex_to_revenue": safe_divide(np.abs(col("capital_expenditure")), revenue),
+    })
+    if period == "quarterly":
+        metrics["revenue_growth_yoy"] = growth(revenue, lag=4)
+        metrics["net_income_growth_yoy"] = growth(net_income, lag=4)
+
+    # Drop ratios that are entirely unavailable to keep the tool output small.
+    columns = {k: v for k, v in metrics.items() if len(v) and not np.all(np.isnan(v))}
+    summary = {
+        "revenue_cagr": cagr(revenue, per_year),
+        "net_income_cagr": cagr(net_income, per_year),
+        "free_cash_flow_cagr": cagr(col("free_cash_flow"), per_year),
+    }
+    result_frame = StatementFrame(frame.report_periods, columns, ticker=frame.ticker, period=period,
+                                  statement_types=("financial_metrics",))
+    return MetricsResult(result_frame, summary)
@@ -1,16 +1,22 @@
 import os
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+import threading
+import time
+from collections import OrderedDict
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
-from typing import Type, List, Optional
+from typing import AsyncIterator, Type, List, Optional
 from langchain_core.tools import BaseTool
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import AIMessage
 
+from dexter.budget import current_budget
+from dexter.cassette import get_cassette
+from dexter.llm_cache import get_llm_cache, llm_cache_key
+from dexter.llm_pool import LLMClientPool, get_llm_pool
 from dexter.prompts import DEFAULT_SYSTEM_PROMPT
-
-# Global LLM instance (lazy initialization)
-_llm = None
-_current_model = None
+from dexter.rate_limit import get_rate_limiter
+from dexter.tracing import get_tracer
+from dexter.utils.aio import loop_local, loop_local_instances
 
 # Available models
 AVAILABLE_MODELS = [
@@ -21,44 +27,85 @@ AVAILABLE_MODELS = [
     "gpt-4.1-mini"
 ]
 
-def reset_llm():
-    """Reset the LLM instance to force re-initialization with new API key or model."""
-    global _llm, _current_model
-    _llm = None
-    _current_model = None
+# USD per million (prompt, completion) tokens, used for per-query cost budgets
+MODEL_PRICES = {
+    "gpt-5": (1.25, 10.00),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+}
+
+def estimate_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Dollar cost of a call; unknown models are counted as free."""
+    prompt_price, completion_price = MODEL_PRICES.get(model_name, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+class RunnableRegistry:
+    """Compiled prompt | model chains, built once per (LLM, phase, system prompt, schema or tools)."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._chains: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, llm, phase, system_prompt, output_schema, tools):
+        # Tools are module-level singletons, so identity is a stable key for them (and for the LLM,
+        # which the cached chain keeps alive).
+        key = (id(llm), phase, system_prompt, output_schema, tuple(id(t) for t in tools) if tools else None)
+        with self._lock:
+            chain = self._chains.get(key)
+            if chain is not None:
+                self._chains.move_to_end(key)
+                self.hits += 1
+                return chain
+        chain = _build_chain(llm, system_prompt, output_schema, tools)
+        with self._lock:
+            self._chains[key] = chain
+            self.builds += 1
+            while len(self._chains) > self.max_entries:
+                self._chains.popitem(last=False)
+        return chain
+
+    def clear(self):
+        with self._lock:
+            self._chains.clear()
+
+    def stats(self) -> dict:
+        return {"builds": self.builds, "hits": self.hits, "entries": len(self._chains)}
 
-def get_llm(model_name=None):
-    """Get or create the LLM instance with lazy initialization."""
-    global _llm, _current_model
+# Chains over the sync LLM; async chains live in a per-event-loop registry next to their LLM.
+_runnables = RunnableRegistry()
 
+def reset_llm():
+    """Drop the pooled clients and every compiled chain, sync and per event loop, e.g. after rotating API keys."""
+    get_llm_pool().clear()
+    _runnables.clear()
+    for registry in loop_local_instances("runnables"):
+        registry.clear()
+
+def _resolve_model_name(model_name=None) -> str:
     # Use environment variable or default if no model specified
-    if model_name is None:
-        model_name = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
-
-    # Reset LLM if model changed
-    if _current_model != model_name:
-        _llm = None
-        _current_model = model_name
-
-    if _llm is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is not set. Please set it before using the agent.")
-        _llm = ChatOpenAI(model=model_name, temperature=0, api_key=api_key)
-        _current_model = model_name
-    return _llm
+    return model_name if model_name is not None else os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
 
-def call_llm(
-    prompt: str,
-    system_prompt: Optional[str] = None,
-    output_schema: Optional[Type[BaseModel]] = None,
-    tools: Optional[List[BaseTool]] = None,
-    model_name: Optional[str] = None,
-) -> AIMessage:
-    final_system_prompt = system_prompt if system_prompt else DEFAULT_SYSTEM_PROMPT
+def _require_api_key(api_key: Optional[str] = None) -> str:
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable is not set. Please set it before using the agent.")
+    return api_key
+
+def get_llm(model_name=None, api_key: Optional[str] = None, pool: Optional[LLMClientPool] = None):
+    """Get the pooled LLM client for this API key (default OPENAI_API_KEY) and model."""
+    return (pool or get_llm_pool()).get(_require_api_key(api_key), _resolve_model_name(model_name))
 
-    # Get LLM instance with optional model name
-    llm = get_llm(model_name)
+def get_async_llm(model_name=None, api_key: Optional[str] = None, pool: Optional[LLMClientPool] = None):
+    """Get the pooled LLM client for this API key and model whose HTTP client belongs to the running event loop."""
+    return (pool or get_llm_pool()).get_async(_require_api_key(api_key), _resolve_model_name(model_name))
+
+def _build_chain(llm, system_prompt, output_schema, tools):
+    final_system_prompt = system_prompt if system_prompt else DEFAULT_SYSTEM_PROMPT
 
     prompt_template = ChatPromptTemplate.from_messages([
         ("system", final_system_prompt),
@@ -71,5 +118,193 @@ def call_llm(
     elif tools:
         runnable = llm.bind_tools(tools)
 
-    chain = prompt_template | runnable
-    return chain.invoke({"prompt": prompt})
+    return prompt_template | runnable
+
+def _cache_lookup(phase, model_name, system_prompt, prompt, output_schema, tools):
+    """Return (cache key or None, cached response or None) for an LLM call."""
+    cache = get_llm_cache()
+    if not cache.enabled_for(phase):
+        return None, None
+    key = llm_cache_key(_resolve_model_name(model_name), system_prompt or DEFAULT_SYSTEM_PROMPT, prompt,
+                        output_schema, None if output_schema else tools)
+    return key, cache.get(key, phase, output_schema)
+
+def _charge_usage(span, model_name, prompt_tokens: int, completion_tokens: int):
+    """Put token usage and cost on the span and charge them to the current query's budget."""
+    cost = estimate_cost(model_name, prompt_tokens, completion_tokens)
+    span.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cost=cost)
+    budget = current_budget()
+    if budget is not None:
+        budget.charge(prompt_tokens, completion_tokens, cost)
+
+class _UsageRecorder(BaseCallbackHandler):
+    """Captures the token usage reported by the model for one call."""
+
+    run_inline = True
+
+    def __init__(self, span, model_name):
+        self.span = span
+        self.model_name = model_name
+        self.usage = None
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.usage = (usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+                    _charge_usage(self.span, self.model_name, *self.usage)
+
+def _llm_span(phase, model_name, system_prompt, prompt):
+    return get_tracer().span("llm", phase=phase, model=_resolve_model_name(model_name),
+                             prompt_chars=len(prompt) + len(system_prompt or DEFAULT_SYSTEM_PROMPT))
+
+def _usage_recorder(span, model_name, cassette) -> Optional[_UsageRecorder]:
+    # Only pay for a callback when something consumes the usage.
+    if current_budget() is None and not span.recording and not cassette.recording:
+        return None
+    return _UsageRecorder(span, _resolve_model_name(model_name))
+
+def _run_config(recorder):
+    return {"callbacks": [recorder]} if recorder is not None else None
+
+def _cassette_request(model_name, system_prompt, prompt, output_schema, tools, phase) -> tuple:
+    return _resolve_model_name(model_name), system_prompt or DEFAULT_SYSTEM_PROMPT, prompt, output_schema, tools, phase
+
+def _replayed(span, request, result):
+    response, usage = result
+    span.set(replayed=True)
+    if usage:
+        _charge_usage(span, request[0], *usage)
+    return response
+
+def _record(cassette, request, started, recorder=None, response=None, error=None):
+    if cassette.recording:
+        cassette.record_llm(*request, latency_ms=(time.perf_counter() - started) * 1000, response=response,
+                            usage=recorder.usage if recorder else None, error=error)
+
+def call_llm(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    output_schema: Optional[Type[BaseModel]] = None,
+    tools: Optional[List[BaseTool]] = None,
+    model_name: Optional[str] = None,
+    phase: Optional[str] = None,
+    api_key: Optional[str] = None,
+    pool: Optional[LLMClientPool] = None,
+) -> AIMessage:
+    with _llm_span(phase, model_name, system_prompt, prompt) as span:
+        cassette = get_cassette()
+        request = _cassette_request(model_name, system_prompt, prompt, output_schema, tools, phase)
+        if cassette.replaying:
+            return _replayed(span, request, cassette.replay_llm(*request))
+
+        started = time.perf_counter()
+        recorder = None
+        try:
+            key, cached = _cache_lookup(phase, model_name, system_prompt, prompt, output_schema, tools)
+            span.set(cache_hit=cached is not None)
+            if cached is not None:
+                response = cached
+            else:
+                llm = get_llm(model_name, api_key, pool)
+                chain = _runnables.get(llm, phase, system_prompt, output_schema, tools)
+                recorder = _usage_recorder(span, model_name, cassette)
+                get_rate_limiter().acquire("openai", _require_api_key(api_key))
+                response = chain.invoke({"prompt": prompt}, config=_run_config(recorder))
+                if key is not None:
+                    get_llm_cache().set(key, response, phase)
+        except Exception as e:
+            _record(cassette, request, started, recorder, error=e)
+            raise
+        _record(cassette, request, started, recorder, response=response)
+        return response
+
+async def acall_llm(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    output_schema: Optional[Type[BaseModel]] = None,
+    tools: Optional[List[BaseTool]] = None,
+    model_name: Optional[str] = None,
+    phase: Optional[str] = None,
+    api_key: Optional[str] = None,
+    pool: Optional[LLMClientPool] = None,
+) -> AIMessage:
+    """Async variant of call_llm built on the runnables' ainvoke."""
+    with _llm_span(phase, model_name, system_prompt, prompt) as span:
+        cassette = get_cassette()
+        request = _cassette_request(model_name, system_prompt, prompt, output_schema, tools, phase)
+        if cassette.replaying:
+            return _replayed(span, request, await cassette.areplay_llm(*request))
+
+        started = time.perf_counter()
+        recorder = None
+        try:
+            key, cached = _cache_lookup(phase, model_name, system_prompt, prompt, output_schema, tools)
+            span.set(cache_hit=cached is not None)
+            if cached is not None:
+                response = cached
+            else:
+                llm = get_async_llm(model_name, api_key, pool)
+                chain = loop_local("runnables", RunnableRegistry).get(llm, phase, system_prompt, output_schema, tools)
+                recorder = _usage_recorder(span, model_name, cassette)
+                await get_rate_limiter().aacquire("openai", _require_api_key(api_key))
+                response = await chain.ainvoke({"prompt": prompt}, config=_run_config(recorder))
+                if key is not None:
+                    get_llm_cache().set(key, response, phase)
+        except Exception as e:
+            _record(cassette, request, started, recorder, error=e)
+            raise
+        _record(cassette, request, started, recorder, response=response)
+        return response
+
+async def astream_llm(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    model_name: Optional[str] = None,
+    phase: Optional[str] = None,
+    api_key: Optional[str] = None,
+    pool: Optional[LLMClientPool] = None,
+) -> AsyncIterator[str]:
+    """Stream a plain-text completion chunk by chunk.
+
+    A cached or replayed completion is yielded as a single chunk; a streamed one is cached (and
+    recorded) once it finishes.
+    """
+    with _llm_span(phase, model_name, system_prompt, prompt) as span:
+        span.set(streamed=True)
+        cassette = get_cassette()
+        request = _cassette_request(model_name, system_prompt, prompt, None, None, phase)
+        if cassette.replaying:
+            replayed = _replayed(span, request, await cassette.areplay_llm(*request))
+            if replayed.content:
+                yield replayed.content
+            return
+
+        key, cached = _cache_lookup(phase, model_name, system_prompt, prompt, None, None)
+        span.set(cache_hit=cached is not None)
+        if cached is not None:
+            if cached.content:
+                yield cached.content
+            _record(cassette, request, time.perf_counter(), response=cached)
+            return
+
+        started = time.perf_counter()
+        llm = get_async_llm(model_name, api_key, pool)
+        chain = loop_local("runnables", RunnableRegistry).get(llm, phase, system_prompt, None, None)
+        recorder = _usage_recorder(span, model_name, cassette)
+        await get_rate_limiter().aacquire("openai", _require_api_key(api_key))
+        chunks = []
+        try:
+            async for message in chain.astream({"prompt": prompt}, config=_run_config(recorder)):
+                if isinstance(message.content, str) and message.content:
+                    chunks.append(message.content)
+                    yield message.content
+        except Exception as e:
+            _record(cassette, request, started, recorder, error=e)
+            raise
+        span.set(completion_chars=sum(len(c) for c in chunks))
+        response = AIMessage(content="".join(chunks))
+        _record(cassette, request, started, recorder, response=response)
+        if key is not None:
+            get_llm_cache().set(key, response, phase)
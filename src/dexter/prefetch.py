@@ -0,0 +1,209 @@
+import asyncio
+import contextvars
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from dexter.tracing import get_tracer
+from dexter.validation import NON_TICKERS, TICKER_PATTERN
+from dexter.utils.env import env_flag
+
+####################################
+# Speculative statement prefetch
+####################################
+
+# Statements are prefetched this deep; any tool call asking for at most as many periods, with no
+# report-period filters, is served the newest rows of the prefetched response.
+PREFETCH_LIMIT = 10
+
+INCOME, BALANCE, CASH_FLOW = ("/financials/income-statements/", "/financials/balance-sheets/",
+                              "/financials/cash-flow-statements/")
+ALL_STATEMENTS = (INCOME, BALANCE, CASH_FLOW)
+
+STATEMENT_HINTS = (
+    (ALL_STATEMENTS, ("ratio", "metric", "return on", "profitab", "cagr", "roe", "roa", "比率", "指標")),
+    ((INCOME,), ("income", "revenue", "sales", "earnings", "profit", "margin", "eps", "營收", "收入", "損益", "利潤", "盈餘")),
+    ((BALANCE,), ("balance sheet", "asset", "liabilit", "debt", "equity", "leverage", "資產", "負債", "權益")),
+    ((CASH_FLOW,), ("cash flow", "free cash", "capex", "capital expenditure", "現金流")),
+)
+PERIOD_HINTS = (
+    ("ttm", ("ttm", "trailing twelve", "trailing 12", "近四季")),
+    ("quarterly", ("quarter", "q1", "q2", "q3", "q4", "季")),
+    ("annual", ("annual", "year", "fiscal", "fy", "年")),
+)
+
+
+def _tickers(text: str) -> List[str]:
+    return [t for t in dict.fromkeys(TICKER_PATTERN.findall(text)) if t not in NON_TICKERS]
+
+
+def _period(text: str) -> Optional[str]:
+    lowered = text.lower()
+    return next((period for period, words in PERIOD_HINTS if any(w in lowered for w in words)), None)
+
+
+def _statements(text: str) -> List[str]:
+    lowered = text.lower()
+    found = []
+    for endpoints, words in STATEMENT_HINTS:
+        if any(w in lowered for w in words):
+            found.extend(e for e in endpoints if e not in found)
+    return found
+
+
+def extract_hints(query: str, task_descriptions: List[str]) -> List[Tuple[str, str, str]]:
+    """(endpoint, ticker, period) requests the plan is likely to make, most explicit first.
+
+    Each task contributes the tickers, period and statements it names, falling back to the query
+    for tickers and period (and to annual statements); tasks naming no statement are skipped.
+    """
+    hints = []
+    for description in task_descriptions:
+        statements = _statements(description)
+        tickers = _tickers(description) or _tickers(query)
+        period = _period(description) or _period(query) or "annual"
+        for ticker in tickers:
+            for endpoint in statements:
+                if (endpoint, ticker, period) not in hints:
+                    hints.append((endpoint, ticker, period))
+    return hints
+
+
+class PrefetchCounters:
+    """Process-wide prefetch totals."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.hits = 0
+        self.wasted = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def add(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def stats(self) -> dict:
+        used = self.issued - self.wasted - self.failed
+        return {"issued": self.issued, "hits": self.hits, "wasted": self.wasted, "failed": self.failed,
+                "skipped": self.skipped, "useful_rate": used / self.issued if self.issued else 0.0}
+
+
+prefetch_stats = PrefetchCounters()
+
+
+class Prefetcher:
+    """Warms the data cache for one query while the agent is still deciding on its first action.
+
+    Up to `max_requests` hinted statements are fetched concurrently, PREFETCH_LIMIT periods deep,
+    through the normal acall_api path (cache, single flight, rate limits). While the query runs,
+    tool calls covered by a prefetch are served from it, waiting for it if it is still in flight.
+    Prefetches are not cancelled when the query ends, since other queries may be sharing their
+    upstream request: on the long-lived loop blocking callers share (see dexter.utils.aio) they
+    finish and still warm the cache. Those nothing used are counted as wasted.
+    """
+
+    def __init__(self, hints: List[Tuple[str, str, str]], max_requests: int = 6):
+        self.hints = hints[:max_requests]
+        self.skipped = len(hints) - len(self.hints)
+        self._tasks: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._results: Dict[Tuple[str, str, str], dict] = {}
+        self._used = set()
+        self.hits = 0
+        self.failed = 0
+
+    def start(self) -> "Prefetcher":
+        for hint in self.hints:
+            self._tasks[hint] = asyncio.ensure_future(self._fetch(hint))
+        prefetch_stats.add(issued=len(self.hints), skipped=self.skipped)
+        return self
+
+    async def _fetch(self, hint: Tuple[str, str, str]) -> Optional[dict]:
+        from dexter.tools import acall_api
+
+        endpoint, ticker, period = hint
+        _current_prefetch.set(None)  # this task's own context: the prefetch must not wait on itself
+        try:
+            with get_tracer().span("prefetch", endpoint=endpoint, ticker=ticker, period=period):
+                data = await acall_api(endpoint, {"ticker": ticker, "period": period, "limit": PREFETCH_LIMIT})
+        except Exception:
+            self.failed += 1
+            return None
+        self._results[hint] = data
+        return data
+
+    @staticmethod
+    def _covering(endpoint: str, params: dict) -> Optional[Tuple[Tuple[str, str, str], int]]:
+        if set(params) - {"ticker", "period", "limit"}:
+            return None
+        limit = int(params.get("limit", PREFETCH_LIMIT))
+        if limit > PREFETCH_LIMIT:
+            return None
+        return (endpoint, str(params.get("ticker", "")).upper(), params.get("period")), limit
+
+    def _serve(self, hint, limit: int, data: Optional[dict]) -> Optional[dict]:
+        if data is None:
+            return None
+        self.hits += 1
+        self._used.add(hint)
+        # Statements come newest first, so the first `limit` rows are what a limit=N request returns
+        return {key: rows[:limit] if isinstance(rows, list) else rows for key, rows in data.items()}
+
+    async def aget(self, endpoint: str, params: dict) -> Optional[dict]:
+        """The response for a request covered by a prefetch (awaiting it if in flight), else None."""
+        covering = self._covering(endpoint, params)
+        if covering is None or covering[0] not in self._tasks:
+            return None
+        hint, limit = covering
+        return self._serve(hint, limit, await asyncio.shield(self._tasks[hint]))
+
+    def get(self, endpoint: str, params: dict) -> Optional[dict]:
+        """Sync variant of aget() for tool calls on worker threads: only finished prefetches count."""
+        covering = self._covering(endpoint, params)
+        if covering is None:
+            return None
+        hint, limit = covering
+        return self._serve(hint, limit, self._results.get(hint))
+
+    def close(self) -> dict:
+        """Account for the query's prefetches and return its stats."""
+        wasted = sum(1 for hint, task in self._tasks.items()
+                     if hint not in self._used and not (task.done() and task.result() is None))
+        prefetch_stats.add(hits=self.hits, wasted=wasted, failed=self.failed)
+        return {"prefetch_issued": len(self._tasks), "prefetch_hits": self.hits, "prefetch_wasted": wasted,
+                "prefetch_failed": self.failed, "prefetch_skipped": self.skipped}
+
+
+_current_prefetch: contextvars.ContextVar[Optional[Prefetcher]] = contextvars.ContextVar("dexter_prefetch", default=None)
+
+
+def current_prefetch() -> Optional[Prefetcher]:
+    """The prefetcher of the query being run in this context, if any."""
+    return _current_prefetch.get()
+
+
+@contextmanager
+def use_prefetch(prefetcher: Optional[Prefetcher]):
+    """Serve data API requests within the block (including tasks it spawns) from `prefetcher`."""
+    token = _current_prefetch.set(prefetcher)
+    try:
+        yield prefetcher
+    finally:
+        _current_prefetch.reset(token)
+
+
+def prefetch_enabled() -> bool:
+    return env_flag("DEXTER_PREFETCH", True)
+
+
+def start_prefetch(query: str, task_descriptions: List[str]) -> Optional[Prefetcher]:
+    """Start prefetching for a freshly planned query on the running loop (None when disabled or nothing to fetch)."""
+    if not prefetch_enabled():
+        return None
+    hints = extract_hints(query, task_descriptions)
+    if not hints:
+        return None
+    return Prefetcher(hints, max_requests=int(os.getenv("DEXTER_PREFETCH_MAX", "6"))).start()
@@ -15,6 +15,8 @@ You have access to the following tools:
 ---
 Based on the user's query and the tools available, create a list of tasks.
 The tasks should be achievable with the given tools.
+For each task, list in 'depends_on' the ids of the tasks whose results it needs. 
+Tasks with no dependencies (for example, fetching data for different companies) can run in parallel, so leave 'depends_on' empty for them.
 
 IMPORTANT: If the user's query is not related to financial research or cannot be addressed with the available tools, 
 return an EMPTY task list (no tasks). The system will answer the query directly without executing any tasks or tools.
@@ -15,6 +15,7 @@ PLANNING_SYSTEM_PROMPT_ZH = """
 3. 按邏輯順序排列任務
 4. 使任務描述清晰且可操作
 5. 如果查詢超出財務分析範圍或無法用可用工具完成，返回空任務列表
+6. 在每個任務的 depends_on 中列出它需要其結果的任務 id；彼此獨立的任務（例如獲取不同公司的數據）可以並行執行，depends_on 留空
 
 ## 任務描述範例：
 - "獲取蘋果公司最近四個季度的損益表"
@@ -0,0 +1,263 @@
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from dexter.http_client import parse_retry_after
+from dexter.tracing import current_span
+
+####################################
+# Adaptive rate limiting per upstream and API key
+####################################
+
+UPSTREAMS = ("openai", "financial_datasets")
+DEFAULT_LIMITS = {"openai": "10/20", "financial_datasets": "10/20"}
+
+# AIMD: halve the rate on a 429, then win it back by a twentieth of the configured rate per success
+DECREASE_FACTOR = 0.5
+INCREASE_FRACTION = 0.05
+MIN_RATE_FRACTION = 0.05
+
+REMAINING_HEADERS = ("x-ratelimit-remaining-requests", "x-ratelimit-remaining", "ratelimit-remaining")
+RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset", "ratelimit-reset")
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds until a rate-limit window resets: "20ms", "1.5s", "6m0s", plain seconds or an epoch timestamp."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        parts = _DURATION_PART.findall(value)
+        if not parts or "".join(n + u for n, u in parts) != value:
+            return None
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    return max(0.0, seconds - time.time()) if seconds > 1e9 else seconds
+
+
+def _header(headers, names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class TokenBucket:
+    """Token bucket whose rate adapts to what the upstream reports.
+
+    Callers reserve a token and sleep until it is due, so waiters are served in arrival order
+    from any thread or event loop. A 429 halves the rate (down to MIN_RATE_FRACTION of the
+    configured one) and pauses the bucket for any Retry-After; each success wins back a little of
+    the configured rate. Rate-limit headers cap the rate so the remaining quota lasts until the
+    window resets, and an exhausted quota pauses the bucket until then.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = rate * MIN_RATE_FRACTION
+        self.burst = burst or max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.throttled = 0
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens / self.rate, self._paused_until - now)
+            self.acquired += 1
+            if delay > 0:
+                self.waited += 1
+                self.total_wait_ms += delay * 1000
+                self.max_wait_ms = max(self.max_wait_ms, delay * 1000)
+        _record_wait(delay)
+        return delay
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self) -> float:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def observe(self, status_code: int, headers=None) -> None:
+        """Adapt the rate to a response's status and rate-limit headers."""
+        headers = headers or {}
+        with self._lock:
+            now = time.monotonic()
+            if status_code == 429:
+                self.throttled += 1
+                self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+                self._tokens = min(self._tokens, 0.0)
+                retry_after = parse_retry_after(headers.get("retry-after"))
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * INCREASE_FRACTION)
+
+            remaining, reset = _header(headers, REMAINING_HEADERS), parse_reset(_header(headers, RESET_HEADERS))
+            if remaining is not None and reset:
+                try:
+                    remaining = float(remaining)
+                except ValueError:
+                    return
+                if remaining < 1:
+                    self._paused_until = max(self._paused_until, now + reset)
+                else:
+                    self.rate = min(self.rate, max(self.min_rate, remaining / reset))
+
+    def stats(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "total_wait_ms": round(self.total_wait_ms, 3),
+            "max_wait_ms": round(self.max_wait_ms, 3),
+            "throttled": self.throttled,
+        }
+
+
+def _record_wait(delay: float) -> None:
+    # Queue wait is exported on the span of the call that waited (llm or api), summed over retries
+    span = current_span()
+    if delay > 0 and span.recording:
+        span.set(queue_wait_ms=round(span.attributes.get("queue_wait_ms", 0.0) + delay * 1000, 3))
+
+
+def _key_hash(api_key: Optional[str]) -> str:
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def parse_limit(value: str) -> Optional[Tuple[float, Optional[float]]]:
+    """"rate" or "rate/burst" in requests per second; "0" (or empty) means unlimited."""
+    rate, _, burst = (value or "0").partition("/")
+    if float(rate) <= 0:
+        return None
+    return float(rate), float(burst) if burst else None
+
+
+class RateLimiter:
+    """Process-wide token buckets, one per (upstream, API key).
+
+    `limits` maps an upstream to (rate, burst) or None for unlimited. Individual keys can be given
+    their own limits with configure(); other keys of that upstream get the upstream's limits.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Optional[Tuple[float, Optional[float]]]]] = None):
+        self._limits = dict(limits or {})
+        self._key_limits: Dict[tuple, Optional[Tuple[float, Optional[float]]]] = {}
+        self._buckets: Dict[tuple, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, upstream: str, rate: Optional[float], burst: Optional[float] = None,
+                  api_key: Optional[str] = None) -> None:
+        """Set the limits of an upstream, or of one API key for it (rate None or 0: unlimited)."""
+        limit = (rate, burst) if rate else None
+        with self._lock:
+            if api_key is None:
+                self._limits[upstream] = limit
+                self._buckets = {k: b for k, b in self._buckets.items() if k[0] != upstream}
+            else:
+                key = (upstream, _key_hash(api_key))
+                self._key_limits[key] = limit
+                self._buckets.pop(key, None)
+
+    def bucket(self, upstream: str, api_key: Optional[str]) -> Optional[TokenBucket]:
+        """The bucket for this upstream and key, or None when it is unlimited."""
+        key = (upstream, _key_hash(api_key))
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                limit = self._key_limits[key] if key in self._key_limits else self._limits.get(upstream)
+                if limit is None:
+                    return None
+                bucket = self._buckets[key] = TokenBucket(*limit)
+            return bucket
+
+    def acquire(self, upstream: str, api_key: Optional[str]) -> float:
+        bucket = self.bucket(upstream, api_key)
+        return bucket.acquire() if bucket is not None else 0.0
+
+    async def aacquire(self, upstream: str, api_key: Optional[str]) -> float:
+        bucket = self.bucket(upstream, api_key)
+        return await bucket.aacquire() if bucket is not None else 0.0
+
+    def observe(self, upstream: str, api_key: Optional[str], status_code: int, headers=None) -> None:
+        bucket = self.bucket(upstream, api_key)
+        if bucket is not None:
+            bucket.observe(status_code, headers)
+
+    def stats(self) -> dict:
+        """Per-bucket counters, keyed "upstream:key hash"."""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {f"{upstream}:{key_hash}": bucket.stats() for (upstream, key_hash), bucket in buckets.items()}
+
+
+def _bearer_key(response) -> Optional[str]:
+    auth = response.request.headers.get("authorization", "")
+    return auth[7:] if auth.startswith("Bearer ") else None
+
+
+def response_observer(upstream: str):
+    """httpx response hook feeding every response (SDK retries included) to the key's bucket."""
+    def observe(response):
+        get_rate_limiter().observe(upstream, _bearer_key(response), response.status_code, response.headers)
+    return observe
+
+
+def async_response_observer(upstream: str):
+    observe = response_observer(upstream)
+
+    async def aobserve(response):
+        observe(response)
+    return aobserve
+
+
+# Global limiter instance (lazy initialization)
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the process-wide limiter from DEXTER_RATE_LIMIT_<UPSTREAM> ("rate[/burst]" per second)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter({
+                    upstream: parse_limit(os.getenv(f"DEXTER_RATE_LIMIT_{upstream.upper()}", DEFAULT_LIMITS[upstream]))
+                    for upstream in UPSTREAMS
+                })
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replace the process-wide limiter (pass None to re-create it lazily from the environment)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
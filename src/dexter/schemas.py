@@ -1,11 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 class Task(BaseModel):
     """Represents a single task in a task list."""
     id: int = Field(..., description="Unique identifier for the task.")
     description: str = Field(..., description="The description of the task.")
     done: bool = Field(False, description="Whether the task is completed.")
+    depends_on: Optional[List[int]] = Field(None, description="Ids of tasks that must be completed before this one can start. Empty if the task is independent.")
 
 class TaskList(BaseModel):
     """Represents a list of tasks."""
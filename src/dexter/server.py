@@ -0,0 +1,337 @@
+from dotenv import load_dotenv
+
+# Load environment variables BEFORE importing any dexter modules
+load_dotenv()
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, List, Optional
+
+from dexter.agent import AsyncAgent
+from dexter.budget import QueryBudget
+from dexter.schemas import Task
+from dexter.utils.aio import aclose_loop_resources
+
+####################################
+# HTTP/SSE agent server
+####################################
+
+MAX_BODY_BYTES = 64 * 1024
+HEADER_TIMEOUT = 30.0
+KEEPALIVE_INTERVAL = 15.0
+RETRY_AFTER_SECONDS = 5
+RESULT_PREVIEW_CHARS = 500
+
+REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           408: "Request Timeout", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class EventUI:
+    """UI adapter that turns every agent UI callback (the ones StreamlitUI renders) into an event.
+
+    `emit(event, data)` is called on the event loop with a name such as "tool_execution" and a
+    JSON-serializable dict.
+    """
+
+    def __init__(self, emit: Callable[[str, dict], None]):
+        self.emit = emit
+
+    def show_planning_started(self):
+        self.emit("planning_started", {})
+
+    def show_planning_completed(self, num_tasks: int):
+        self.emit("planning_completed", {"num_tasks": num_tasks})
+
+    def show_tasks(self, tasks: List[Task]):
+        self.emit("tasks", {"tasks": [task.model_dump() for task in tasks]})
+
+    def show_no_tasks(self):
+        self.emit("no_tasks", {})
+
+    def show_working_on_task(self, task_description: str):
+        self.emit("working_on_task", {"description": task_description})
+
+    def show_step_progress(self, step: int, max_steps: int):
+        self.emit("step_progress", {"step": step, "max_steps": max_steps})
+
+    def show_tool_execution(self, tool_name: str, tool_input: dict):
+        self.emit("tool_execution", {"tool": tool_name, "input": tool_input})
+
+    def show_tool_result(self, tool_name: str, result: Any):
+        self.emit("tool_result", {"tool": tool_name, "ok": bool(result), "preview": str(result)[:RESULT_PREVIEW_CHARS]})
+
+    def show_validation_check(self, task_description: str):
+        self.emit("validation_check", {"description": task_description})
+
+    def show_task_completed(self, task_id: int):
+        self.emit("task_completed", {"task_id": task_id})
+
+    def show_loop_detected(self, last_actions: List[str]):
+        self.emit("loop_detected", {"last_actions": last_actions})
+
+    def show_max_steps_reached(self, task_description: str):
+        self.emit("max_steps_reached", {"description": task_description})
+
+    def show_generating_answer(self):
+        self.emit("generating_answer", {})
+
+    def show_answer(self, answer: str):
+        self.emit("answer", {"answer": answer})
+
+    def show_error(self, error: str):
+        self.emit("error", {"message": error})
+
+    def show_warning(self, warning: str):
+        self.emit("warning", {"message": warning})
+
+    def show_info(self, info: str):
+        self.emit("info", {"message": info})
+
+
+class BadRequest(ValueError):
+    """A request the server refuses, with the HTTP status to answer it with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode("utf-8")
+
+
+def _default_agent_factory(ui: EventUI, request: dict, headers: dict) -> AsyncAgent:
+    return AsyncAgent(
+        ui=ui,
+        quiet=True,
+        model_name=request.get("model"),
+        use_chinese=bool(request.get("use_chinese", False)),
+        token_budget=request.get("token_budget"),
+        cost_budget=request.get("cost_budget"),
+        # Per-request credentials; unset ones fall back to the server's environment
+        openai_api_key=headers.get("x-openai-api-key"),
+        financial_api_key=headers.get("x-financial-datasets-api-key"),
+    )
+
+
+class AgentServer:
+    """Minimal asyncio HTTP/1.1 server streaming agent runs as server-sent events.
+
+    `POST /query` with a JSON body `{"query": ..., "model"?, "use_chinese"?, "token_budget"?,
+    "cost_budget"?}` streams one event per UI update (planning, tasks, tool execution, validation),
+    a `token` event per answer chunk and a final `done` (or `error`) event. At most
+    `max_concurrent` queries run at once; up to `max_queued` more wait (and get `queued` events),
+    and the rest are refused with 503. `GET /healthz` reports the load.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000, max_concurrent: int = 4, max_queued: int = 16,
+                 agent_factory: Optional[Callable[[EventUI, dict, dict], AsyncAgent]] = None,
+                 cors_origin: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.agent_factory = agent_factory or _default_agent_factory
+        self.cors_origin = cors_origin
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    # ---------- lifecycle ----------
+    async def start(self) -> "AgentServer":
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self, on_start: Optional[Callable[["AgentServer"], None]] = None) -> None:
+        await self.start()
+        if on_start is not None:
+            on_start(self)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await aclose_loop_resources()
+
+    def stats(self) -> dict:
+        return {"active": self.active, "queued": self.queued, "completed": self.completed, "failed": self.failed,
+                "rejected": self.rejected, "max_concurrent": self.max_concurrent, "max_queued": self.max_queued}
+
+    # ---------- HTTP ----------
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise BadRequest(400, "Malformed request line")
+        method, target, _ = request_line
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise BadRequest(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise BadRequest(413, f"Request body over {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    def _head(self, status: int, content_type: str, extra: Optional[dict] = None) -> bytes:
+        headers = {"Content-Type": content_type, "Cache-Control": "no-cache", "Connection": "close"}
+        if self.cors_origin:
+            headers.update({"Access-Control-Allow-Origin": self.cors_origin,
+                            "Access-Control-Allow-Headers": "Content-Type, X-OpenAI-Api-Key, X-Financial-Datasets-Api-Key",
+                            "Access-Control-Allow-Methods": "GET, POST, OPTIONS"})
+        headers.update(extra or {})
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"] + [f"{k}: {v}" for k, v in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _respond_json(self, writer: asyncio.StreamWriter, status: int, data: dict, extra: Optional[dict] = None):
+        body = json.dumps(data).encode("utf-8")
+        writer.write(self._head(status, "application/json", {"Content-Length": str(len(body)), **(extra or {})}) + body)
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, headers, body = await asyncio.wait_for(self._read_request(reader), HEADER_TIMEOUT)
+                if method == "OPTIONS" and self.cors_origin:
+                    writer.write(self._head(204, "text/plain", {"Content-Length": "0"}))
+                elif path == "/healthz":
+                    await self._respond_json(writer, 200, {"status": "ok", **self.stats()})
+                elif path != "/query":
+                    raise BadRequest(404, f"No route for {path}")
+                elif method != "POST":
+                    raise BadRequest(405, "Use POST /query")
+                else:
+                    await self._query(writer, self._parse_query(body), headers)
+            except BadRequest as e:
+                await self._respond_json(writer, e.status, {"error": str(e)},
+                                         {"Retry-After": str(RETRY_AFTER_SECONDS)} if e.status == 503 else None)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                await self._respond_json(writer, 408, {"error": "Incomplete request"})
+            await writer.drain()
+        except ConnectionError:
+            pass  # client went away
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_query(body: bytes) -> dict:
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise BadRequest(400, "Body must be JSON")
+        if not isinstance(request, dict) or not isinstance(request.get("query"), str) or not request["query"].strip():
+            raise BadRequest(400, 'Body must be a JSON object with a non-empty "query" string')
+        for field in ("token_budget", "cost_budget"):
+            if request.get(field) is not None and not isinstance(request[field], (int, float)):
+                raise BadRequest(400, f'"{field}" must be a number')
+        return request
+
+    # ---------- queries ----------
+    async def _query(self, writer: asyncio.StreamWriter, request: dict, headers: dict) -> None:
+        if self.active + self.queued >= self.max_concurrent + self.max_queued:
+            self.rejected += 1
+            raise BadRequest(503, "Server busy, retry later")
+
+        writer.write(self._head(200, "text/event-stream", {"X-Accel-Buffering": "no"}))
+        self.queued += 1
+        try:
+            if self._slots.locked():
+                writer.write(_sse("queued", {"position": self.queued}))
+                await writer.drain()
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.active += 1
+        try:
+            await self._stream_run(writer, request, headers)
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    async def _stream_run(self, writer: asyncio.StreamWriter, request: dict, headers: dict) -> None:
+        events: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def emit(event: str, data: dict):
+            events.put_nowait((event, data))
+
+        agent = self.agent_factory(EventUI(emit), request, headers)
+        budget = QueryBudget.from_env(agent.token_budget, agent.cost_budget)
+        start = time.perf_counter()
+
+        async def produce():
+            try:
+                answer = await agent.arun(request["query"], on_token=lambda text: emit("token", {"text": text}),
+                                          budget=budget)
+                emit("done", {"answer": answer, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                              "usage": budget.stats()})
+                self.completed += 1
+            except Exception as e:
+                emit("error", {"message": f"{type(e).__name__}: {e}", "fatal": True})
+                self.failed += 1
+            finally:
+                events.put_nowait(done)
+
+        emit("started", {"query": request["query"]})
+        run = asyncio.ensure_future(produce())
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(events.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")  # keeps idle proxies and load balancers from closing the stream
+                else:
+                    if item is done:
+                        break
+                    writer.write(_sse(*item))
+                await writer.drain()
+        finally:
+            # Client disconnected (or we are shutting down): stop the run
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="dexter-server", description="Serve the Dexter agent over HTTP with server-sent events.")
+    parser.add_argument("--host", default=os.getenv("DEXTER_SERVER_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("DEXTER_SERVER_PORT", "8000")))
+    parser.add_argument("--max-concurrent", type=int, default=int(os.getenv("DEXTER_SERVER_MAX_CONCURRENT", "4")),
+                        help="queries run at the same time")
+    parser.add_argument("--max-queued", type=int, default=int(os.getenv("DEXTER_SERVER_MAX_QUEUED", "16")),
+                        help="queries waiting for a slot before new ones get 503")
+    parser.add_argument("--cors-origin", default=os.getenv("DEXTER_SERVER_CORS_ORIGIN"),
+                        help="allow browser requests from this origin")
+    args = parser.parse_args()
+
+    server = AgentServer(args.host, args.port, args.max_concurrent, args.max_queued, cors_origin=args.cors_origin)
+    def announce(server: AgentServer):
+        print(f"Dexter server listening on http://{server.host}:{server.port} "
+              f"(max {server.max_concurrent} concurrent, {server.max_queued} queued)", flush=True)
+
+    try:
+        asyncio.run(server.serve_forever(on_start=announce))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
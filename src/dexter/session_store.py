@@ -0,0 +1,102 @@
+import re
+from typing import Iterable, List, Optional
+
+
+class ToolRecord:
+    """One executed tool call and its outcome."""
+
+    def __init__(self, task_id: Optional[int], tool_name: str, args: dict, result=None, error: Optional[Exception] = None):
+        self.task_id = task_id
+        self.tool_name = tool_name
+        self.args = args
+        self.result = result
+        self.error = error
+        tickers = args.get("tickers") or [args.get("ticker")]
+        self.tickers = [t.upper() for t in tickers if isinstance(t, str)]
+        self.ticker = self.tickers[0] if len(self.tickers) == 1 else None
+        self.period = args.get("period")
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def render(self) -> str:
+        """Full text of the record, as fed to the LLM."""
+        if self.ok:
+            return f"Output of {self.tool_name} with args {self.args}: {self.result}"
+        return f"Error from {self.tool_name} with args {self.args}: {self.error}"
+
+    def summary(self) -> str:
+        """One-line description used in the manifest of available data."""
+        details = ", ".join(f"{k}={v}" for k, v in self.args.items())
+        status = "" if self.ok else " (failed)"
+        return f"{self.tool_name}({details}){status}"
+
+
+class SessionStore:
+    """Tool results of one run, indexed by task, tool, ticker and period."""
+
+    def __init__(self):
+        self.records: List[ToolRecord] = []
+
+    def add(self, task_id: Optional[int], tool_name: str, args: dict, result=None, error: Optional[Exception] = None) -> ToolRecord:
+        record = ToolRecord(task_id, tool_name, args, result, error)
+        self.records.append(record)
+        return record
+
+    def find(self, tool_name: Optional[str] = None, ticker: Optional[str] = None, period: Optional[str] = None,
+             task_ids: Optional[Iterable[int]] = None) -> List[ToolRecord]:
+        """Return records matching every given filter, in execution order."""
+        ticker = ticker.upper() if ticker else None
+        task_ids = set(task_ids) if task_ids is not None else None
+        return [
+            r for r in self.records
+            if (tool_name is None or r.tool_name == tool_name)
+            and (ticker is None or ticker in r.tickers)
+            and (period is None or r.period == period)
+            and (task_ids is None or r.task_id in task_ids)
+        ]
+
+    def tickers(self) -> List[str]:
+        return sorted({t for r in self.records for t in r.tickers})
+
+    def outputs(self) -> List[str]:
+        """Every record rendered in execution order (used for the final answer)."""
+        return [r.render() for r in self.records]
+
+    def relevant_records(self, task_id: int, description: str, related_task_ids: Optional[Iterable[int]] = None) -> List[ToolRecord]:
+        """Records produced by the task or the tasks it depends on, or about tickers its description names.
+
+        When the task has no dependency information and names no known ticker, every record is relevant.
+        """
+        related = {task_id, *(related_task_ids or [])}
+        mentioned = {t for t in self.tickers() if re.search(rf"(?<![A-Za-z0-9]){re.escape(t)}(?![A-Za-z0-9])", description)}
+        if related_task_ids is None and not mentioned:
+            return list(self.records)
+        return [r for r in self.records if r.task_id in related or mentioned.intersection(r.tickers)]
+
+    def context_for(self, task_id: int, description: str, related_task_ids: Optional[Iterable[int]] = None,
+                    max_full_records: Optional[int] = None) -> str:
+        """Relevant results in full plus a compact manifest of everything else fetched so far.
+
+        With `max_full_records`, only the most recent relevant results are given in full.
+        """
+        relevant = self.relevant_records(task_id, description, related_task_ids)
+        return self._render(relevant, max_full_records, "Other data already fetched this session (ask for it again if needed):")
+
+    def answer_context(self, query: str, max_full_records: int) -> str:
+        """Trimmed data for the final answer: the most recent results about the query's tickers in full,
+        and a manifest of the rest."""
+        relevant = self.relevant_records(None, query)
+        return self._render(relevant, max_full_records, "Other data fetched this session (not shown in full):")
+
+    def _render(self, relevant: List[ToolRecord], max_full_records: Optional[int], manifest_heading: str) -> str:
+        if max_full_records is not None:
+            relevant = relevant[-max_full_records:] if max_full_records > 0 else []
+        relevant_ids = {id(r) for r in relevant}
+        others = [r for r in self.records if id(r) not in relevant_ids]
+        parts = [r.render() for r in relevant]
+        if others:
+            parts.append(manifest_heading)
+            parts.extend(f"- {r.summary()}" for r in others)
+        return "\n".join(parts)
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Outcome handed to waiters when the leader was cancelled or interrupted before finishing
+_ABANDONED = object()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the work; callers arriving while it is in flight wait for
+    and receive the same result or exception. Works across threads and event loops, so sync
+    and async callers can share one flight. A leader that is cancelled or interrupted does not
+    pass that on: one of its waiters runs the work again instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.executions += 1
+            return future, True
+
+    def _settle(self, key: str, future: Future, result=None, error: Optional[BaseException] = None) -> None:
+        # Forget the flight before waking waiters, so a retrying waiter starts a new one
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn() unless a call with the same key is already in flight, then share its outcome."""
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                result = future.result()
+                if result is _ABANDONED:
+                    continue
+                return result
+            try:
+                result = fn()
+            except Exception as e:
+                self._settle(key, future, error=e)
+                raise
+            except BaseException:
+                # The leader was interrupted, which says nothing about the work: waiters run it again
+                self._settle(key, future, _ABANDONED)
+                raise
+            self._settle(key, future, result)
+            return result
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of do(); fn is a coroutine function."""
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                # Shielded: wrap_future would otherwise cancel the shared future along with this waiter
+                result = await asyncio.shield(asyncio.wrap_future(future))
+                if result is _ABANDONED:
+                    continue
+                return result
+            try:
+                result = await fn()
+            except Exception as e:
+                self._settle(key, future, error=e)
+                raise
+            except BaseException:
+                # Cancelled (e.g. the client of this query went away): waiters from other queries run it again
+                self._settle(key, future, _ABANDONED)
+                raise
+            self._settle(key, future, result)
+            return result
+
+    def stats(self) -> dict:
+        """Return how many calls ran and how many were coalesced onto an in-flight call."""
+        with self._lock:
+            in_flight = len(self._calls)
+        calls = self.executions + self.coalesced
+        return {
+            "calls": calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_rate": self.coalesced / calls if calls else 0.0,
+            "in_flight": in_flight,
+        }
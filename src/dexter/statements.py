@@ -0,0 +1,233 @@
+from numbers import Number
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+####################################
+# Columnar financial statements
+####################################
+
+# Fields that describe a row rather than a line item.
+META_FIELDS = ("ticker", "report_period", "period", "fiscal_period", "currency")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+
+class StatementFrame:
+    """Financial statement line items stored as NumPy columns aligned on report_period.
+
+    Rows are ordered by report period, oldest first. Numeric line items are float64 arrays
+    (NaN where the API returned nothing); any other fields are kept as object arrays.
+    """
+
+    def __init__(
+        self,
+        report_periods: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        text_columns: Optional[Dict[str, np.ndarray]] = None,
+        ticker: Optional[str] = None,
+        period: Optional[str] = None,
+        statement_types: Iterable[str] = (),
+    ):
+        self.report_periods = report_periods
+        self.columns = columns
+        self.text_columns = text_columns or {}
+        self.ticker = ticker
+        self.period = period
+        self.statement_types = tuple(statement_types)
+
+    @classmethod
+    def from_records(cls, records: List[dict], statement_type: str, ticker: Optional[str] = None,
+                     period: Optional[str] = None) -> "StatementFrame":
+        """Build a frame from the list of statement dicts returned by the API."""
+        records = [r for r in records or [] if r.get("report_period")]
+        records.sort(key=lambda r: r["report_period"])
+        if records:
+            ticker = ticker or records[0].get("ticker")
+            period = period or records[0].get("period")
+
+        names = []
+        for record in records:
+            for name in record:
+                if name not in names and name not in ("ticker", "report_period", "period"):
+                    names.append(name)
+
+        columns, text_columns = {}, {}
+        for name in names:
+            values = [r.get(name) for r in records]
+            if name not in META_FIELDS and all(v is None or _is_number(v) for v in values):
+                columns[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                text_columns[name] = np.array(values, dtype=object)
+
+        report_periods = np.array([r["report_period"] for r in records], dtype="U10")
+        return cls(report_periods, columns, text_columns, ticker=ticker.upper() if ticker else None,
+                   period=period, statement_types=(statement_type,))
+
+    # ---------- access ----------
+    def __len__(self) -> int:
+        return len(self.report_periods)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def line_items(self) -> List[str]:
+        return list(self.columns)
+
+    def get(self, name: str) -> np.ndarray:
+        """Column for a line item, or an all-NaN column if it is missing."""
+        column = self.columns.get(name)
+        return column if column is not None else np.full(len(self), np.nan)
+
+    def _take(self, index) -> "StatementFrame":
+        return StatementFrame(
+            self.report_periods[index],
+            {k: v[index] for k, v in self.columns.items()},
+            {k: v[index] for k, v in self.text_columns.items()},
+            ticker=self.ticker,
+            period=self.period,
+            statement_types=self.statement_types,
+        )
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> "StatementFrame":
+        """Rows whose report period lies in [start, end] (ISO dates, either bound optional)."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.report_periods >= start
+        if end is not None:
+            mask &= self.report_periods <= end
+        return self._take(mask)
+
+    def tail(self, n: int) -> "StatementFrame":
+        """The n most recent report periods."""
+        return self._take(slice(max(len(self) - n, 0), None))
+
+    def select(self, names: Iterable[str]) -> "StatementFrame":
+        """A frame with only the given line items."""
+        frame = self._take(slice(None))
+        frame.columns = {k: self.columns[k] for k in names if k in self.columns}
+        return frame
+
+    # ---------- combining ----------
+    def join(self, other: "StatementFrame", how: str = "inner") -> "StatementFrame":
+        """Combine two statements of the same company on report period.
+
+        how="inner" keeps the periods both frames have; how="left" keeps this frame's periods and
+        leaves `other`'s line items NaN where it has no matching period. Line items present in both
+        (e.g. net_income) keep this frame's values, filling gaps from `other`.
+        """
+        if how == "inner":
+            report_periods, left, right = np.intersect1d(self.report_periods, other.report_periods, return_indices=True)
+            columns = {k: v[left] for k, v in self.columns.items()}
+            text_columns = {k: v[left] for k, v in self.text_columns.items()}
+            take_other = lambda values, fill: values[right]
+        elif how == "left":
+            report_periods = self.report_periods
+            columns = dict(self.columns)
+            text_columns = dict(self.text_columns)
+            positions = {p: i for i, p in enumerate(other.report_periods)}
+            right = np.array([positions.get(p, -1) for p in report_periods], dtype=np.int64)
+            found = right >= 0
+
+            def take_other(values, fill):
+                out = np.full(len(right), fill, dtype=values.dtype)
+                out[found] = values[right[found]]
+                return out
+        else:
+            raise ValueError(f"Unsupported join type: {how}")
+
+        for name, values in other.columns.items():
+            values = take_other(values, np.nan)
+            if name in columns:
+                columns[name] = np.where(np.isnan(columns[name]), values, columns[name])
+            else:
+                columns[name] = values
+        for name, values in other.text_columns.items():
+            if name not in text_columns:
+                text_columns[name] = take_other(values, None)
+        statement_types = self.statement_types + tuple(t for t in other.statement_types if t not in self.statement_types)
+        return StatementFrame(report_periods, columns, text_columns, ticker=self.ticker or other.ticker,
+                              period=self.period or other.period, statement_types=statement_types)
+
+    # ---------- conversion ----------
+    def to_records(self) -> List[dict]:
+        """Convert back to API-style dicts, most recent period first."""
+        records = []
+        for i in range(len(self) - 1, -1, -1):
+            record = {"ticker": self.ticker, "report_period": str(self.report_periods[i]), "period": self.period}
+            for name, values in self.text_columns.items():
+                record[name] = values[i]
+            for name, values in self.columns.items():
+                value = values[i]
+                record[name] = None if np.isnan(value) else (int(value) if value.is_integer() else float(value))
+            records.append(record)
+        return records
+
+    def to_text(self) -> str:
+        """Compact table rendering: one line per line item, one column per report period."""
+        if not self:
+            return f"No {'/'.join(self.statement_types) or 'statement'} data for {self.ticker or 'ticker'}."
+        lines = [
+            f"{'/'.join(self.statement_types)} {self.ticker} ({self.period})",
+            "report_period," + ",".join(self.report_periods),
+        ]
+        for name, values in self.text_columns.items():
+            lines.append(name + "," + ",".join("" if v is None else str(v) for v in values))
+        for name, values in self.columns.items():
+            lines.append(name + "," + ",".join("" if np.isnan(v) else f"{v:.15g}" for v in values))
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.to_text()
+
+    def __repr__(self) -> str:
+        return f"StatementFrame(ticker={self.ticker!r}, period={self.period!r}, statements={self.statement_types}, rows={len(self)}, line_items={len(self.columns)})"
+
+
+class StatementBatch:
+    """Statements for several tickers fetched in one call, with per-ticker errors."""
+
+    def __init__(self):
+        self.frames: Dict[str, Dict[str, StatementFrame]] = {}
+        self.errors: Dict[str, Dict[str, str]] = {}
+
+    def add(self, ticker: str, statement_type: str, frame: StatementFrame) -> None:
+        self.frames.setdefault(ticker, {})[statement_type] = frame
+
+    def add_error(self, ticker: str, statement_type: str, error: Exception) -> None:
+        self.errors.setdefault(ticker, {})[statement_type] = str(error)
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(dict.fromkeys([*self.frames, *self.errors]))
+
+    def __bool__(self) -> bool:
+        return any(frame for frames in self.frames.values() for frame in frames.values())
+
+    def to_dict(self) -> dict:
+        return {
+            ticker: {
+                **{t: f.to_records() for t, f in self.frames.get(ticker, {}).items()},
+                **{t: {"error": e} for t, e in self.errors.get(ticker, {}).items()},
+            }
+            for ticker in self.tickers
+        }
+
+    def __str__(self) -> str:
+        parts = []
+        for ticker in self.tickers:
+            for frame in self.frames.get(ticker, {}).values():
+                parts.append(frame.to_text())
+            for statement_type, error in self.errors.get(ticker, {}).items():
+                parts.append(f"Error fetching {statement_type} for {ticker}: {error}")
+        return "\n\n".join(parts)
+
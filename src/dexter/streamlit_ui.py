@@ -4,9 +4,30 @@ Streamlit UI adapter for Dexter agent
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from typing import List, Optional, Any
 from dexter.schemas import Task
-import time
+import functools
+import threading
+
+
+def _in_script_run(method):
+    """在設定狀態容器的那次腳本執行中呼叫 show_* 方法
+
+    Agent 在 Dexter 的背景事件迴圈執行緒上呼叫 UI，Streamlit 需要該次執行的 ScriptRunContext 才能輸出元件。
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        thread = threading.current_thread()
+        previous = get_script_run_ctx(suppress_warning=True)
+        if self.script_run_ctx is None or previous is self.script_run_ctx:
+            return method(self, *args, **kwargs)
+        add_script_run_ctx(thread, self.script_run_ctx)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            add_script_run_ctx(thread, previous)
+    return wrapper
 
 
 class StreamlitUI:
@@ -14,14 +35,16 @@ class StreamlitUI:
 
     def __init__(self):
         self.status_container = None
+        self.script_run_ctx = None
         self.current_tasks = []
         self.current_step = 0
         self.max_steps = 20
         self.task_progress = {}
 
     def set_status_container(self, container):
-        """設定狀態顯示容器"""
+        """設定狀態顯示容器（須在腳本執行緒中呼叫）"""
         self.status_container = container
+        self.script_run_ctx = get_script_run_ctx(suppress_warning=True)
 
     def reset(self):
         """重置 UI 狀態"""
@@ -29,6 +52,7 @@ class StreamlitUI:
         self.current_step = 0
         self.task_progress = {}
 
+    @_in_script_run
     def show_tasks(self, tasks: List[Task]):
         """顯示任務列表"""
         self.current_tasks = tasks
@@ -41,6 +65,7 @@ class StreamlitUI:
                 self.status_container.write(f"{status_icon} {task.description}")
                 self.task_progress[task.id] = task.done
 
+    @_in_script_run
     def show_step_progress(self, step: int, max_steps: int):
         """顯示步驟進度"""
         self.current_step = step
@@ -50,6 +75,7 @@ class StreamlitUI:
             progress = step / max_steps if max_steps > 0 else 0
             self.status_container.progress(progress, text=f"步驟 {step}/{max_steps}")
 
+    @_in_script_run
     def show_tool_execution(self, tool_name: str, tool_input: dict):
         """顯示工具執行"""
         if self.status_container:
@@ -57,13 +83,15 @@ class StreamlitUI:
             tool_display_names = {
                 "get_income_statements": "📊 取得損益表",
                 "get_balance_sheets": "📈 取得資產負債表",
-                "get_cash_flow_statements": "💰 取得現金流量表"
+                "get_cash_flow_statements": "💰 取得現金流量表",
+                "compute_financial_metrics": "🧮 計算財務指標",
+                "get_financial_statements_batch": "📚 批次取得財務報表"
             }
 
             display_name = tool_display_names.get(tool_name, f"🔧 {tool_name}")
 
             # 顯示工具執行訊息
-            ticker = tool_input.get('ticker', '')
+            ticker = tool_input.get('ticker') or ', '.join(tool_input.get('tickers', []))
             period = tool_input.get('period', '')
 
             if ticker:
@@ -78,9 +106,7 @@ class StreamlitUI:
                     period_display = period_names.get(period, period)
                     self.status_container.write(f"  • 期間: {period_display}")
 
-            # 模擬載入動畫
-            time.sleep(0.5)
-
+    @_in_script_run
     def show_tool_result(self, tool_name: str, result: Any):
         """顯示工具結果"""
         if self.status_container:
@@ -90,6 +116,7 @@ class StreamlitUI:
             else:
                 self.status_container.warning(f"⚠ 未取得資料")
 
+    @_in_script_run
     def show_task_completed(self, task_id: int):
         """顯示任務完成"""
         if task_id in self.task_progress:
@@ -111,21 +138,25 @@ class StreamlitUI:
         # 保留此方法以保持介面相容性
         pass
 
+    @_in_script_run
     def show_error(self, error: str):
         """顯示錯誤訊息"""
         if self.status_container:
             self.status_container.error(f"❌ 錯誤: {error}")
 
+    @_in_script_run
     def show_warning(self, warning: str):
         """顯示警告訊息"""
         if self.status_container:
             self.status_container.warning(f"⚠️ 警告: {warning}")
 
+    @_in_script_run
     def show_info(self, info: str):
         """顯示資訊訊息"""
         if self.status_container:
             self.status_container.info(f"ℹ️ {info}")
 
+    @_in_script_run
     def show_loop_detected(self, last_actions: List[str]):
         """顯示偵測到循環"""
         if self.status_container:
@@ -134,6 +165,7 @@ class StreamlitUI:
                 f"最近的動作: {', '.join(last_actions[-2:]) if len(last_actions) >= 2 else '無'}"
             )
 
+    @_in_script_run
     def show_max_steps_reached(self, task_description: str):
         """顯示達到最大步驟限制"""
         if self.status_container:
@@ -141,16 +173,19 @@ class StreamlitUI:
                 f"⏱️ 任務「{task_description}」已達到最大步驟限制，標記為完成。"
             )
 
+    @_in_script_run
     def show_planning_started(self):
         """顯示開始規劃"""
         if self.status_container:
             self.status_container.write("🧠 正在分析您的問題並規劃任務...")
 
+    @_in_script_run
     def show_planning_completed(self, num_tasks: int):
         """顯示規劃完成"""
         if self.status_container:
             self.status_container.write(f"✨ 規劃完成！已建立 {num_tasks} 個任務。")
 
+    @_in_script_run
     def show_no_tasks(self):
         """顯示沒有任務"""
         if self.status_container:
@@ -158,17 +193,21 @@ class StreamlitUI:
                 "這個問題可能超出了財務分析的範圍，或無法用可用的財務數據工具來回答。"
             )
 
+    @_in_script_run
     def show_working_on_task(self, task_description: str):
         """顯示正在處理的任務"""
         if self.status_container:
             self.status_container.write(f"🔍 正在處理: **{task_description}**")
 
+    @_in_script_run
     def show_validation_check(self, task_description: str):
         """顯示驗證檢查"""
         if self.status_container:
             self.status_container.write(f"✔️ 檢查任務是否完成: {task_description}")
 
+    @_in_script_run
     def show_generating_answer(self):
         """顯示正在生成答案"""
         if self.status_container:
-            self.status_container.write("✍️ 正在整理分析結果並生成答案...")
\ No newline at end of file
+            self.status_container.write("✍️ 正在整理分析結果並生成答案...")
+
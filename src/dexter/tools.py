@@ -1,13 +1,52 @@
-from langchain.tools import tool
+from langchain_core.tools import tool
 from typing import List, Callable, Literal, Optional
-import requests
+import asyncio
+import contextvars
+import hashlib
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pydantic import BaseModel, Field
 
+from dexter.cache import get_response_cache, make_cache_key
+from dexter.cassette import get_cassette
+from dexter.history import get_statement_history
+from dexter.http_client import get_async_http_client, get_http_client
+from dexter.metrics import MetricsResult, compute_metrics
+from dexter.prefetch import current_prefetch
+from dexter.rate_limit import get_rate_limiter
+from dexter.singleflight import SingleFlight
+from dexter.statements import StatementBatch, StatementFrame
+from dexter.tracing import current_span, get_tracer
+
 ####################################
 # Tools
 ####################################
-financial_datasets_api_key = os.getenv("FINANCIAL_DATASETS_API_KEY")
+# Overridable to point at a proxy or a local stand-in (see benchmarks/).
+FINANCIAL_DATASETS_BASE_URL = os.getenv("FINANCIAL_DATASETS_BASE_URL", "https://api.financialdatasets.ai")
+
+# Process-wide: identical requests in flight from any session share one upstream call.
+api_single_flight = SingleFlight()
+
+_financial_api_key: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("dexter_financial_api_key", default=None)
+
+@contextmanager
+def use_financial_api_key(api_key: Optional[str]):
+    """Send `api_key` with data API requests made within the block instead of FINANCIAL_DATASETS_API_KEY."""
+    token = _financial_api_key.set(api_key)
+    try:
+        yield
+    finally:
+        _financial_api_key.reset(token)
+
+def _api_key() -> Optional[str]:
+    return _financial_api_key.get() or os.getenv("FINANCIAL_DATASETS_API_KEY")
+
+def _tenant() -> str:
+    # Cached responses, statement histories and in-flight calls are only shared between callers with the
+    # same key: a key the API would reject must never be answered from data another key fetched
+    return hashlib.sha256((_api_key() or "").encode("utf-8")).hexdigest()[:16]
 
 class FinancialStatementsInput(BaseModel):
     ticker: str = Field(description="The stock ticker symbol to fetch financial statements for. For example, 'AAPL' for Apple.")
@@ -18,6 +57,19 @@ class FinancialStatementsInput(BaseModel):
     report_period_lt: Optional[str] = Field(default=None, description="Optional fitler to retrieve financial statements less than the specified report period.")
     report_period_lte: Optional[str] = Field(default=None, description="Optional fitler to retrieve financial statements less than or equal to the specified report period.")
 
+class FinancialMetricsInput(BaseModel):
+    ticker: str = Field(description="The stock ticker symbol to compute financial metrics for. For example, 'AAPL' for Apple.")
+    period: Literal["annual", "quarterly", "ttm"] = Field(description="The reporting period of the underlying statements. 'annual' for yearly, 'quarterly' for quarterly, and 'ttm' for trailing twelve months.")
+    limit: int = Field(default=5, description="The number of past reporting periods to compute metrics over.")
+
+StatementType = Literal["income_statement", "balance_sheet", "cash_flow_statement"]
+
+class BatchFinancialStatementsInput(BaseModel):
+    tickers: List[str] = Field(description="The stock ticker symbols to fetch financial statements for, e.g. ['AAPL', 'MSFT', 'GOOGL']. Up to 25 tickers.")
+    period: Literal["annual", "quarterly", "ttm"] = Field(description="The reporting period for the financial statements. 'annual' for yearly, 'quarterly' for quarterly, and 'ttm' for trailing twelve months.")
+    statement_types: List[StatementType] = Field(default=["income_statement"], description="Which statements to fetch for every ticker: 'income_statement', 'balance_sheet' and/or 'cash_flow_statement'.")
+    limit: int = Field(default=4, description="The number of past financial statements to retrieve per ticker and statement.")
+
 
 def _create_params(
     ticker: str,
@@ -41,11 +93,107 @@ def _create_params(
     return params
 
 def call_api(endpoint: str, params: dict) -> dict:
-    """Helper function to call the Financial Datasets API."""
-    base_url = "https://api.financialdatasets.ai"
-    url = f"{base_url}{endpoint}"
-    headers = {"x-api-key": financial_datasets_api_key}
-    response = requests.get(url, params=params, headers=headers)
+    """Helper function to call the Financial Datasets API, served from the response cache when fresh."""
+    with _api_span(endpoint, params) as span:
+        cassette = get_cassette()
+        if cassette.replaying:
+            span.set(replayed=True)
+            return cassette.replay_api(endpoint, params)
+
+        started = time.perf_counter()
+        try:
+            data = _call_api_cached(endpoint, params, span)
+        except Exception as e:
+            _record_api(cassette, endpoint, params, started, error=e)
+            raise
+        _record_api(cassette, endpoint, params, started, data=data)
+        return data
+
+def _call_api_cached(endpoint: str, params: dict, span) -> dict:
+    prefetcher = current_prefetch()
+    if prefetcher is not None:
+        prefetched = prefetcher.get(endpoint, params)
+        span.set(prefetch_hit=prefetched is not None)
+        if prefetched is not None:
+            return prefetched
+
+    tenant = _tenant()
+    cache = get_response_cache()
+    cached = cache.get(endpoint, params, tenant)
+    span.set(cache_hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        data = get_statement_history().fetch(endpoint, params, _fetch_api, tenant)
+        cache.set(endpoint, params, data, tenant)
+        return data
+
+    return api_single_flight.do(make_cache_key(endpoint, params, tenant), fetch)
+
+def _api_span(endpoint: str, params: dict):
+    return get_tracer().span("api", endpoint=endpoint, ticker=params.get("ticker"), period=params.get("period"))
+
+def _record_api(cassette, endpoint: str, params: dict, started: float, data: Optional[dict] = None, error: Optional[Exception] = None):
+    if cassette.recording:
+        cassette.record_api(endpoint, params, (time.perf_counter() - started) * 1000, data=data, error=error)
+
+def _fetch_api(endpoint: str, params: dict) -> dict:
+    """Perform the HTTP request against the Financial Datasets API over the shared pooled client."""
+    url = f"{FINANCIAL_DATASETS_BASE_URL}{endpoint}"
+    api_key = _api_key()
+    limiter = get_rate_limiter().bucket("financial_datasets", api_key)
+    response = get_http_client().get(url, params=params, headers={"x-api-key": api_key}, limiter=limiter)
+    current_span().set(status_code=response.status_code, response_bytes=len(response.content))
+    response.raise_for_status()
+    return response.json()
+
+async def acall_api(endpoint: str, params: dict) -> dict:
+    """Async variant of call_api sharing the same response cache and in-flight requests."""
+    with _api_span(endpoint, params) as span:
+        cassette = get_cassette()
+        if cassette.replaying:
+            span.set(replayed=True)
+            return await cassette.areplay_api(endpoint, params)
+
+        started = time.perf_counter()
+        try:
+            data = await _acall_api_cached(endpoint, params, span)
+        except Exception as e:
+            _record_api(cassette, endpoint, params, started, error=e)
+            raise
+        _record_api(cassette, endpoint, params, started, data=data)
+        return data
+
+async def _acall_api_cached(endpoint: str, params: dict, span) -> dict:
+    prefetcher = current_prefetch()
+    if prefetcher is not None:
+        prefetched = await prefetcher.aget(endpoint, params)
+        span.set(prefetch_hit=prefetched is not None)
+        if prefetched is not None:
+            return prefetched
+
+    tenant = _tenant()
+    cache = get_response_cache()
+    cached = cache.get(endpoint, params, tenant)
+    span.set(cache_hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        data = await get_statement_history().afetch(endpoint, params, _afetch_api, tenant)
+        cache.set(endpoint, params, data, tenant)
+        return data
+
+    return await api_single_flight.ado(make_cache_key(endpoint, params, tenant), fetch)
+
+async def _afetch_api(endpoint: str, params: dict) -> dict:
+    """Perform the HTTP request against the Financial Datasets API on the event loop's client."""
+    url = f"{FINANCIAL_DATASETS_BASE_URL}{endpoint}"
+    api_key = _api_key()
+    limiter = get_rate_limiter().bucket("financial_datasets", api_key)
+    response = await get_async_http_client().get(url, params=params, headers={"x-api-key": api_key}, limiter=limiter)
+    current_span().set(status_code=response.status_code, response_bytes=len(response.content))
     response.raise_for_status()
     return response.json()
 
@@ -58,11 +206,27 @@ def get_income_statements(
     report_period_gte: Optional[str] = None,
     report_period_lt: Optional[str] = None,
     report_period_lte: Optional[str] = None
-) -> dict:
+) -> StatementFrame:
     """Fetches a company's income statement, detailing its revenues, expenses, and net income over a reporting period. Useful for evaluating a company's profitability and operational efficiency."""
     params = _create_params(ticker, period, limit, report_period_gt, report_period_gte, report_period_lt, report_period_lte)
     data = call_api("/financials/income-statements/", params)
-    return data.get("income_statements", {})
+    return StatementFrame.from_records(data.get("income_statements", []), "income_statement", ticker, period)
+
+async def aget_income_statements(
+    ticker: str,
+    period: Literal["annual", "quarterly", "ttm"],
+    limit: int = 10,
+    report_period_gt: Optional[str] = None,
+    report_period_gte: Optional[str] = None,
+    report_period_lt: Optional[str] = None,
+    report_period_lte: Optional[str] = None
+) -> StatementFrame:
+    """Async implementation of get_income_statements."""
+    params = _create_params(ticker, period, limit, report_period_gt, report_period_gte, report_period_lt, report_period_lte)
+    data = await acall_api("/financials/income-statements/", params)
+    return StatementFrame.from_records(data.get("income_statements", []), "income_statement", ticker, period)
+
+get_income_statements.coroutine = aget_income_statements
 
 @tool(args_schema=FinancialStatementsInput)
 def get_balance_sheets(
@@ -73,11 +237,27 @@ def get_balance_sheets(
     report_period_gte: Optional[str] = None,
     report_period_lt: Optional[str] = None,
     report_period_lte: Optional[str] = None
-) -> dict:
+) -> StatementFrame:
     """Retrieves a company's balance sheet, which provides a snapshot of its assets, liabilities, and shareholders' equity at a specific point in time. Essential for assessing a company's financial position."""
     params = _create_params(ticker, period, limit, report_period_gt, report_period_gte, report_period_lt, report_period_lte)
     data = call_api("/financials/balance-sheets/", params)
-    return data.get("balance_sheets", {})
+    return StatementFrame.from_records(data.get("balance_sheets", []), "balance_sheet", ticker, period)
+
+async def aget_balance_sheets(
+    ticker: str,
+    period: Literal["annual", "quarterly", "ttm"],
+    limit: int = 10,
+    report_period_gt: Optional[str] = None,
+    report_period_gte: Optional[str] = None,
+    report_period_lt: Optional[str] = None,
+    report_period_lte: Optional[str] = None
+) -> StatementFrame:
+    """Async implementation of get_balance_sheets."""
+    params = _create_params(ticker, period, limit, report_period_gt, report_period_gte, report_period_lt, report_period_lte)
+    data = await acall_api("/financials/balance-sheets/", params)
+    return StatementFrame.from_records(data.get("balance_sheets", []), "balance_sheet", ticker, period)
+
+get_balance_sheets.coroutine = aget_balance_sheets
 
 @tool(args_schema=FinancialStatementsInput)
 def get_cash_flow_statements(
@@ -88,16 +268,136 @@ def get_cash_flow_statements(
     report_period_gte: Optional[str] = None,
     report_period_lt: Optional[str] = None,
     report_period_lte: Optional[str] = None
-) -> dict:
+) -> StatementFrame:
     """Provides a company's cash flow statement, showing how cash is generated and used across operating, investing, and financing activities. Key for understanding a company's liquidity and solvency."""
     params = _create_params(ticker, period, limit, report_period_gt, report_period_gte, report_period_lt, report_period_lte)
     data = call_api("/financials/cash-flow-statements/", params)
-    return data.get("cash_flow_statements", {})
+    return StatementFrame.from_records(data.get("cash_flow_statements", []), "cash_flow_statement", ticker, period)
+
+async def aget_cash_flow_statements(
+    ticker: str,
+    period: Literal["annual", "quarterly", "ttm"],
+    limit: int = 10,
+    report_period_gt: Optional[str] = None,
+    report_period_gte: Optional[str] = None,
+    report_period_lt: Optional[str] = None,
+    report_period_lte: Optional[str] = None
+) -> StatementFrame:
+    """Async implementation of get_cash_flow_statements."""
+    params = _create_params(ticker, period, limit, report_period_gt, report_period_gte, report_period_lt, report_period_lte)
+    data = await acall_api("/financials/cash-flow-statements/", params)
+    return StatementFrame.from_records(data.get("cash_flow_statements", []), "cash_flow_statement", ticker, period)
+
+get_cash_flow_statements.coroutine = aget_cash_flow_statements
+
+STATEMENT_ENDPOINTS = {
+    "income_statement": ("/financials/income-statements/", "income_statements"),
+    "balance_sheet": ("/financials/balance-sheets/", "balance_sheets"),
+    "cash_flow_statement": ("/financials/cash-flow-statements/", "cash_flow_statements"),
+}
+
+@tool(args_schema=FinancialMetricsInput)
+def compute_financial_metrics(
+    ticker: str,
+    period: Literal["annual", "quarterly", "ttm"],
+    limit: int = 5
+) -> MetricsResult:
+    """Computes a company's margins (gross, operating, net, free cash flow), period-over-period and year-over-year growth, CAGR, leverage, liquidity, returns on equity and assets, and cash conversion from its income statements, balance sheets and cash flow statements. Prefer this over fetching raw statements when the question is about ratios, margins or growth trends."""
+    params = _create_params(ticker, period, limit, None, None, None, None)
+    frames = []
+    for statement_type, (endpoint, key) in STATEMENT_ENDPOINTS.items():
+        data = call_api(endpoint, params)
+        frames.append(StatementFrame.from_records(data.get(key, []), statement_type, ticker, period))
+    return compute_metrics(*frames)
+
+async def acompute_financial_metrics(
+    ticker: str,
+    period: Literal["annual", "quarterly", "ttm"],
+    limit: int = 5
+) -> MetricsResult:
+    """Async implementation of compute_financial_metrics, fetching the three statements concurrently."""
+    params = _create_params(ticker, period, limit, None, None, None, None)
+    responses = await asyncio.gather(*(acall_api(endpoint, params) for endpoint, _ in STATEMENT_ENDPOINTS.values()))
+    frames = [
+        StatementFrame.from_records(data.get(key, []), statement_type, ticker, period)
+        for (statement_type, (_, key)), data in zip(STATEMENT_ENDPOINTS.items(), responses)
+    ]
+    return compute_metrics(*frames)
+
+compute_financial_metrics.coroutine = acompute_financial_metrics
+
+MAX_BATCH_TICKERS = 25
+
+def _batch_requests(tickers: List[str], statement_types: Optional[List[str]]) -> List[tuple]:
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))[:MAX_BATCH_TICKERS]
+    statement_types = list(dict.fromkeys(statement_types or [])) or ["income_statement"]
+    return [(ticker, statement_type) for ticker in tickers for statement_type in statement_types]
+
+def _batch_workers() -> int:
+    return int(os.getenv("DEXTER_BATCH_WORKERS", "8"))
+
+@tool(args_schema=BatchFinancialStatementsInput)
+def get_financial_statements_batch(
+    tickers: List[str],
+    period: Literal["annual", "quarterly", "ttm"],
+    statement_types: Optional[List[StatementType]] = None,
+    limit: int = 4
+) -> StatementBatch:
+    """Fetches financial statements for several companies at once. Use this instead of one call per ticker when comparing or screening multiple companies; errors for one ticker do not affect the others."""
+    jobs = _batch_requests(tickers, statement_types)
+
+    def fetch(ticker, statement_type):
+        endpoint, key = STATEMENT_ENDPOINTS[statement_type]
+        data = call_api(endpoint, _create_params(ticker, period, limit, None, None, None, None))
+        return StatementFrame.from_records(data.get(key, []), statement_type, ticker, period)
+
+    batch = StatementBatch()
+    if not jobs:
+        return batch
+    with ThreadPoolExecutor(max_workers=min(len(jobs), _batch_workers())) as pool:
+        # Workers inherit the caller's context (API key, trace span)
+        futures = [pool.submit(contextvars.copy_context().run, fetch, ticker, statement_type)
+                   for ticker, statement_type in jobs]
+        for (ticker, statement_type), future in zip(jobs, futures):
+            try:
+                batch.add(ticker, statement_type, future.result())
+            except Exception as e:
+                batch.add_error(ticker, statement_type, e)
+    return batch
+
+async def aget_financial_statements_batch(
+    tickers: List[str],
+    period: Literal["annual", "quarterly", "ttm"],
+    statement_types: Optional[List[StatementType]] = None,
+    limit: int = 4
+) -> StatementBatch:
+    """Async implementation of get_financial_statements_batch."""
+    jobs = _batch_requests(tickers, statement_types)
+    limiter = asyncio.Semaphore(_batch_workers())
+
+    async def fetch(ticker, statement_type):
+        endpoint, key = STATEMENT_ENDPOINTS[statement_type]
+        async with limiter:
+            data = await acall_api(endpoint, _create_params(ticker, period, limit, None, None, None, None))
+        return StatementFrame.from_records(data.get(key, []), statement_type, ticker, period)
+
+    outcomes = await asyncio.gather(*(fetch(t, st) for t, st in jobs), return_exceptions=True)
+    batch = StatementBatch()
+    for (ticker, statement_type), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            batch.add_error(ticker, statement_type, outcome)
+        else:
+            batch.add(ticker, statement_type, outcome)
+    return batch
+
+get_financial_statements_batch.coroutine = aget_financial_statements_batch
 
 TOOLS: List[Callable[..., any]] = [
     get_income_statements,
     get_balance_sheets,
     get_cash_flow_statements,
+    compute_financial_metrics,
+    get_financial_statements_batch,
 ]
 
 RISKY_TOOLS = {}  # guardrail: require confirmation
\ No newline at end of file
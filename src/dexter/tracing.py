@@ -0,0 +1,257 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from dexter.utils.env import cache_dir
+
+####################################
+# Tracing
+####################################
+
+
+class Span:
+    """One timed unit of work (a phase, LLM call, tool call, API request) and its attributes."""
+
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self._started = time.perf_counter()
+        self._token = None
+
+    def set(self, **attributes) -> "Span":
+        """Attach attributes (model, token counts, payload sizes, cache hits, ...)."""
+        self.attributes.update(attributes)
+        return self
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + (self.duration_ms or 0.0) / 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.tracer._start(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        if exc is not None and not isinstance(exc, GeneratorExit):
+            self.record_error(exc)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from a different context than it was entered in (e.g. a generator resumed
+            # by another task): just restore the parent.
+            _current_span.set(self.tracer._spans_by_id.get(self.parent_id))
+        self.tracer._finish(self)
+        return False
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is off, so instrumented code pays almost nothing."""
+
+    recording = False
+
+    def set(self, **attributes) -> "_NoopSpan":
+        return self
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("dexter_span", default=None)
+
+
+def current_span():
+    """The innermost active span, or a no-op span when there is none."""
+    return _current_span.get() or NOOP_SPAN
+
+
+class JsonlExporter:
+    """Appends one JSON object per finished span to a local file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(cache_dir(), "traces.jsonl")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class OpenTelemetryExporter:
+    """Mirrors spans onto an OpenTelemetry tracer (requires opentelemetry-api).
+
+    Configure the OpenTelemetry SDK (provider, span processors, OTLP exporter) as usual; this
+    only creates the spans, with the same nesting, timing and attributes.
+    """
+
+    def __init__(self, otel_tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("OpenTelemetry export requires the opentelemetry-api package "
+                              "(pip install opentelemetry-api opentelemetry-sdk).") from e
+        self._trace = trace
+        self._tracer = otel_tracer or trace.get_tracer("dexter")
+        self._lock = threading.Lock()
+        self._live: Dict[str, Any] = {}
+
+    def on_start(self, span: Span) -> None:
+        with self._lock:
+            parent = self._live.get(span.parent_id)
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(span.name, context=context, start_time=int(span.start_time * 1e9))
+        with self._lock:
+            self._live[span.span_id] = otel_span
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            otel_span = self._live.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            if value is not None:
+                otel_span.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+        if span.error:
+            from opentelemetry.trace import Status, StatusCode
+            otel_span.set_status(Status(StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int(span.end_time * 1e9))
+
+    def close(self) -> None:
+        pass
+
+
+class Tracer:
+    """Creates nested spans and hands finished ones to its exporters; a no-op without exporters.
+
+    An exporter is any object with on_start(span), export(span) and close().
+    """
+
+    def __init__(self, exporters: Optional[List] = None):
+        self.exporters = list(exporters or [])
+        self._spans_by_id: Dict[str, Span] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def span(self, name: str, **attributes):
+        """Context manager timing a block as a child of the current span."""
+        if not self.exporters:
+            return NOOP_SPAN
+        return Span(self, name, _current_span.get(), attributes)
+
+    def _start(self, span: Span) -> None:
+        self._spans_by_id[span.span_id] = span
+        for exporter in self.exporters:
+            try:
+                exporter.on_start(span)
+            except Exception:
+                pass
+
+    def _finish(self, span: Span) -> None:
+        self._spans_by_id.pop(span.span_id, None)
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            exporter.close()
+
+
+def traced(name: str):
+    """Decorator running a function (sync or async) inside a span named `name`."""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Global tracer instance (lazy initialization)
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get or create the tracer; disabled unless DEXTER_TRACE names exporters ("jsonl", "otel")."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                exporters = []
+                for kind in (k.strip().lower() for k in os.getenv("DEXTER_TRACE", "").split(",")):
+                    if kind == "jsonl":
+                        exporters.append(JsonlExporter(os.getenv("DEXTER_TRACE_FILE")))
+                    elif kind == "otel":
+                        exporters.append(OpenTelemetryExporter())
+                _tracer = Tracer(exporters)
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Replace the tracer (pass None to re-initialize lazily from the environment)."""
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
@@ -0,0 +1,138 @@
+import asyncio
+import atexit
+import contextvars
+import queue
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Per-event-loop resources (async HTTP clients, LLM instances bound to them).
+# Async connection pools cannot be shared across event loops, so each loop gets its own.
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+def loop_local(key: Any, factory: Callable[[], T]) -> T:
+    """Return the resource stored under `key` for the running loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.setdefault(loop, {})
+    if key not in resources:
+        resources[key] = factory()
+    return resources[key]
+
+
+def loop_local_instances(key: Any) -> List[Any]:
+    """The resources stored under `key` on every live event loop (e.g. to sum their counters)."""
+    return [resources[key] for resources in list(_loop_resources.values()) if key in resources]
+
+
+async def aclose_loop_resources() -> None:
+    """Close and forget every resource registered for the running loop."""
+    resources = _loop_resources.pop(asyncio.get_running_loop(), {})
+    for resource in resources.values():
+        aclose = getattr(resource, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception:
+                pass
+
+
+####################################
+# Blocking entry points
+####################################
+
+# Blocking callers (CLI, Streamlit, --batch) all run on one long-lived event loop in a daemon
+# thread, so its loop-local HTTP pools, LLM clients and compiled chains outlive single queries.
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_thread: Optional[threading.Thread] = None
+_background_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop run_sync() and iterate_sync() submit work to, started on first use."""
+    global _background_loop, _background_thread
+    if _background_loop is None:
+        with _background_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                _background_thread = threading.Thread(target=loop.run_forever, name="dexter-event-loop", daemon=True)
+                _background_thread.start()
+                _background_loop = loop
+                atexit.register(_close_background_loop)
+    return _background_loop
+
+
+def _close_background_loop(timeout: float = 5.0) -> None:
+    loop = _background_loop
+    if loop is None or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(aclose_loop_resources(), loop).result(timeout)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def _submit(coro: Awaitable[T]) -> "Future[T]":
+    if threading.current_thread() is _background_thread:
+        raise RuntimeError("blocking call made on Dexter's event loop thread; await the coroutine instead")
+    # Run in a copy of the caller's context, as asyncio.run would (trace span, API key, budget)
+    context = contextvars.copy_context()
+
+    async def in_caller_context():
+        return await context.run(asyncio.ensure_future, coro)
+
+    return asyncio.run_coroutine_threadsafe(in_caller_context(), background_loop())
+
+
+def _result(future: "Future[T]") -> T:
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()  # e.g. Ctrl-C in the waiting thread: stop the work on the loop too
+        raise
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion from blocking code (on the background loop)."""
+    return _result(_submit(coro))
+
+
+def iterate_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """Drive an async generator from blocking code, yielding each item as soon as it is produced.
+
+    The generator runs on the background loop; stopping early (or an exception in the consumer)
+    closes it there.
+    """
+    items: "queue.Queue[tuple]" = queue.Queue()
+    end = object()
+
+    async def drive():
+        try:
+            async for item in agen:
+                items.put((item, None))
+        except asyncio.CancelledError as e:
+            items.put((end, e))
+            raise
+        except Exception as e:
+            items.put((end, e))
+        else:
+            items.put((end, None))
+        finally:
+            await agen.aclose()
+
+    future = _submit(drive())
+    try:
+        while True:
+            item, error = items.get()
+            if item is end:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        if not future.done():
+            future.cancel()
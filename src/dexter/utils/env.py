@@ -0,0 +1,23 @@
+import os
+
+####################################
+# Shared environment settings
+####################################
+
+_ON = ("1", "true", "on", "yes")
+_OFF = ("0", "false", "off", "no")
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """A boolean DEXTER_* switch: 1/true/on/yes or 0/false/off/no (any case); unset or unrecognized means `default`."""
+    value = os.getenv(name, "").strip().lower()
+    if value in _ON:
+        return True
+    if value in _OFF:
+        return False
+    return default
+
+
+def cache_dir() -> str:
+    """Directory for Dexter's on-disk caches, history and traces (DEXTER_CACHE_DIR, else ~/.cache/dexter)."""
+    return os.getenv("DEXTER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "dexter")
@@ -1,16 +1,48 @@
+from contextlib import nullcontext
+
 from dexter.utils.ui import UI
 
 
+class _NullUI:
+    """Terminal UI stand-in for headless runs: prints nothing."""
+
+    def progress(self, message: str, success_message: str = ""):
+        return nullcontext()
+
+    def answer_writer(self):
+        return _NullAnswerWriter()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class _NullAnswerWriter:
+    def __init__(self):
+        self._chunks = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def write(self, chunk: str):
+        self._chunks.append(chunk)
+
+    def close(self):
+        pass
+
+
 class Logger:
-    """Logger that uses the new interactive UI system."""
+    """Logger that uses the new interactive UI system; with quiet=True it only keeps the log."""
     
-    def __init__(self):
-        self.ui = UI()
+    def __init__(self, quiet: bool = False):
+        self.quiet = quiet
+        self.ui = _NullUI() if quiet else UI()
         self.log = []
 
     def _log(self, msg: str):
         """Print immediately and keep in log."""
-        print(msg, flush=True)
+        if not self.quiet:
+            print(msg, flush=True)
         self.log.append(msg)
 
     def log_header(self, msg: str):
@@ -33,6 +65,10 @@ class Logger:
 
     def log_summary(self, summary: str):
         self.ui.print_answer(summary)
+
+    def start_summary(self):
+        """Open the answer box for a streamed answer; returns a writer with write(chunk) and close()."""
+        return self.ui.answer_writer()
     
     def progress(self, message: str, success_message: str = ""):
         """Return a progress context manager for showing loading states."""
@@ -2,7 +2,7 @@ import sys
 import time
 import threading
 from contextlib import contextmanager
-from typing import Optional, Callable
+from typing import Callable, Iterable, Optional, Union
 from functools import wraps
 
 
@@ -132,44 +132,19 @@ class UI:
         args_display = f" {Colors.DIM}({args[:50]}...){Colors.ENDC}" if args and len(args) > 0 else ""
         print(f"  {Colors.YELLOW}⚡{Colors.ENDC} {tool_name}{args_display}")
     
-    def print_answer(self, answer: str):
-        """Print the final answer in a beautiful box."""
-        width = 80
-        
-        # Top border
-        print(f"\n{Colors.BOLD}{Colors.BLUE}╔{'═' * (width - 2)}╗{Colors.ENDC}")
-        
-        # Title
-        title = "ANSWER"
-        padding = (width - len(title) - 2) // 2
-        print(f"{Colors.BOLD}{Colors.BLUE}║{' ' * padding}{title}{' ' * (width - len(title) - padding - 2)}║{Colors.ENDC}")
-        
-        # Separator
-        print(f"{Colors.BLUE}╠{'═' * (width - 2)}╣{Colors.ENDC}")
-        
-        # Answer content with proper line wrapping
-        print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
-        for line in answer.split('\n'):
-            if len(line) == 0:
-                print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
-            else:
-                # Word wrap long lines
-                words = line.split()
-                current_line = ""
-                for word in words:
-                    if len(current_line) + len(word) + 1 <= width - 6:
-                        current_line += word + " "
-                    else:
-                        if current_line:
-                            print(f"{Colors.BLUE}║{Colors.ENDC} {current_line.ljust(width - 4)} {Colors.BLUE}║{Colors.ENDC}")
-                        current_line = word + " "
-                if current_line:
-                    print(f"{Colors.BLUE}║{Colors.ENDC} {current_line.ljust(width - 4)} {Colors.BLUE}║{Colors.ENDC}")
-        
-        print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
-        
-        # Bottom border
-        print(f"{Colors.BOLD}{Colors.BLUE}╚{'═' * (width - 2)}╝{Colors.ENDC}\n")
+    def print_answer(self, answer: Union[str, Iterable[str]]) -> str:
+        """Print the final answer in a beautiful box; `answer` may be a string or a stream of chunks."""
+        writer = self.answer_writer()
+        try:
+            for chunk in ([answer] if isinstance(answer, str) else answer):
+                writer.write(chunk)
+        finally:
+            writer.close()
+        return writer.text
+
+    def answer_writer(self) -> "AnswerWriter":
+        """Open the answer box and return a writer that renders text into it as it arrives."""
+        return AnswerWriter()
     
     def print_info(self, message: str):
         """Print an info message."""
@@ -183,3 +158,81 @@ class UI:
         """Print a warning message."""
         print(f"{Colors.YELLOW}⚠ Warning:{Colors.ENDC} {message}")
 
+
+
+class AnswerWriter:
+    """Renders the answer box incrementally: words are printed as soon as they are complete."""
+
+    def __init__(self, width: int = 80):
+        self.width = width
+        self.chunks = []
+        self._word = ""          # partial word waiting for a delimiter
+        self._row = ""           # text already printed on the open row
+        self._row_open = False
+        self._line_length = 0    # characters seen on the current source line
+        self._closed = False
+
+        # Top border, title and separator
+        print(f"\n{Colors.BOLD}{Colors.BLUE}╔{'═' * (width - 2)}╗{Colors.ENDC}")
+        title = "ANSWER"
+        padding = (width - len(title) - 2) // 2
+        print(f"{Colors.BOLD}{Colors.BLUE}║{' ' * padding}{title}{' ' * (width - len(title) - padding - 2)}║{Colors.ENDC}")
+        print(f"{Colors.BLUE}╠{'═' * (width - 2)}╣{Colors.ENDC}")
+        self._blank_row()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def _blank_row(self):
+        print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (self.width - 2)}{Colors.BLUE}║{Colors.ENDC}")
+
+    def _close_row(self):
+        sys.stdout.write(f"{' ' * (self.width - 4 - len(self._row))} {Colors.BLUE}║{Colors.ENDC}\n")
+        self._row = ""
+        self._row_open = False
+
+    def _put_word(self, word: str):
+        # Same wrapping rule as a fully-buffered answer, so streamed and static output match.
+        if self._row and len(self._row) + len(word) + 1 > self.width - 6:
+            self._close_row()
+        if not self._row_open:
+            sys.stdout.write(f"{Colors.BLUE}║{Colors.ENDC} ")
+            self._row_open = True
+        sys.stdout.write(word + " ")
+        self._row += word + " "
+
+    def _end_line(self):
+        if self._word:
+            self._put_word(self._word)
+            self._word = ""
+        if self._row_open:
+            self._close_row()
+        elif self._line_length == 0:
+            self._blank_row()
+        self._line_length = 0
+
+    def write(self, chunk: str):
+        """Render the next piece of the answer."""
+        self.chunks.append(chunk)
+        for ch in chunk:
+            if ch == "\n":
+                self._end_line()
+            else:
+                self._line_length += 1
+                if ch.isspace():
+                    if self._word:
+                        self._put_word(self._word)
+                        self._word = ""
+                else:
+                    self._word += ch
+        sys.stdout.flush()
+
+    def close(self):
+        """Flush the last line and draw the bottom of the box."""
+        if self._closed:
+            return
+        self._closed = True
+        self._end_line()
+        self._blank_row()
+        print(f"{Colors.BOLD}{Colors.BLUE}╚{'═' * (self.width - 2)}╝{Colors.ENDC}\n")
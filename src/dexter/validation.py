@@ -0,0 +1,134 @@
+import re
+import threading
+from typing import List, Optional, Set
+
+from dexter.schemas import Task
+from dexter.session_store import SessionStore, ToolRecord
+
+####################################
+# Deterministic task validation
+####################################
+
+
+class TaskValidator:
+    """A validation stage: returns True (done), False (not done) or None (can't tell, ask the next stage)."""
+
+    def validate(self, task: Task, store: SessionStore) -> Optional[bool]:
+        raise NotImplementedError
+
+
+STATEMENT_KEYWORDS = {
+    "income_statement": ("income statement", "revenue", "損益表", "營收"),
+    "balance_sheet": ("balance sheet", "資產負債表"),
+    "cash_flow_statement": ("cash flow", "現金流"),
+}
+METRIC_KEYWORDS = ("margin", "ratio", "growth", "cagr", "return on", "利潤率", "比率", "成長", "增長", "報酬率")
+PERIOD_KEYWORDS = {
+    "quarterly": ("quarter", "季"),
+    "ttm": ("ttm", "trailing twelve", "近四季"),
+    "annual": ("annual", "yearly", "year", "年度"),
+}
+STATEMENT_TOOLS = {
+    "get_income_statements": "income_statement",
+    "get_balance_sheets": "balance_sheet",
+    "get_cash_flow_statements": "cash_flow_statement",
+}
+
+# Upper-case tokens that are not tickers.
+NON_TICKERS = {"TTM", "LTM", "EPS", "FY", "YOY", "QOQ", "USD", "US", "USA", "GAAP", "ROE", "ROA", "ROI", "ROIC", "FCF",
+               "CAGR", "CEO", "CFO", "AND", "OR", "THE", "FOR", "OF", "VS", "AI", "API", "SEC", "ETF", "IPO", "NA",
+               "EBIT", "EBITDA", "PE", "PS", "P", "E"}
+# ASCII boundaries rather than \b, so tickers written inside CJK text ("比較AAPL和MSFT") still match;
+# a preceding "." keeps exchange suffixes ("2330.TW") out.
+TICKER_PATTERN = re.compile(r"(?<![A-Za-z0-9.])[A-Z]{1,5}(?:\.[A-Z])?(?![A-Za-z0-9])")
+YEAR_PATTERN = re.compile(r"(?<!\d)(19|20)\d{2}(?!\d)")
+CHINESE_NUMERALS = {"一": 1, "二": 2, "兩": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9, "十": 10}
+COUNT_PATTERN = re.compile(r"(?:last|past|recent|previous)\s+(\d+|[一二兩三四五六七八九十])\s*(?:fiscal\s+)?(?:quarters|years)", re.I)
+CHINESE_COUNT_PATTERN = re.compile(r"(?:最近|過去|近)(\d+|[一二兩三四五六七八九十])\s*(?:個)?(?:季度|季|年)")
+
+
+def _frame_for(record: ToolRecord, ticker: str, kind: str):
+    """The frame a successful record produced for (ticker, statement type or 'metrics'), if any."""
+    if not record.ok or ticker not in record.tickers:
+        return None
+    if kind == "metrics":
+        return record.result.frame if record.tool_name == "compute_financial_metrics" else None
+    if STATEMENT_TOOLS.get(record.tool_name) == kind:
+        return record.result
+    if record.tool_name == "get_financial_statements_batch":
+        return record.result.frames.get(ticker, {}).get(kind)
+    return None
+
+
+class RuleBasedValidator(TaskValidator):
+    """Decides data-gathering tasks from the structured record of executed tool calls.
+
+    A task is done when, for every ticker it names, a successful call returned non-empty data of
+    the statement type (or financial metrics) it mentions, for the right period and covering any
+    years or period counts it mentions. Anything it can't parse confidently is left to the LLM.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.decided = 0
+        self.deferred = 0
+
+    def _count(self, verdict: Optional[bool]) -> Optional[bool]:
+        with self._lock:
+            if verdict is None:
+                self.deferred += 1
+            else:
+                self.decided += 1
+        return verdict
+
+    def validate(self, task: Task, store: SessionStore) -> Optional[bool]:
+        return self._count(self._validate(task.description, store))
+
+    def _validate(self, description: str, store: SessionStore) -> Optional[bool]:
+        text = description.lower()
+        tickers = self._tickers(description)
+        kinds = self._kinds(text)
+        if not tickers or not kinds:
+            return None
+        period = next((p for p, words in PERIOD_KEYWORDS.items() if any(w in text for w in words)), None)
+        years = {m.group(0) for m in YEAR_PATTERN.finditer(description)}
+        count = self._count_requested(description)
+
+        for ticker in tickers:
+            for kind in kinds:
+                if not any(self._satisfies(_frame_for(r, ticker, kind), period, years, count) for r in store.records):
+                    return None
+        return True
+
+    @staticmethod
+    def _tickers(description: str) -> Set[str]:
+        return {t for t in TICKER_PATTERN.findall(description) if t not in NON_TICKERS}
+
+    @staticmethod
+    def _kinds(text: str) -> List[str]:
+        if any(w in text for w in METRIC_KEYWORDS):
+            return ["metrics"]
+        return [kind for kind, words in STATEMENT_KEYWORDS.items() if any(w in text for w in words)]
+
+    @staticmethod
+    def _count_requested(description: str) -> Optional[int]:
+        match = COUNT_PATTERN.search(description) or CHINESE_COUNT_PATTERN.search(description)
+        if not match:
+            return None
+        value = match.group(1)
+        return int(value) if value.isdigit() else CHINESE_NUMERALS[value]
+
+    @staticmethod
+    def _satisfies(frame, period: Optional[str], years: Set[str], count: Optional[int]) -> bool:
+        if frame is None or not frame:
+            return False
+        if period is not None and frame.period != period:
+            return False
+        if count is not None and len(frame) < count:
+            return False
+        covered_years = {str(p)[:4] for p in frame.report_periods}
+        return years <= covered_years
+
+    def stats(self) -> dict:
+        total = self.decided + self.deferred
+        return {"decided": self.decided, "deferred": self.deferred, "decided_rate": self.decided / total if total else 0.0}
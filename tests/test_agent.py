@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from dexter.agent import AsyncAgent, _RunState
+from dexter.budget import QueryBudget
+from dexter.schemas import Task
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("DEXTER_PREFETCH", "0")
+    agent = AsyncAgent(quiet=True, validators=[])
+
+    async def answer(query, session_outputs, on_token=None):
+        return "answer"
+
+    monkeypatch.setattr(agent, "_agenerate_answer", answer)
+    return agent
+
+
+def _run_plan(agent, monkeypatch, tasks):
+    """Run `tasks` as the plan; returns the batches of task ids that were running together."""
+    running, batches = set(), []
+
+    async def plan(query):
+        return tasks
+
+    async def work(task, state):
+        running.add(task.id)
+        batches.append(sorted(running))
+        await asyncio.sleep(0.01)
+        running.discard(task.id)
+        task.done = True
+
+    monkeypatch.setattr(agent, "aplan_tasks", plan)
+    monkeypatch.setattr(agent, "_arun_task", work)
+    assert asyncio.run(agent.arun("query")) == "answer"
+    return batches
+
+
+@pytest.mark.parametrize("depends_on", [None, []], ids=["missing", "all_empty"])
+def test_plan_without_dependencies_runs_in_order(agent, monkeypatch, depends_on):
+    tasks = [Task(id=i, description=f"task {i}", depends_on=depends_on) for i in (1, 2, 3)]
+    assert _run_plan(agent, monkeypatch, tasks) == [[1], [2], [3]]
+
+
+def test_plan_with_dependencies_runs_independent_tasks_together(agent, monkeypatch):
+    tasks = [Task(id=1, description="AAPL data", depends_on=[]),
+             Task(id=2, description="MSFT data", depends_on=[]),
+             Task(id=3, description="compare", depends_on=[1, 2])]
+    assert _run_plan(agent, monkeypatch, tasks) == [[1], [1, 2], [3]]
+
+
+def test_calls_admitted_before_a_stuck_one_still_run(agent, monkeypatch):
+    repeated = {"ticker": "AAPL", "period": "annual"}
+    calls = [{"name": "get_income_statements", "args": {"ticker": "MSFT", "period": "annual"}, "id": "0"}]
+    calls += [{"name": "get_income_statements", "args": repeated, "id": str(i)} for i in range(1, 5)]
+    invoked = []
+
+    async def actions(task_desc, last_outputs=""):
+        return AIMessage(content="", tool_calls=calls)
+
+    async def invoke(tool, tool_name, inp_args):
+        invoked.append(inp_args["ticker"])
+        return f"{inp_args['ticker']} statements"
+
+    monkeypatch.setattr(agent, "aask_for_actions", actions)
+    monkeypatch.setattr(agent, "_ainvoke_tool", invoke)
+    state = _RunState(QueryBudget())
+    task = Task(id=1, description="Get AAPL and MSFT annual income statements")
+    asyncio.run(agent._arun_task(task, state))
+
+    # The fourth identical call trips stuck detection; the four admitted before it are run and recorded
+    assert state.aborted and not task.done
+    assert invoked == ["MSFT", "AAPL", "AAPL", "AAPL"]
+    assert [r.args["ticker"] for r in state.store.records] == ["MSFT", "AAPL", "AAPL", "AAPL"]
+    assert state.step_count == 4
@@ -0,0 +1,83 @@
+import asyncio
+
+from dexter.history import StatementHistory
+
+ENDPOINT = "/financials/income-statements/"
+QUARTERS = [f"{year}-{month}" for year in range(2024, 2018, -1) for month in ("12-31", "09-30", "06-30", "03-31")]
+
+
+class FakeStatements:
+    """Quarterly income statements honouring limit and report-period filters, newest first."""
+
+    def __init__(self, periods=QUARTERS, delay: float = 0.0):
+        self.periods = list(periods)
+        self.delay = delay
+        self.calls = []
+
+    def _respond(self, params: dict) -> dict:
+        self.calls.append(dict(params))
+        periods = [p for p in self.periods
+                   if p > params.get("report_period_gt", "") and p < params.get("report_period_lt", "9999")]
+        rows = [{"ticker": params["ticker"], "report_period": p, "revenue": 100.0} for p in periods]
+        return {"income_statements": rows[:params["limit"]]}
+
+    def fetch(self, endpoint: str, params: dict) -> dict:
+        return self._respond(params)
+
+    async def afetch(self, endpoint: str, params: dict) -> dict:
+        await asyncio.sleep(params.get("delay", self.delay))
+        return self._respond({k: v for k, v in params.items() if k != "delay"})
+
+
+def _periods(data: dict) -> list:
+    return [row["report_period"] for row in data["income_statements"]]
+
+
+def test_growing_a_request_backfills_only_the_older_periods():
+    history = StatementHistory(path=":memory:")
+    source = FakeStatements()
+
+    history.fetch(ENDPOINT, {"ticker": "AAPL", "period": "quarterly", "limit": 4}, source.fetch)
+    data = history.fetch(ENDPOINT, {"ticker": "aapl", "period": "quarterly", "limit": 12}, source.fetch)
+
+    assert _periods(data) == QUARTERS[:12]
+    assert source.calls[1:] == [{"ticker": "aapl", "period": "quarterly", "limit": 8, "report_period_lt": QUARTERS[3]}]
+    assert history.stats()["rows_fetched"] == 12
+    assert history.stats()["partial_hits"] == 1
+
+
+def test_stale_series_fetches_only_newer_periods():
+    history = StatementHistory(path=":memory:", ttls={"quarterly": 0})
+    source = FakeStatements(QUARTERS[1:])
+    params = {"ticker": "AAPL", "period": "quarterly", "limit": 4}
+
+    history.fetch(ENDPOINT, params, source.fetch)
+    source.periods = list(QUARTERS)  # a new quarter is reported
+    data = history.fetch(ENDPOINT, params, source.fetch)
+
+    assert _periods(data) == QUARTERS[:4]
+    assert source.calls[1:] == [{**params, "report_period_gt": QUARTERS[1]}]
+    assert history.stats()["rows_fetched"] == 5
+
+
+def test_concurrent_first_fetches_of_one_series_line_up():
+    history = StatementHistory(path=":memory:")
+    source = FakeStatements()
+
+    async def main():
+        # The shorter request finishes last; it must not throw away the longer one's rows
+        return await asyncio.gather(
+            history.afetch(ENDPOINT, {"ticker": "AAPL", "period": "quarterly", "limit": 8}, source.afetch),
+            history.afetch(ENDPOINT, {"ticker": "AAPL", "period": "quarterly", "limit": 4},
+                           lambda endpoint, params: source.afetch(endpoint, {**params, "delay": 0.05})),
+        )
+
+    eight, four = asyncio.run(main())
+    assert _periods(eight) == QUARTERS[:8]
+    assert _periods(four) == QUARTERS[:4]
+
+    calls = len(source.calls)
+    data = history.fetch(ENDPOINT, {"ticker": "AAPL", "period": "quarterly", "limit": 8}, source.fetch)
+    assert _periods(data) == QUARTERS[:8]
+    assert len(source.calls) == calls
+    assert history.stats()["hits"] == 1
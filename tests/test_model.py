@@ -0,0 +1,33 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from dexter.llm_pool import LLMClientPool, set_llm_pool
+from dexter.model import RunnableRegistry, reset_llm
+from dexter.utils.aio import loop_local, run_sync
+
+
+def test_reset_llm_reaches_the_background_loop():
+    pool = LLMClientPool(factory=lambda **kwargs: FakeListChatModel(responses=["ok"]))
+    set_llm_pool(pool)
+    try:
+        async def build():
+            # What an Agent call leaves behind on the long-lived loop blocking callers share
+            llm = pool.get_async("sk-test", "gpt-4.1-mini")
+            registry = loop_local("runnables", RunnableRegistry)
+            registry.get(llm, "answer", "system prompt", None, None)
+            return registry
+
+        registry = run_sync(build())
+        pool.get("sk-test", "gpt-4.1-mini")
+        assert pool.stats()["entries"] == 2
+        assert registry.stats()["entries"] == 1
+
+        reset_llm()
+        assert pool.stats()["entries"] == 0
+        assert registry.stats()["entries"] == 0
+
+        builds = pool.stats()["builds"]
+        run_sync(build())
+        assert pool.stats()["builds"] == builds + 1
+        assert registry.stats()["builds"] == 2
+    finally:
+        set_llm_pool(None)
@@ -0,0 +1,11 @@
+from dexter.prefetch import INCOME, extract_hints
+
+
+def test_tickers_inside_cjk_text_are_hinted():
+    hints = extract_hints("比較AAPL和MSFT最近四季的營收", ["獲取AAPL最近四個季度的損益表", "獲取MSFT最近四個季度的損益表"])
+    assert hints == [(INCOME, "AAPL", "quarterly"), (INCOME, "MSFT", "quarterly")]
+
+
+def test_exchange_suffixes_and_acronyms_are_not_tickers():
+    hints = extract_hints("Compare 2330.TW vs BRK.B", ["Get BRK.B and 2330.TW annual revenue, EPS and P/E"])
+    assert hints == [(INCOME, "BRK.B", "annual")]
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dexter.singleflight import SingleFlight
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _in_thread(target):
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = target()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def test_waiters_share_the_leaders_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "data"
+
+    leader, leader_outcome = _in_thread(lambda: flight.do("k", work))
+    _wait_until(lambda: calls)
+    waiter, waiter_outcome = _in_thread(lambda: flight.do("k", work))
+    _wait_until(lambda: flight.coalesced == 1)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert leader_outcome == waiter_outcome == {"result": "data"}
+    assert len(calls) == 1
+
+
+def test_waiters_share_the_leaders_error():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def work():
+        release.wait(5)
+        raise ValueError("401 Unauthorized")
+
+    leader, leader_outcome = _in_thread(lambda: flight.do("k", work))
+    _wait_until(lambda: flight.stats()["in_flight"] == 1)
+    waiter, waiter_outcome = _in_thread(lambda: flight.do("k", work))
+    _wait_until(lambda: flight.coalesced == 1)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert isinstance(leader_outcome["error"], ValueError)
+    assert isinstance(waiter_outcome["error"], ValueError)
+
+
+def test_cancelled_leader_does_not_cancel_waiter_on_another_loop():
+    flight = SingleFlight()
+    leader_started = threading.Event()
+    leader_loop = asyncio.new_event_loop()
+    leader_task = {}
+
+    async def slow():
+        leader_started.set()
+        await asyncio.sleep(30)
+        return "leader data"
+
+    async def fast():
+        return "waiter data"
+
+    def run_leader():
+        async def main():
+            leader_task["task"] = asyncio.ensure_future(flight.ado("k", slow))
+            return await leader_task["task"]
+        return leader_loop.run_until_complete(main())
+
+    leader, leader_outcome = _in_thread(run_leader)
+    assert leader_started.wait(5)
+    waiter, waiter_outcome = _in_thread(lambda: asyncio.run(flight.ado("k", fast)))
+    _wait_until(lambda: flight.coalesced == 1)
+
+    # e.g. dexter-server cancelling a query whose client disconnected
+    leader_loop.call_soon_threadsafe(leader_task["task"].cancel)
+    leader.join(5)
+    waiter.join(5)
+    leader_loop.close()
+
+    assert isinstance(leader_outcome["error"], asyncio.CancelledError)
+    assert waiter_outcome == {"result": "waiter data"}
+    assert flight.executions == 2
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_interrupted_sync_leader_lets_waiter_retry():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def interrupted():
+        release.wait(5)
+        raise KeyboardInterrupt
+
+    leader, leader_outcome = _in_thread(lambda: flight.do("k", interrupted))
+    _wait_until(lambda: flight.stats()["in_flight"] == 1)
+    waiter, waiter_outcome = _in_thread(lambda: flight.do("k", lambda: "retried"))
+    _wait_until(lambda: flight.coalesced == 1)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert isinstance(leader_outcome["error"], KeyboardInterrupt)
+    assert waiter_outcome == {"result": "retried"}
+
+
+def test_cancelled_waiter_leaves_the_flight_alone():
+    flight = SingleFlight()
+
+    async def main():
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "data"
+
+        leader = asyncio.ensure_future(flight.ado("k", work))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(flight.ado("k", work))
+        other = asyncio.ensure_future(flight.ado("k", work))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await leader, await other, cancelled
+
+    leader_result, other_result, cancelled = asyncio.run(main())
+    assert leader_result == other_result == "data"
+    assert cancelled.cancelled()
+    assert flight.executions == 1
+
+
+@pytest.mark.parametrize("error", [ValueError("boom"), asyncio.CancelledError()])
+def test_flight_is_forgotten_after_the_leader_finishes(error):
+    flight = SingleFlight()
+
+    async def fail():
+        raise error
+
+    with pytest.raises(type(error)):
+        asyncio.run(flight.ado("k", fail))
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from dexter import tools
+from dexter.cache import ResponseCache, set_response_cache
+from dexter.history import StatementHistory, set_statement_history
+
+ENDPOINT = "/financials/income-statements/"
+PARAMS = {"ticker": "AAPL", "period": "annual", "limit": 4}
+ROWS = [{"ticker": "AAPL", "report_period": f"{year}-09-30", "revenue": 100.0} for year in range(2024, 2020, -1)]
+
+
+@pytest.fixture
+def stores(tmp_path):
+    # The default configuration: on-disk response cache and statement history
+    set_response_cache(ResponseCache(path=str(tmp_path / "api_cache.sqlite3")))
+    set_statement_history(StatementHistory(path=str(tmp_path / "history.sqlite3")))
+    yield
+    set_response_cache(None)
+    set_statement_history(None)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Records the API key of every upstream call; "bad-key" is rejected."""
+    fetched_with = []
+
+    async def fake_afetch(endpoint, params):
+        api_key = tools._api_key()
+        fetched_with.append(api_key)
+        await asyncio.sleep(0.05)
+        if api_key == "bad-key":
+            raise ValueError("401 Unauthorized")
+        return {"income_statements": ROWS[:params["limit"]]}
+
+    def fake_fetch(endpoint, params):
+        return asyncio.run(fake_afetch(endpoint, params))
+
+    monkeypatch.setattr(tools, "_afetch_api", fake_afetch)
+    monkeypatch.setattr(tools, "_fetch_api", fake_fetch)
+    return fetched_with
+
+
+async def _as_tenant(api_key, params=PARAMS):
+    with tools.use_financial_api_key(api_key):
+        return await tools.acall_api(ENDPOINT, params)
+
+
+def test_tenants_do_not_share_in_flight_requests(stores, upstream):
+    async def main():
+        return await asyncio.gather(_as_tenant("bad-key"), _as_tenant("key-b"), _as_tenant("key-b"),
+                                    return_exceptions=True)
+
+    coalesced = tools.api_single_flight.coalesced
+    bad, first_b, second_b = asyncio.run(main())
+
+    assert isinstance(bad, ValueError)
+    assert first_b == second_b == {"income_statements": ROWS}
+    assert sorted(upstream) == ["bad-key", "key-b"]
+    assert tools.api_single_flight.coalesced == coalesced + 1
+
+
+@pytest.mark.parametrize("params", [PARAMS, {**PARAMS, "report_period_lte": "2024-09-30"}],
+                         ids=["statement_history", "response_cache"])
+def test_tenants_do_not_share_stored_responses(stores, upstream, params):
+    assert asyncio.run(_as_tenant("good-key", params)) == {"income_statements": ROWS}
+    with pytest.raises(ValueError):
+        asyncio.run(_as_tenant("bad-key", params))
+    with tools.use_financial_api_key("bad-key"), pytest.raises(ValueError):
+        tools.call_api(ENDPOINT, params)
+
+    assert upstream == ["good-key", "bad-key", "bad-key"]
+    # The tenant that fetched it is still served from the stores
+    assert asyncio.run(_as_tenant("good-key", params)) == {"income_statements": ROWS}
+    assert len(upstream) == 3